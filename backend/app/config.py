@@ -3,9 +3,13 @@ Juryline — Application Configuration
 Loads environment variables via pydantic-settings.
 """
 
+import logging
+import math
 from functools import lru_cache
 from pydantic_settings import BaseSettings
 
+logger = logging.getLogger(__name__)
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -15,6 +19,45 @@ class Settings(BaseSettings):
     supabase_service_key: str
     supabase_jwt_secret: str
 
+    # ── Auth (token verification) ──
+    auth_local_verification: bool = True   # Verify JWTs in-process (HS256 secret / JWKS)
+    auth_remote_fallback: bool = True      # Fall back to auth.get_user() when local check can't decide
+    supabase_jwt_audience: str = "authenticated"
+    jwks_cache_ttl_seconds: int = 600
+
+    # ── In-process caches ──
+    profile_cache_size: int = 10000
+    profile_cache_ttl_seconds: float = 300.0
+    event_cache_size: int = 2000
+    event_cache_ttl_seconds: float = 30.0
+    judging_status_max_age_seconds: float = 5.0  # How long a cached "judging" is trusted for review writes
+    schema_cache_size: int = 1000
+    schema_cache_ttl_seconds: float = 3600.0
+    leaderboard_cache_size: int = 500
+    leaderboard_rebuild_ttl_seconds: float = 60.0
+
+    # ── Database (async PostgREST pool) ──
+    db_pool_max_connections: int = 50
+    db_pool_max_keepalive: int = 20
+    db_timeout_seconds: float = 30.0
+    bulk_write_chunk_size: int = 500         # Rows per request for large inserts/upserts
+    bulk_write_concurrency: int = 4          # Chunk requests in flight per bulk write
+    bulk_write_max_retries: int = 3
+
+    # ── Background jobs ──
+    job_heartbeat_seconds: float = 10.0
+    job_stale_after_seconds: float = 60.0    # Running jobs without a heartbeat this long are resumed
+    job_progress_interval_seconds: float = 1.0
+    job_max_concurrent: int = 4              # Jobs run at once per API worker
+    job_poll_interval_seconds: float = 5.0   # How often idle workers look for queued jobs
+    feedback_job_concurrency: int = 4        # Parallel feedback agent calls per bulk job
+
+    # ── Ingest validation ──
+    ingest_validation_concurrency: int = 4        # Validations in flight per API worker
+    ingest_validation_sweep_seconds: float = 30.0   # How often queued rows are re-scanned
+    ingest_validation_stale_seconds: float = 120.0  # Running claims older than this are retried
+    ingest_validation_max_attempts: int = 3
+
     # ── Cloudflare R2 ──
     r2_account_id: str = ""
     r2_access_key_id: str = ""
@@ -37,10 +80,46 @@ class Settings(BaseSettings):
     archestra_aggregate_prompt_id: str = ""
     archestra_feedback_prompt_id: str = ""
 
+    # ── Archestra HTTP client (one pooled client per worker) ──
+    archestra_max_connections: int = 20
+    archestra_max_keepalive: int = 10
+    archestra_keepalive_expiry_seconds: float = 30.0
+    archestra_http2: bool = False
+    archestra_connect_timeout_seconds: float = 5.0
+    archestra_timeout_seconds: float = 60.0  # Default read timeout for agent calls
+    archestra_agent_timeouts: str = ""       # Per-agent overrides, e.g. "ingest=10,feedback=90"
+    archestra_max_concurrency: int = 8       # In-flight calls per agent
+    archestra_queue_timeout_seconds: float = 2.0  # Wait for a slot before falling back
+    archestra_breaker_failure_threshold: int = 5
+    archestra_breaker_recovery_seconds: float = 30.0
+
     @property
     def is_production(self) -> bool:
         return self.app_env == "production"
 
+    @property
+    def archestra_agent_timeout_map(self) -> dict[str, float]:
+        """
+        Parse ARCHESTRA_AGENT_TIMEOUTS ("name=seconds,...") into a dict.
+        Malformed entries are logged and skipped, falling back to the
+        default timeout, rather than failing startup.
+        """
+        timeouts = {}
+        for item in self.archestra_agent_timeouts.split(","):
+            name, _, seconds = item.partition("=")
+            name, seconds = name.strip(), seconds.strip()
+            if not item.strip():
+                continue
+            try:
+                value = float(seconds)
+            except ValueError:
+                value = math.nan
+            if not name or not math.isfinite(value) or value <= 0:
+                logger.warning("Ignoring malformed ARCHESTRA_AGENT_TIMEOUTS entry %r", item.strip())
+                continue
+            timeouts[name] = value
+        return timeouts
+
     @property
     def r2_endpoint_url(self) -> str:
         return f"https://{self.r2_account_id}.r2.cloudflarestorage.com"
@@ -11,6 +11,12 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 
 from app.config import get_settings
+from app.supabase_client import db
+from app.utils.dependencies import profile_cache
+from app.services.archestra_service import archestra_service
+from app.services.event_cache import event_cache
+from app.services.job_service import job_service
+from app.services.validation_service import ingest_validation_service
 
 # Configure logging
 logging.basicConfig(
@@ -28,9 +34,16 @@ async def lifespan(app: FastAPI):
     logger.info(f"API starting in {settings.app_env} mode")
     logger.info(f"Supabase: {settings.supabase_url}")
     logger.info(f"Frontend: {settings.frontend_url}")
+    await archestra_service.start()
+    await job_service.start()
+    await ingest_validation_service.start()
     yield
     # Shutdown
     logger.info("API shutting down")
+    await job_service.shutdown()
+    await ingest_validation_service.shutdown()
+    await archestra_service.aclose()
+    await db.aclose()
 
 
 app = FastAPI(
@@ -92,11 +105,19 @@ async def api_health_check():
         "service": "juryline-api",
         "version": "0.1.0",
         "database": "supabase",
+        "caches": {
+            "profiles": profile_cache.stats(),
+            "events": event_cache.stats(),
+        },
+        "queues": {
+            "jobs": job_service.stats(),
+            "ingest_validation": ingest_validation_service.stats(),
+        },
     }
 
 
 # -- Routers --
-from app.routers import auth, profile, events, form_fields, criteria, judges, uploads, submissions, reviews, archestra, dashboard
+from app.routers import auth, profile, events, form_fields, criteria, judges, uploads, submissions, reviews, archestra, dashboard, jobs
 
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(profile.router, prefix="/api/v1")
@@ -109,3 +130,4 @@ app.include_router(submissions.router, prefix="/api/v1")
 app.include_router(reviews.router, prefix="/api/v1")
 app.include_router(archestra.router, prefix="/api/v1")
 app.include_router(dashboard.router, prefix="/api/v1")
+app.include_router(jobs.router, prefix="/api/v1")
@@ -0,0 +1,27 @@
+"""
+Juryline — Judge Assignment Models
+"""
+
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional
+
+
+class AssignmentExclusion(BaseModel):
+    judge_id: str
+    submission_id: str
+
+
+class AssignJudgesRequest(BaseModel):
+    judges_per_submission: Optional[int] = Field(None, ge=1, le=10)  # Defaults to the event's setting
+    max_load_per_judge: Optional[int] = Field(None, ge=1)
+    exclusions: list[AssignmentExclusion] = []  # Conflicts of interest
+    use_ai: bool = False  # Ask the Archestra Assignment agent first (replace mode only)
+    # incremental: keep existing work, place only what changed; replace: rebuild everything.
+    # Defaults to replace when use_ai is set, as before incremental mode existed.
+    mode: str = Field("incremental", pattern="^(incremental|replace)$")
+
+    @model_validator(mode="after")
+    def _ai_implies_replace(self):
+        if self.use_ai and "mode" not in self.model_fields_set:
+            self.mode = "replace"
+        return self
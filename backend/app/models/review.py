@@ -50,6 +50,16 @@ class CriterionUpdate(BaseModel):
     weight: Optional[float] = Field(None, gt=0)
 
 
+class CriterionOrderItem(BaseModel):
+    id: str
+    sort_order: int
+
+
+class CriterionReorder(BaseModel):
+    """Batch reorder: list of { id, sort_order }."""
+    order: list[CriterionOrderItem]
+
+
 class CriterionResponse(BaseModel):
     id: str
     event_id: str
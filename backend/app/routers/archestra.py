@@ -5,11 +5,18 @@ score aggregation, feedback generation. Falls back to deterministic logic
 when Archestra is not configured.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from app.supabase_client import supabase
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Header
+from app.supabase_client import db
 from app.utils.dependencies import require_organizer, get_current_user
+from app.models.assignment import AssignJudgesRequest
 from app.services.archestra_service import archestra_service
-from app.services.submission_service import submission_service
+from app.services.event_cache import event_cache
+from app.services.feedback_service import FEEDBACK_BATCH_JOB, feedback_service
+from app.services.job_service import job_service
+from app.services.orchestration_service import AGGREGATE_SCORES_JOB, ASSIGN_JUDGES_JOB
 
 router = APIRouter(prefix="/archestra", tags=["archestra"])
 
@@ -20,125 +27,61 @@ async def archestra_status(_user: dict = Depends(get_current_user)):
     return await archestra_service.health_check()
 
 
-@router.post("/assign-judges/{event_id}")
-async def assign_judges(event_id: str, user: dict = Depends(require_organizer)):
+@router.post("/assign-judges/{event_id}", status_code=202)
+async def assign_judges(
+    event_id: str,
+    body: Optional[AssignJudgesRequest] = None,
+    user: dict = Depends(require_organizer),
+    idempotency_key: Optional[str] = Header(None),
+):
     """
-    Trigger judge assignment for an event.
-    Uses Archestra Assignment agent or deterministic round-robin fallback.
-    Saves assignments to judge_assignments table.
+    Queue judge assignment for an event and return the job.
+    Uses the deterministic load-balancing solver (honouring current
+    loads, max_load_per_judge and exclusions). By default (mode=incremental)
+    completed and reviewed pairs are kept and only the difference is
+    written; mode=replace rebuilds all assignments, optionally via the
+    Archestra Assignment agent (use_ai; implies mode=replace when no mode
+    is given, 400 with mode=incremental). The job result carries the
+    strategy, per-judge loads, balance metrics and any unfilled
+    submissions. Poll GET /jobs/{job_id}.
     """
+    body = body or AssignJudgesRequest()
+    if body.use_ai and body.mode != "replace":
+        raise HTTPException(400, "use_ai is only supported with mode=replace")
     # Verify event exists and belongs to organizer
-    event = supabase.table("events").select("*").eq("id", event_id).single().execute()
-    if not event.data:
-        raise HTTPException(404, "Event not found")
-    if event.data["organizer_id"] != user["id"]:
-        raise HTTPException(403, "Not the event organizer")
-    if event.data["status"] not in ("judging", "open"):
+    event = await event_cache.get_owned(event_id, user["id"])
+    if event["status"] not in ("judging", "open"):
         raise HTTPException(400, "Event must be open or in judging phase")
 
-    # Get judges for this event
-    ej_result = (
-        supabase.table("event_judges")
-        .select("judge_id, profiles:judge_id(id, name, email)")
-        .eq("event_id", event_id)
-        .execute()
+    judges, submissions = await asyncio.gather(
+        db.table("event_judges").select("judge_id").eq("event_id", event_id).limit(1).execute(),
+        db.table("submissions").select("id").eq("event_id", event_id).limit(1).execute(),
     )
-    judges_raw = ej_result.data or []
-    if not judges_raw:
+    if not judges.data:
         raise HTTPException(400, "No judges invited to this event")
-
-    # Get current assignment counts for load balancing
-    existing_assigns = (
-        supabase.table("judge_assignments")
-        .select("judge_id")
-        .eq("event_id", event_id)
-        .execute()
-    )
-    load_map: dict[str, int] = {}
-    for a in (existing_assigns.data or []):
-        load_map[a["judge_id"]] = load_map.get(a["judge_id"], 0) + 1
-
-    judges = []
-    for ej in judges_raw:
-        profile = ej.get("profiles") or {}
-        jid = ej["judge_id"]
-        judges.append({
-            "id": jid,
-            "name": profile.get("name", ""),
-            "current_load": load_map.get(jid, 0),
-        })
-
-    # Get submissions
-    subs_result = (
-        supabase.table("submissions")
-        .select("id, form_data")
-        .eq("event_id", event_id)
-        .execute()
-    )
-    submissions = subs_result.data or []
-    if not submissions:
+    if not submissions.data:
         raise HTTPException(400, "No submissions to assign")
 
-    # Enrich submissions with project_name for display
-    form_fields = (
-        supabase.table("form_fields")
-        .select("*")
-        .eq("event_id", event_id)
-        .order("sort_order")
-        .execute()
-    ).data or []
-
-    for sub in submissions:
-        sub["event_id"] = event_id  # enrich_for_display needs event_id
-        enriched = await submission_service.enrich_for_display(sub)
-        display = enriched.get("form_data_display", [])
-        # Use first text field as project_name
-        sub["project_name"] = next(
-            (d["value"] for d in display if d["field_type"] in ("short_text",) and d["value"]),
-            f"Submission {sub['id'][:8]}",
-        )
+    params = body.model_dump()
+    if params["judges_per_submission"] is None:
+        params["judges_per_submission"] = event.get("judges_per_submission", 2)
 
-    # Call Archestra or fallback
-    result = await archestra_service.assign_judges(
-        judges=judges,
-        submissions=submissions,
-        judges_per_submission=event.data.get("judges_per_submission", 2),
+    return await job_service.submit(
+        ASSIGN_JUDGES_JOB,
+        event_id,
+        params,
+        created_by=user["id"],
+        idempotency_key=idempotency_key,
     )
 
-    # Clear existing assignments for this event, then insert new ones
-    supabase.table("judge_assignments").delete().eq("event_id", event_id).execute()
-
-    new_assignments = []
-    for a in result.get("assignments", []):
-        new_assignments.append({
-            "event_id": event_id,
-            "judge_id": a["judge_id"],
-            "submission_id": a["submission_id"],
-            "status": "pending",
-        })
-
-    if new_assignments:
-        supabase.table("judge_assignments").insert(new_assignments).execute()
-
-    return {
-        "message": f"Assigned {len(new_assignments)} judge-submission pairs",
-        "strategy": result.get("strategy", "unknown"),
-        "judge_loads": result.get("judge_loads", {}),
-        "assignment_count": len(new_assignments),
-    }
-
 
 @router.get("/progress/{event_id}")
 async def get_progress(event_id: str, user: dict = Depends(require_organizer)):
     """Get judging progress for an event."""
-    event = supabase.table("events").select("organizer_id").eq("id", event_id).single().execute()
-    if not event.data:
-        raise HTTPException(404, "Event not found")
-    if event.data["organizer_id"] != user["id"]:
-        raise HTTPException(403, "Not the event organizer")
+    await event_cache.get_owned(event_id, user["id"])
 
     assigns = (
-        supabase.table("judge_assignments")
+        await db.table("judge_assignments")
         .select("*")
         .eq("event_id", event_id)
         .execute()
@@ -159,85 +102,51 @@ async def get_progress(event_id: str, user: dict = Depends(require_organizer)):
     return await archestra_service.get_progress(assignments)
 
 
-@router.post("/aggregate/{event_id}")
-async def aggregate_scores(event_id: str, user: dict = Depends(require_organizer)):
+@router.post("/aggregate/{event_id}", status_code=202)
+async def aggregate_scores(
+    event_id: str,
+    user: dict = Depends(require_organizer),
+    idempotency_key: Optional[str] = Header(None),
+):
     """
-    Aggregate all review scores for an event into a leaderboard.
-    Uses weighted averages from criteria.
+    Queue aggregation of all review scores for an event into a leaderboard
+    (weighted averages from criteria) and return the job; the leaderboard
+    is the job's result. Poll GET /jobs/{job_id}.
     """
-    event = supabase.table("events").select("*").eq("id", event_id).single().execute()
-    if not event.data:
-        raise HTTPException(404, "Event not found")
-    if event.data["organizer_id"] != user["id"]:
-        raise HTTPException(403, "Not the event organizer")
+    await event_cache.get_owned(event_id, user["id"])
 
-    # Get criteria
     criteria = (
-        supabase.table("criteria")
-        .select("*")
+        await db.table("criteria")
+        .select("id")
         .eq("event_id", event_id)
-        .order("sort_order")
+        .limit(1)
         .execute()
-    ).data or []
-
-    if not criteria:
+    )
+    if not criteria.data:
         raise HTTPException(400, "No criteria defined")
 
-    # Get submissions
-    subs = (
-        supabase.table("submissions")
-        .select("*")
-        .eq("event_id", event_id)
-        .execute()
-    ).data or []
-
-    # Get form fields for project name extraction
-    form_fields = (
-        supabase.table("form_fields")
-        .select("*")
-        .eq("event_id", event_id)
-        .order("sort_order")
-        .execute()
-    ).data or []
-
-    # Get all reviews
-    reviews = (
-        supabase.table("reviews")
-        .select("*")
-        .eq("event_id", event_id)
-        .execute()
-    ).data or []
-
-    # Build submissions_with_reviews
-    review_map: dict[str, list] = {}
-    for r in reviews:
-        sid = r["submission_id"]
-        if sid not in review_map:
-            review_map[sid] = []
-        review_map[sid].append(r)
-
-    submissions_with_reviews = []
-    for sub in subs:
-        enriched = await submission_service.enrich_for_display(sub)
-        display = enriched.get("form_data_display", [])
-        project_name = next(
-            (d["value"] for d in display if d["field_type"] in ("short_text",) and d["value"]),
-            f"Submission {sub['id'][:8]}",
-        )
-        submissions_with_reviews.append({
-            "id": sub["id"],
-            "project_name": project_name,
-            "reviews": review_map.get(sub["id"], []),
-        })
-
-    return await archestra_service.aggregate_scores(criteria, submissions_with_reviews)
+    return await job_service.submit(
+        AGGREGATE_SCORES_JOB,
+        event_id,
+        {},
+        created_by=user["id"],
+        idempotency_key=idempotency_key,
+    )
 
 
 @router.post("/feedback/{submission_id}")
-async def generate_feedback(submission_id: str, user: dict = Depends(require_organizer)):
-    """Generate AI-synthesized feedback for a submission."""
+async def generate_feedback(
+    submission_id: str,
+    force: bool = False,
+    user: dict = Depends(require_organizer),
+):
+    """
+    Generate AI-synthesized feedback for a submission.
+    Stored feedback is returned while the submission, its reviews and the
+    criteria are unchanged; force=true regenerates it anyway.
+    """
     sub = (
-        supabase.table("submissions")
+        await db.table("submissions")
         .select("*")
         .eq("id", submission_id)
         .single()
@@ -249,19 +158,19 @@ async def generate_feedback(submission_id: str, user: dict = Depends(require_org
     event_id = sub.data["event_id"]
 
     # Verify organizer owns event
-    event = supabase.table("events").select("organizer_id").eq("id", event_id).single().execute()
-    if not event.data or event.data["organizer_id"] != user["id"]:
+    event = await event_cache.get(event_id)
+    if not event or event["organizer_id"] != user["id"]:
         raise HTTPException(403, "Not the event organizer")
 
     criteria = (
-        supabase.table("criteria")
+        await db.table("criteria")
         .select("*")
         .eq("event_id", event_id)
         .execute()
     ).data or []
 
     reviews = (
-        supabase.table("reviews")
+        await db.table("reviews")
         .select("*")
         .eq("submission_id", submission_id)
         .execute()
@@ -270,8 +179,33 @@ async def generate_feedback(submission_id: str, user: dict = Depends(require_org
     if not reviews:
         raise HTTPException(400, "No reviews exist for this submission")
 
-    return await archestra_service.generate_feedback(
+    return await feedback_service.get_or_generate(
         submission=sub.data,
         reviews=reviews,
         criteria=criteria,
+        force=force,
+    )
+
+
+@router.post("/feedback-batch/{event_id}", status_code=202)
+async def generate_event_feedback(
+    event_id: str,
+    force: bool = False,
+    user: dict = Depends(require_organizer),
+    idempotency_key: Optional[str] = Header(None),
+):
+    """
+    Start a background job that generates feedback for every reviewed
+    submission in the event. Returns the job; poll GET /jobs/{job_id}
+    for progress. If a batch is already running for the event, that job
+    is returned instead of starting another.
+    """
+    await event_cache.get_owned(event_id, user["id"])
+
+    return await job_service.submit(
+        FEEDBACK_BATCH_JOB,
+        event_id,
+        {"force": force},
+        created_by=user["id"],
+        idempotency_key=idempotency_key,
     )
@@ -4,6 +4,7 @@ Handles signup, login, profile fetch, and logout via Supabase Auth.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from app.supabase_client import supabase
 from app.utils.dependencies import get_current_user
 from app.models.user import SignUpRequest, SignInRequest
@@ -18,7 +19,7 @@ async def signup(request: SignUpRequest):
     Sends a verification email. Profile is auto-created by DB trigger.
     """
     try:
-        result = supabase.auth.sign_up({
+        result = await run_in_threadpool(supabase.auth.sign_up, {
             "email": request.email,
             "password": request.password,
             "options": {
@@ -52,7 +53,7 @@ async def login(request: SignInRequest):
     Returns session tokens.
     """
     try:
-        result = supabase.auth.sign_in_with_password({
+        result = await run_in_threadpool(supabase.auth.sign_in_with_password, {
             "email": request.email,
             "password": request.password,
         })
@@ -1,22 +1,33 @@
 """
 Juryline -- Criteria Router
-CRUD for judging criteria. Locked when event status != draft.
+CRUD and reorder for judging criteria. Locked when event status != draft.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from app.supabase_client import supabase
+from postgrest.exceptions import APIError
+from app.supabase_client import db
+from app.services.event_cache import event_cache
+from app.services.review_service import review_service
 from app.utils.dependencies import require_organizer, get_current_user
-from app.models.review import CriterionCreate, CriterionUpdate
+from app.models.review import CriterionCreate, CriterionUpdate, CriterionReorder
 
 router = APIRouter(prefix="/events/{event_id}/criteria", tags=["criteria"])
 
+# Raised by the reorder function for unknown/duplicate ids, and by the
+# uuid cast for malformed ones
+REORDER_ERROR_CODES = ("P0002", "22P02")
 
-def _check_draft(event_id: str):
+
+async def _check_draft(event_id: str):
     """Ensure the event is in draft status."""
-    event = supabase.table("events").select("status").eq("id", event_id).single().execute()
-    if not event.data:
+    event = event_cache.peek(event_id)
+    if not event or event["status"] == "draft":
+        # Status only moves forward, so a cached non-draft status is final;
+        # a cached "draft" may be stale and is re-read before allowing edits.
+        event = await event_cache.get(event_id, fresh=True)
+    if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    if event.data["status"] != "draft":
+    if event["status"] != "draft":
         raise HTTPException(
             status_code=400,
             detail="Criteria are locked after the event opens",
@@ -30,10 +41,10 @@ async def add_criterion(
     user: dict = Depends(require_organizer),
 ):
     """Add a judging criterion to an event."""
-    _check_draft(event_id)
+    await _check_draft(event_id)
 
     existing = (
-        supabase.table("criteria")
+        await db.table("criteria")
         .select("sort_order")
         .eq("event_id", event_id)
         .order("sort_order", desc=True)
@@ -46,9 +57,10 @@ async def add_criterion(
     data["event_id"] = event_id
     data["sort_order"] = next_order
 
-    result = supabase.table("criteria").insert(data).execute()
+    result = await db.table("criteria").insert(data).execute()
     if not result.data:
         raise HTTPException(status_code=400, detail="Failed to add criterion")
+    review_service.invalidate_criteria(event_id)
     return result.data[0]
 
 
@@ -56,7 +68,7 @@ async def add_criterion(
 async def list_criteria(event_id: str, _user: dict = Depends(get_current_user)):
     """List all judging criteria for an event."""
     result = (
-        supabase.table("criteria")
+        await db.table("criteria")
         .select("*")
         .eq("event_id", event_id)
         .order("sort_order")
@@ -65,6 +77,30 @@ async def list_criteria(event_id: str, _user: dict = Depends(get_current_user)):
     return result.data
 
 
+# Must be registered before PUT /{criterion_id}, which would otherwise match "/reorder"
+@router.put("/reorder")
+async def reorder_criteria(
+    event_id: str,
+    body: CriterionReorder,
+    user: dict = Depends(require_organizer),
+):
+    """Batch reorder judging criteria in one atomic call."""
+    await _check_draft(event_id)
+
+    try:
+        await db.rpc(
+            "reorder_criteria",
+            {"p_event_id": event_id, "p_order": [item.model_dump() for item in body.order]},
+        ).execute()
+    except APIError as e:
+        if e.code in REORDER_ERROR_CODES:
+            raise HTTPException(status_code=400, detail="Unknown or duplicate criterion id in order")
+        raise
+
+    review_service.invalidate_criteria(event_id)
+    return {"message": "Criteria reordered"}
+
+
 @router.put("/{criterion_id}")
 async def update_criterion(
     event_id: str,
@@ -73,14 +109,14 @@ async def update_criterion(
     user: dict = Depends(require_organizer),
 ):
     """Update a judging criterion."""
-    _check_draft(event_id)
+    await _check_draft(event_id)
 
     update_data = body.model_dump(exclude_none=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
 
     result = (
-        supabase.table("criteria")
+        await db.table("criteria")
         .update(update_data)
         .eq("id", criterion_id)
         .eq("event_id", event_id)
@@ -88,6 +124,7 @@ async def update_criterion(
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Criterion not found")
+    review_service.invalidate_criteria(event_id)
     return result.data[0]
 
 
@@ -98,6 +135,7 @@ async def delete_criterion(
     user: dict = Depends(require_organizer),
 ):
     """Delete a judging criterion."""
-    _check_draft(event_id)
-    supabase.table("criteria").delete().eq("id", criterion_id).eq("event_id", event_id).execute()
+    await _check_draft(event_id)
+    await db.table("criteria").delete().eq("id", criterion_id).eq("event_id", event_id).execute()
+    review_service.invalidate_criteria(event_id)
     return {"message": "Criterion deleted"}
@@ -5,102 +5,157 @@ Organizer dashboard, leaderboard, statistics, and CSV export.
 
 import io
 import csv
-from fastapi import APIRouter, HTTPException, Depends
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi.responses import StreamingResponse
-from app.supabase_client import supabase
+from app.supabase_client import db
 from app.utils.dependencies import require_organizer
+from app.utils.etag import conditional_get
+from app.services.event_cache import event_cache
 from app.services.scoring_service import scoring_service
 
 router = APIRouter(prefix="/events/{event_id}", tags=["dashboard"])
 
 
 @router.get("/dashboard")
-async def get_dashboard(event_id: str, user: dict = Depends(require_organizer)):
-    """Get complete dashboard data: event, stats, judge progress, leaderboard."""
-    # Verify ownership
-    event = supabase.table("events").select("organizer_id").eq("id", event_id).single().execute()
-    if not event.data:
-        raise HTTPException(404, "Event not found")
-    if event.data["organizer_id"] != user["id"]:
-        raise HTTPException(403, "Not the event organizer")
-
-    return await scoring_service.get_full_dashboard(event_id)
+async def get_dashboard(
+    event_id: str,
+    request: Request,
+    response: Response,
+    user: dict = Depends(require_organizer),
+):
+    """
+    Get complete dashboard data: event (metadata), stats, judge progress, leaderboard.
+    Supports If-None-Match (304 while the event is unchanged).
+    """
+    event = await event_cache.get_owned(event_id, user["id"])
+
+    return await conditional_get(
+        request, response, event_id,
+        lambda: scoring_service.get_full_dashboard(event_id, event=event),
+        "dashboard",
+    )
 
 
 @router.get("/leaderboard")
-async def get_leaderboard(event_id: str, user: dict = Depends(require_organizer)):
-    """Get ranked leaderboard with weighted scores."""
-    # Verify ownership
-    event = supabase.table("events").select("organizer_id").eq("id", event_id).single().execute()
-    if not event.data:
-        raise HTTPException(404, "Event not found")
-    if event.data["organizer_id"] != user["id"]:
-        raise HTTPException(403, "Not the event organizer")
-
-    return await scoring_service.compute_leaderboard(event_id)
+async def get_leaderboard(
+    event_id: str,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    verify: bool = False,
+    user: dict = Depends(require_organizer),
+):
+    """
+    Get ranked leaderboard with weighted scores.
+    limit returns only the top entries; verify=true rebuilds the
+    leaderboard from the database before answering (and is never
+    answered with 304).
+    """
+    await event_cache.get_owned(event_id, user["id"])
+
+    if verify:
+        return await scoring_service.get_leaderboard(event_id, limit=limit, verify=True)
+    return await conditional_get(
+        request, response, event_id,
+        lambda: scoring_service.get_leaderboard(event_id, limit=limit),
+        "leaderboard", limit,
+    )
 
 
 @router.get("/judge-progress")
-async def get_judge_progress(event_id: str, user: dict = Depends(require_organizer)):
-    """Get per-judge progress statistics."""
-    # Verify ownership
-    event = supabase.table("events").select("organizer_id").eq("id", event_id).single().execute()
-    if not event.data:
-        raise HTTPException(404, "Event not found")
-    if event.data["organizer_id"] != user["id"]:
-        raise HTTPException(403, "Not the event organizer")
-
-    return await scoring_service.compute_judge_progress(event_id)
+async def get_judge_progress(
+    event_id: str,
+    request: Request,
+    response: Response,
+    user: dict = Depends(require_organizer),
+):
+    """Get per-judge progress statistics. Supports If-None-Match."""
+    await event_cache.get_owned(event_id, user["id"])
+
+    return await conditional_get(
+        request, response, event_id,
+        lambda: scoring_service.compute_judge_progress(event_id),
+        "judge-progress",
+    )
 
 
 @router.get("/bias-report")
 async def get_bias_report(event_id: str, user: dict = Depends(require_organizer)):
     """Get judge bias analysis report."""
-    # Verify ownership
-    event = supabase.table("events").select("organizer_id").eq("id", event_id).single().execute()
-    if not event.data:
-        raise HTTPException(404, "Event not found")
-    if event.data["organizer_id"] != user["id"]:
-        raise HTTPException(403, "Not the event organizer")
+    await event_cache.get_owned(event_id, user["id"])
 
     return await scoring_service.compute_bias_report(event_id)
 
 
 @router.get("/export")
-async def export_csv(event_id: str, user: dict = Depends(require_organizer)):
-    """Export leaderboard and scores to CSV file."""
-    # Verify ownership
-    event_result = supabase.table("events").select("*").eq("id", event_id).single().execute()
-    if not event_result.data:
-        raise HTTPException(404, "Event not found")
-    if event_result.data["organizer_id"] != user["id"]:
-        raise HTTPException(403, "Not the event organizer")
-
-    event = event_result.data
-
-    # Get leaderboard and criteria
-    leaderboard = await scoring_service.compute_leaderboard(event_id)
-    criteria_result = (
-        supabase.table("criteria")
-        .select("*")
+async def export_csv(
+    event_id: str,
+    detail: bool = False,
+    user: dict = Depends(require_organizer),
+):
+    """
+    Export leaderboard and scores to CSV file.
+
+    The file is streamed in chunks as rows are produced. With detail=true,
+    each row is a single (submission, judge, criterion) score; reviews are
+    paged from the database so memory stays flat for large events.
+    """
+    event = await event_cache.get_owned(event_id, user["id"])
+
+    rows = _detail_rows(event_id) if detail else _leaderboard_rows(event_id)
+    kind = "scores" if detail else "leaderboard"
+    filename = f"{kind}_{event.get('name', 'event').replace(' ', '_')}_{event_id[:8]}.csv"
+    return StreamingResponse(
+        _csv_chunks(rows),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+# ── CSV streaming helpers ──
+
+_CSV_CHUNK_ROWS = 500
+
+
+async def _csv_chunks(rows: AsyncIterator[list]) -> AsyncIterator[str]:
+    """Serialize rows to CSV, yielding one string per chunk of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    pending = 0
+    async for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= _CSV_CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+async def _fetch_criteria(event_id: str) -> list[dict]:
+    return (
+        await db.table("criteria")
+        .select("id, name, weight")
         .eq("event_id", event_id)
         .order("sort_order")
         .execute()
-    )
-    criteria = criteria_result.data or []
+    ).data or []
 
-    # Build CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
 
-    # Header
+async def _leaderboard_rows(event_id: str) -> AsyncIterator[list]:
+    """One row per ranked submission with per-criterion averages."""
+    criteria = await _fetch_criteria(event_id)
+
     header = ["Rank", "Project Name", "Weighted Score"]
     for crit in criteria:
         header.append(f"{crit['name']} (avg)")
     header.append("Review Count")
-    writer.writerow(header)
+    yield header
 
-    # Data rows
+    leaderboard = await scoring_service.get_leaderboard(event_id)
     for entry in leaderboard:
         row = [
             entry["rank"],
@@ -111,12 +166,49 @@ async def export_csv(event_id: str, user: dict = Depends(require_organizer)):
             crit_score = entry["criteria_scores"].get(crit["id"], {})
             row.append(crit_score.get("average", ""))
         row.append(entry["review_count"])
-        writer.writerow(row)
+        yield row
 
-    # Return as downloadable file
-    filename = f"leaderboard_{event.get('name', 'event').replace(' ', '_')}_{event_id[:8]}.csv"
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
+
+async def _detail_rows(event_id: str) -> AsyncIterator[list]:
+    """One row per (submission, judge, criterion) score, paging through reviews."""
+    yield [
+        "Rank", "Project Name", "Submission ID", "Judge", "Judge Email",
+        "Criterion", "Score", "Weight", "Submitted At",
+    ]
+
+    criteria = await _fetch_criteria(event_id)
+    if not criteria:
+        return
+
+    # Rank / project name per submission (one small dict, not the reviews)
+    leaderboard = await scoring_service.get_leaderboard(event_id)
+    ranking = {e["submission_id"]: (e["rank"], e["project_name"]) for e in leaderboard}
+    del leaderboard
+
+    judges_result = (
+        await db.table("event_judges")
+        .select("judge_id, profiles:judge_id(name, email)")
+        .eq("event_id", event_id)
+        .execute()
     )
+    judges = {
+        ej["judge_id"]: ej.get("profiles") or {}
+        for ej in (judges_result.data or [])
+    }
+
+    names = {crit["id"]: crit["name"] for crit in criteria}
+    weights = {crit["id"]: crit.get("weight", 1.0) for crit in criteria}
+    async for score in scoring_service.iter_review_scores(event_id, list(names)):
+        rank, project_name = ranking.get(score["submission_id"], ("", ""))
+        judge = judges.get(score["judge_id"], {})
+        yield [
+            rank,
+            project_name,
+            score["submission_id"],
+            judge.get("name", ""),
+            judge.get("email", ""),
+            names[score["criterion_id"]],
+            score["score"],
+            weights[score["criterion_id"]],
+            score["submitted_at"],
+        ]
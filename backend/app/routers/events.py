@@ -4,11 +4,12 @@ CRUD for events with status transitions and ownership checks.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from app.supabase_client import supabase
+from app.supabase_client import db
 from app.utils.dependencies import get_current_user, require_organizer
 from app.models.event import EventCreate, EventUpdate, EventStatusUpdate
-from app.services.archestra_service import archestra_service
-from app.services.submission_service import submission_service
+from app.services.event_cache import event_cache
+from app.services.job_service import job_service
+from app.services.orchestration_service import ASSIGN_JUDGES_JOB
 
 router = APIRouter(prefix="/events", tags=["events"])
 
@@ -31,7 +32,7 @@ async def create_event(
     data["start_at"] = data["start_at"].isoformat()
     data["end_at"] = data["end_at"].isoformat()
 
-    result = supabase.table("events").insert(data).execute()
+    result = await db.table("events").insert(data).execute()
     if not result.data:
         raise HTTPException(status_code=400, detail="Failed to create event")
     return result.data[0]
@@ -42,7 +43,7 @@ async def list_events(user: dict = Depends(get_current_user)):
     """List events. Organizers see their own; others see open/judging/closed."""
     if user["role"] == "organizer":
         result = (
-            supabase.table("events")
+            await db.table("events")
             .select("*")
             .eq("organizer_id", user["id"])
             .order("created_at", desc=True)
@@ -50,7 +51,7 @@ async def list_events(user: dict = Depends(get_current_user)):
         )
     else:
         result = (
-            supabase.table("events")
+            await db.table("events")
             .select("*")
             .neq("status", "draft")
             .order("created_at", desc=True)
@@ -62,7 +63,7 @@ async def list_events(user: dict = Depends(get_current_user)):
 @router.get("/{event_id}")
 async def get_event(event_id: str, _user: dict = Depends(get_current_user)):
     """Get a single event by ID."""
-    result = supabase.table("events").select("*").eq("id", event_id).single().execute()
+    result = await db.table("events").select("*").eq("id", event_id).single().execute()
     if not result.data:
         raise HTTPException(status_code=404, detail="Event not found")
     return result.data
@@ -75,7 +76,7 @@ async def update_event(
     user: dict = Depends(require_organizer),
 ):
     """Update an event (organizer owner only)."""
-    event = supabase.table("events").select("*").eq("id", event_id).single().execute()
+    event = await db.table("events").select("*").eq("id", event_id).single().execute()
     if not event.data:
         raise HTTPException(status_code=404, detail="Event not found")
     _verify_event_owner(event.data, user["id"])
@@ -90,18 +91,19 @@ async def update_event(
             update_data[key] = update_data[key].isoformat()
 
     result = (
-        supabase.table("events")
+        await db.table("events")
         .update(update_data)
         .eq("id", event_id)
         .execute()
     )
+    event_cache.invalidate(event_id)
     return result.data[0]
 
 
 @router.delete("/{event_id}")
 async def delete_event(event_id: str, user: dict = Depends(require_organizer)):
     """Delete a draft event (organizer owner only)."""
-    event = supabase.table("events").select("*").eq("id", event_id).single().execute()
+    event = await db.table("events").select("*").eq("id", event_id).single().execute()
     if not event.data:
         raise HTTPException(status_code=404, detail="Event not found")
     _verify_event_owner(event.data, user["id"])
@@ -109,7 +111,8 @@ async def delete_event(event_id: str, user: dict = Depends(require_organizer)):
     if event.data["status"] != "draft":
         raise HTTPException(status_code=400, detail="Can only delete draft events")
 
-    supabase.table("events").delete().eq("id", event_id).execute()
+    await db.table("events").delete().eq("id", event_id).execute()
+    event_cache.invalidate(event_id)
     return {"message": "Event deleted"}
 
 
@@ -120,7 +123,7 @@ async def transition_status(
     user: dict = Depends(require_organizer),
 ):
     """Transition event status with validation."""
-    event = supabase.table("events").select("*").eq("id", event_id).single().execute()
+    event = await db.table("events").select("*").eq("id", event_id).single().execute()
     if not event.data:
         raise HTTPException(status_code=404, detail="Event not found")
     _verify_event_owner(event.data, user["id"])
@@ -143,7 +146,7 @@ async def transition_status(
     # Pre-conditions for opening
     if new_status == "open":
         criteria = (
-            supabase.table("criteria")
+            await db.table("criteria")
             .select("id")
             .eq("event_id", event_id)
             .execute()
@@ -154,7 +157,7 @@ async def transition_status(
                 detail="Add at least 1 judging criterion before opening",
             )
         fields = (
-            supabase.table("form_fields")
+            await db.table("form_fields")
             .select("id")
             .eq("event_id", event_id)
             .execute()
@@ -165,71 +168,25 @@ async def transition_status(
                 detail="Add at least 1 form field before opening",
             )
 
-    supabase.table("events").update({"status": new_status}).eq("id", event_id).execute()
+    await db.table("events").update({"status": new_status}).eq("id", event_id).execute()
+    event_cache.invalidate(event_id)
 
-    # Auto-assign judges when transitioning to "judging"
+    # Auto-assign judges in the background when transitioning to "judging"
     assignment_info = None
     if new_status == "judging":
         try:
-            # Get judges
-            ej_result = (
-                supabase.table("event_judges")
-                .select("judge_id, profiles:judge_id(id, name)")
-                .eq("event_id", event_id)
-                .execute()
+            job = await job_service.submit(
+                ASSIGN_JUDGES_JOB,
+                event_id,
+                {
+                    "judges_per_submission": event.data.get("judges_per_submission", 2),
+                    "mode": "incremental",
+                },
+                created_by=user["id"],
             )
-            judges = [
-                {"id": ej["judge_id"], "name": (ej.get("profiles") or {}).get("name", ""), "current_load": 0}
-                for ej in (ej_result.data or [])
-            ]
-
-            # Get submissions
-            subs_result = (
-                supabase.table("submissions")
-                .select("id, form_data")
-                .eq("event_id", event_id)
-                .execute()
-            )
-            submissions = subs_result.data or []
-
-            # Get form fields for project name
-            form_fields = (
-                supabase.table("form_fields")
-                .select("*")
-                .eq("event_id", event_id)
-                .order("sort_order")
-                .execute()
-            ).data or []
-
-            for sub in submissions:
-                display = submission_service.enrich_for_display(sub.get("form_data", {}), form_fields)
-                sub["project_name"] = next(
-                    (d["value"] for d in display if d["field_type"] == "short_text" and d["value"]),
-                    f"Submission {sub['id'][:8]}",
-                )
-
-            if judges and submissions:
-                result = await archestra_service.assign_judges(
-                    judges=judges,
-                    submissions=submissions,
-                    judges_per_submission=event.data.get("judges_per_submission", 2),
-                )
-
-                # Clear old and insert new
-                supabase.table("judge_assignments").delete().eq("event_id", event_id).execute()
-                new_assigns = [
-                    {"event_id": event_id, "judge_id": a["judge_id"], "submission_id": a["submission_id"], "status": "pending"}
-                    for a in result.get("assignments", [])
-                ]
-                if new_assigns:
-                    supabase.table("judge_assignments").insert(new_assigns).execute()
-
-                assignment_info = {
-                    "assignments_created": len(new_assigns),
-                    "strategy": result.get("strategy", "unknown"),
-                }
+            assignment_info = {"job_id": job["id"], "status": job["status"]}
         except Exception as e:
-            # Don't block the transition if assignment fails
+            # Don't block the transition if assignment can't be queued
             assignment_info = {"error": str(e)}
 
     response = {"status": new_status, "message": f"Event transitioned to '{new_status}'"}
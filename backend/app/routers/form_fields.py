@@ -5,19 +5,30 @@ Fields are locked when event status != draft.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from app.supabase_client import supabase
+from postgrest.exceptions import APIError
+from app.supabase_client import db
+from app.services.event_cache import event_cache
+from app.services.submission_service import submission_service
 from app.utils.dependencies import require_organizer, get_current_user
 from app.models.form_field import FormFieldCreate, FormFieldUpdate, FormFieldReorder
 
 router = APIRouter(prefix="/events/{event_id}/form-fields", tags=["form-fields"])
 
+# Raised by the reorder function for unknown/duplicate ids, and by the
+# uuid cast for malformed ones
+REORDER_ERROR_CODES = ("P0002", "22P02")
 
-def _check_draft(event_id: str):
+
+async def _check_draft(event_id: str):
     """Ensure the event is in draft status (fields are locked otherwise)."""
-    event = supabase.table("events").select("status").eq("id", event_id).single().execute()
-    if not event.data:
+    event = event_cache.peek(event_id)
+    if not event or event["status"] == "draft":
+        # Status only moves forward, so a cached non-draft status is final;
+        # a cached "draft" may be stale and is re-read before allowing edits.
+        event = await event_cache.get(event_id, fresh=True)
+    if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    if event.data["status"] != "draft":
+    if event["status"] != "draft":
         raise HTTPException(
             status_code=400,
             detail="Form fields are locked after the event opens",
@@ -31,11 +42,11 @@ async def add_field(
     user: dict = Depends(require_organizer),
 ):
     """Add a new form field to an event."""
-    _check_draft(event_id)
+    await _check_draft(event_id)
 
     # Get current max sort_order
     existing = (
-        supabase.table("form_fields")
+        await db.table("form_fields")
         .select("sort_order")
         .eq("event_id", event_id)
         .order("sort_order", desc=True)
@@ -48,9 +59,10 @@ async def add_field(
     data["event_id"] = event_id
     data["sort_order"] = next_order
 
-    result = supabase.table("form_fields").insert(data).execute()
+    result = await db.table("form_fields").insert(data).execute()
     if not result.data:
         raise HTTPException(status_code=400, detail="Failed to add field")
+    submission_service.invalidate_form_schema(event_id)
     return result.data[0]
 
 
@@ -58,7 +70,7 @@ async def add_field(
 async def list_fields(event_id: str, _user: dict = Depends(get_current_user)):
     """List all form fields for an event, ordered by sort_order."""
     result = (
-        supabase.table("form_fields")
+        await db.table("form_fields")
         .select("*")
         .eq("event_id", event_id)
         .order("sort_order")
@@ -67,6 +79,30 @@ async def list_fields(event_id: str, _user: dict = Depends(get_current_user)):
     return result.data
 
 
+# Must be registered before PUT /{field_id}, which would otherwise match "/reorder"
+@router.put("/reorder")
+async def reorder_fields(
+    event_id: str,
+    body: FormFieldReorder,
+    user: dict = Depends(require_organizer),
+):
+    """Batch reorder form fields in one atomic call."""
+    await _check_draft(event_id)
+
+    try:
+        await db.rpc(
+            "reorder_form_fields",
+            {"p_event_id": event_id, "p_order": [item.model_dump() for item in body.order]},
+        ).execute()
+    except APIError as e:
+        if e.code in REORDER_ERROR_CODES:
+            raise HTTPException(status_code=400, detail="Unknown or duplicate field id in order")
+        raise
+
+    submission_service.invalidate_form_schema(event_id)
+    return {"message": "Fields reordered"}
+
+
 @router.put("/{field_id}")
 async def update_field(
     event_id: str,
@@ -75,14 +111,14 @@ async def update_field(
     user: dict = Depends(require_organizer),
 ):
     """Update a form field."""
-    _check_draft(event_id)
+    await _check_draft(event_id)
 
     update_data = body.model_dump(exclude_none=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
 
     result = (
-        supabase.table("form_fields")
+        await db.table("form_fields")
         .update(update_data)
         .eq("id", field_id)
         .eq("event_id", event_id)
@@ -90,6 +126,7 @@ async def update_field(
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Field not found")
+    submission_service.invalidate_form_schema(event_id)
     return result.data[0]
 
 
@@ -100,26 +137,12 @@ async def delete_field(
     user: dict = Depends(require_organizer),
 ):
     """Delete a form field."""
-    _check_draft(event_id)
-    supabase.table("form_fields").delete().eq("id", field_id).eq("event_id", event_id).execute()
+    await _check_draft(event_id)
+    await db.table("form_fields").delete().eq("id", field_id).eq("event_id", event_id).execute()
+    submission_service.invalidate_form_schema(event_id)
     return {"message": "Field deleted"}
 
 
-@router.put("/reorder")
-async def reorder_fields(
-    event_id: str,
-    body: FormFieldReorder,
-    user: dict = Depends(require_organizer),
-):
-    """Batch reorder form fields."""
-    _check_draft(event_id)
-
-    for item in body.order:
-        supabase.table("form_fields").update({"sort_order": item.sort_order}).eq("id", item.id).execute()
-
-    return {"message": "Fields reordered"}
-
-
 @router.post("/duplicate/{field_id}")
 async def duplicate_field(
     event_id: str,
@@ -127,10 +150,10 @@ async def duplicate_field(
     user: dict = Depends(require_organizer),
 ):
     """Duplicate a form field with '(Copy)' suffix."""
-    _check_draft(event_id)
+    await _check_draft(event_id)
 
     original = (
-        supabase.table("form_fields")
+        await db.table("form_fields")
         .select("*")
         .eq("id", field_id)
         .eq("event_id", event_id)
@@ -142,7 +165,7 @@ async def duplicate_field(
 
     # Get next sort_order
     existing = (
-        supabase.table("form_fields")
+        await db.table("form_fields")
         .select("sort_order")
         .eq("event_id", event_id)
         .order("sort_order", desc=True)
@@ -162,7 +185,8 @@ async def duplicate_field(
         "sort_order": next_order,
     }
 
-    result = supabase.table("form_fields").insert(new_field).execute()
+    result = await db.table("form_fields").insert(new_field).execute()
     if not result.data:
         raise HTTPException(status_code=400, detail="Failed to duplicate field")
+    submission_service.invalidate_form_schema(event_id)
     return result.data[0]
@@ -0,0 +1,21 @@
+"""
+Juryline -- Jobs Router
+Status polling for background jobs.
+"""
+
+from fastapi import APIRouter, HTTPException, Depends
+from app.utils.dependencies import require_organizer
+from app.services.event_cache import event_cache
+from app.services.job_service import job_service
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, user: dict = Depends(require_organizer)):
+    """Get a job's status, progress and result (organizer of the job's event)."""
+    job = await job_service.get(job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    await event_cache.get_owned(job["event_id"], user["id"])
+    return job
@@ -6,8 +6,9 @@ Invite and manage judges for events via Supabase magic links.
 import logging
 import httpx
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
-from app.supabase_client import supabase
+from app.supabase_client import supabase, db
 from app.config import get_settings
 from app.utils.dependencies import require_organizer, get_current_user
 
@@ -24,7 +25,7 @@ class JudgeInviteRequest(BaseModel):
 async def list_judges(event_id: str, user: dict = Depends(require_organizer)):
     """List all invited judges for an event."""
     result = (
-        supabase.table("event_judges")
+        await db.table("event_judges")
         .select("*, profiles:judge_id(id, name, email, avatar_url)")
         .eq("event_id", event_id)
         .execute()
@@ -47,7 +48,7 @@ async def invite_judge(
 
         # 1. Try to CREATE the user first (Optimistic approach)
         try:
-            user_resp = supabase.auth.admin.create_user({
+            user_resp = await run_in_threadpool(supabase.auth.admin.create_user, {
                 "email": body.email,
                 "email_confirm": True,
                 "user_metadata": {"name": body.name, "role": "judge"},
@@ -60,7 +61,7 @@ async def invite_judge(
             logger.info(f"User creation failed (likely exists), fetching profile: {e}")
             
             existing_user = (
-                supabase.table("profiles")
+                await db.table("profiles")
                 .select("id")
                 .eq("email", body.email)
                 .maybe_single()
@@ -85,7 +86,7 @@ async def invite_judge(
         email_sent = False
         email_error = None
         try:
-            supabase.auth.sign_in_with_otp({
+            await run_in_threadpool(supabase.auth.sign_in_with_otp, {
                 "email": body.email,
                 "options": {
                     "email_redirect_to": redirect_url,
@@ -103,7 +104,7 @@ async def invite_judge(
 
         # Check if already invited to THIS event
         existing_invite = (
-            supabase.table("event_judges")
+            await db.table("event_judges")
             .select("id")
             .eq("event_id", event_id)
             .eq("judge_id", judge_user_id)
@@ -122,7 +123,7 @@ async def invite_judge(
             }
 
         # Create event_judges record
-        supabase.table("event_judges").insert({
+        await db.table("event_judges").insert({
             "event_id": event_id,
             "judge_id": judge_user_id,
             "invite_status": "pending",
@@ -150,13 +151,13 @@ async def get_invite_info(event_id: str, user: dict = Depends(get_current_user))
     can show "You've been invited by [organizer]".
     """
     # Fetch the event
-    event = supabase.table("events").select("id, name, description, status").eq("id", event_id).single().execute()
+    event = await db.table("events").select("id, name, description, status").eq("id", event_id).single().execute()
     if not event.data:
         raise HTTPException(status_code=404, detail="Event not found")
 
     # Fetch the organizer profile
     organizer = (
-        supabase.table("events")
+        await db.table("events")
         .select("organizer_id, profiles:organizer_id(name, email)")
         .eq("id", event_id)
         .single()
@@ -166,7 +167,7 @@ async def get_invite_info(event_id: str, user: dict = Depends(get_current_user))
 
     # Fetch invite status for this judge
     invite = (
-        supabase.table("event_judges")
+        await db.table("event_judges")
         .select("id, invite_status, invited_at")
         .eq("event_id", event_id)
         .eq("judge_id", user["id"])
@@ -185,7 +186,7 @@ async def get_invite_info(event_id: str, user: dict = Depends(get_current_user))
 async def accept_invite(event_id: str, user: dict = Depends(get_current_user)):
     """Mark the judge's invitation as accepted."""
     result = (
-        supabase.table("event_judges")
+        await db.table("event_judges")
         .update({"invite_status": "accepted"})
         .eq("event_id", event_id)
         .eq("judge_id", user["id"])
@@ -203,5 +204,5 @@ async def remove_judge(
     user: dict = Depends(require_organizer),
 ):
     """Remove a judge from an event."""
-    supabase.table("event_judges").delete().eq("id", judge_record_id).eq("event_id", event_id).execute()
+    await db.table("event_judges").delete().eq("id", judge_record_id).eq("event_id", event_id).execute()
     return {"message": "Judge removed"}
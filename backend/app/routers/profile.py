@@ -4,8 +4,8 @@ Handles user profile read and update.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from app.supabase_client import supabase
-from app.utils.dependencies import get_current_user
+from app.supabase_client import db
+from app.utils.dependencies import get_current_user, profile_cache
 from app.models.user import ProfileUpdate
 
 router = APIRouter(prefix="/profiles", tags=["profiles"])
@@ -29,15 +29,18 @@ async def update_profile(
         raise HTTPException(status_code=400, detail="No fields to update")
 
     result = (
-        supabase.table("profiles")
+        await db.table("profiles")
         .update(update_data)
         .eq("id", user["id"])
         .execute()
     )
 
     if not result.data:
+        profile_cache.invalidate(user["id"])
         raise HTTPException(status_code=404, detail="Profile not found")
 
+    # Write-through so the next request sees the new profile
+    profile_cache.set(user["id"], result.data[0])
     return result.data[0]
 
 
@@ -48,7 +51,7 @@ async def get_profile_by_id(
 ):
     """Get any user's public profile (requires auth)."""
     result = (
-        supabase.table("profiles")
+        await db.table("profiles")
         .select("id, name, role, avatar_url, created_at")
         .eq("id", user_id)
         .execute()
@@ -3,10 +3,16 @@ Juryline -- Reviews Router
 Judge queue, review CRUD, and organizer review listing.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from functools import partial
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from app.utils.dependencies import require_judge, require_organizer, get_current_user
 from app.models.review import ReviewCreate, ReviewUpdate
+from app.services.event_cache import event_cache
+from app.services.export_service import EXPORT_FORMATS, export_service
 from app.services.review_service import review_service
+from app.utils.etag import conditional_get
 
 router = APIRouter(tags=["reviews"])
 
@@ -14,13 +20,40 @@ router = APIRouter(tags=["reviews"])
 # ── Judge Queue ──
 
 @router.get("/judges/queue/{event_id}")
-async def get_judge_queue(event_id: str, user: dict = Depends(require_judge)):
+async def get_judge_queue(
+    event_id: str,
+    request: Request,
+    response: Response,
+    format: str = Query("full", pattern="^(full|lean)$"),
+    offset: Optional[int] = Query(None, ge=0),
+    limit: int = Query(5, ge=1, le=50),
+    user: dict = Depends(require_judge),
+):
     """
     Get the judge's review queue for an event.
-    Returns submissions with form_data_display, form_fields, review status,
-    and resume position.
+
+    format=full (default) returns every submission with form_data_display,
+    form_fields, review status, and resume position. format=lean returns
+    form_fields once plus a window of `limit` items starting at `offset`
+    (default: just before the resume position); offset and limit only
+    apply to the lean format. Supports If-None-Match (304 while the
+    event is unchanged); the ETag is specific to the judge and the query.
     """
-    return await review_service.get_judge_queue(user["id"], event_id)
+    # Before conditional_get: a 304 must not bypass the judge check
+    await review_service.require_event_judge(user["id"], event_id)
+
+    if format == "lean":
+        compute = partial(
+            review_service.get_judge_queue_window,
+            user["id"], event_id, offset=offset, limit=limit,
+        )
+    else:
+        compute = partial(review_service.get_judge_queue, user["id"], event_id)
+
+    return await conditional_get(
+        request, response, event_id, compute,
+        "judge-queue", user["id"], format, offset, limit,
+    )
 
 
 # ── Review CRUD ──
@@ -71,3 +104,26 @@ async def list_event_reviews(
 ):
     """List all reviews for an event (organizer only)."""
     return await review_service.list_event_reviews(event_id)
+
+
+@router.get("/events/{event_id}/reviews/export")
+async def export_event_reviews(
+    event_id: str,
+    format: str = Query("parquet", pattern="^(parquet|arrow)$"),
+    user: dict = Depends(require_organizer),
+):
+    """
+    Export every review score as a columnar file (organizer only).
+    One row per (submission, judge, criterion) with typed columns;
+    format=parquet (default) or arrow (Arrow IPC stream).
+    """
+    await event_cache.get_owned(event_id, user["id"])
+    export_service.check_format(format)
+
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"reviews_{event_id[:8]}.{extension}"
+    return StreamingResponse(
+        export_service.stream_reviews(event_id, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
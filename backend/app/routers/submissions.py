@@ -3,15 +3,19 @@ Juryline -- Submissions Router
 CRUD for submissions with dynamic form_data validation.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from app.supabase_client import supabase
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
+from app.supabase_client import db
 from app.utils.dependencies import (
     get_current_user,
     require_organizer,
     require_participant,
 )
 from app.models.submission import SubmissionCreate, SubmissionUpdate
+from app.services.event_cache import event_cache
+from app.services.leaderboard_engine import leaderboard_engine
 from app.services.submission_service import submission_service
+from app.services.validation_service import ingest_validation_service
 
 router = APIRouter(tags=["submissions"])
 
@@ -26,7 +30,7 @@ async def create_submission(
     """Submit to an event. One submission per participant per event."""
     # Verify event exists and is open
     event_result = (
-        supabase.table("events").select("*").eq("id", event_id).execute()
+        await db.table("events").select("*").eq("id", event_id).execute()
     )
     if not event_result.data:
         raise HTTPException(404, "Event not found")
@@ -37,7 +41,7 @@ async def create_submission(
 
     # Check for duplicate submission
     existing = (
-        supabase.table("submissions")
+        await db.table("submissions")
         .select("id")
         .eq("event_id", event_id)
         .eq("participant_id", user["id"])
@@ -49,31 +53,16 @@ async def create_submission(
     # Validate form_data against form_fields
     await submission_service.validate_form_data(event_id, body.form_data)
 
-    # Archestra AI Validation (Non-blocking)
-    from app.services.archestra_service import archestra_service
-    import logging
-    
-    # Create a copy of form_data to avoid mutating the input model directly if needed
-    final_form_data = body.form_data.copy()
-    
-    try:
-        validation_result = await archestra_service.validate_submission(final_form_data)
-        # Inject AI validation results into metadata field
-        final_form_data["_ai_validation"] = validation_result
-        if not validation_result.get("valid", True):
-            logging.info(f"Archestra flagged submission in event {event_id} with errors/warnings")
-    except Exception as e:
-        logging.warning(f"Archestra validation failed gracefully: {e}")
-        # Continue without validation data if AI fails
-
-    # Insert
+    # Insert now; Archestra ingest validation runs in the background and
+    # writes its result to form_data._ai_validation when it completes
     result = (
-        supabase.table("submissions")
+        await db.table("submissions")
         .insert(
             {
                 "event_id": event_id,
                 "participant_id": user["id"],
-                "form_data": final_form_data,
+                "form_data": body.form_data,
+                "ai_validation_status": "pending",
             }
         )
         .execute()
@@ -81,6 +70,8 @@ async def create_submission(
     if not result.data:
         raise HTTPException(400, "Failed to create submission")
 
+    ingest_validation_service.enqueue(result.data[0]["id"])
+    leaderboard_engine.invalidate(event_id)
     return result.data[0]
 
 
@@ -89,34 +80,37 @@ async def create_submission(
 async def list_submissions(
     event_id: str,
     user: dict = Depends(get_current_user),
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[str] = None,
+    status: Optional[str] = Query(None, pattern="^(submitted|in_review|completed)$"),
+    has_reviews: Optional[bool] = None,
+    flagged: Optional[bool] = None,
+    validation_status: Optional[str] = Query(None, pattern="^(pending|running|completed|failed)$"),
+    view: str = Query("full", pattern="^(full|summary)$"),
 ):
     """
     Organizers see all submissions for their event.
     Judges see submissions assigned to them (future: judge_assignments).
+
+    Filters: status, has_reviews, flagged (AI validation marked invalid),
+    validation_status (progress of background AI ingest validation).
+    view=summary returns a lightweight projection instead of enriched rows.
+    Without `limit` the full list is returned. With `limit`, returns a
+    keyset page: {"items": [...], "next_cursor": str | null}; pass
+    next_cursor back as `cursor` to fetch the following page.
     """
     # Verify event exists
-    event_result = (
-        supabase.table("events").select("*").eq("id", event_id).execute()
-    )
-    if not event_result.data:
+    event = await event_cache.get(event_id)
+    if not event:
         raise HTTPException(404, "Event not found")
 
-    event = event_result.data[0]
-
     if user["role"] == "organizer":
         if event["organizer_id"] != user["id"]:
             raise HTTPException(403, "Not the event organizer")
-        result = (
-            supabase.table("submissions")
-            .select("*")
-            .eq("event_id", event_id)
-            .order("created_at", desc=True)
-            .execute()
-        )
     elif user["role"] == "judge":
         # For now judges see all submissions in events they are assigned to
         judge_check = (
-            supabase.table("event_judges")
+            await db.table("event_judges")
             .select("id")
             .eq("event_id", event_id)
             .eq("judge_id", user["id"])
@@ -124,23 +118,25 @@ async def list_submissions(
         )
         if not judge_check.data:
             raise HTTPException(403, "You are not a judge for this event")
-        result = (
-            supabase.table("submissions")
-            .select("*")
-            .eq("event_id", event_id)
-            .order("created_at", desc=True)
-            .execute()
-        )
     else:
         raise HTTPException(403, "Only organizers and judges can list submissions")
 
-    # Enrich each submission with field labels
-    submissions = []
-    for sub in result.data or []:
-        enriched = await submission_service.enrich_for_display(sub)
-        submissions.append(enriched)
-
-    return submissions
+    if cursor and limit is None:
+        raise HTTPException(400, "cursor requires limit")
+
+    items, next_cursor = await submission_service.list_for_event(
+        event_id,
+        view=view,
+        status=status,
+        has_reviews=has_reviews,
+        flagged=flagged,
+        validation_status=validation_status,
+        limit=limit,
+        cursor=cursor,
+    )
+    if limit is None:
+        return items
+    return {"items": items, "next_cursor": next_cursor}
 
 
 # ── Get own submission (participant) ──
@@ -151,7 +147,7 @@ async def get_my_submission(
 ):
     """Get the current participant's submission for an event."""
     result = (
-        supabase.table("submissions")
+        await db.table("submissions")
         .select("*")
         .eq("event_id", event_id)
         .eq("participant_id", user["id"])
@@ -171,7 +167,7 @@ async def get_submission(
 ):
     """Get a submission by ID with enriched display."""
     result = (
-        supabase.table("submissions")
+        await db.table("submissions")
         .select("*")
         .eq("id", submission_id)
         .execute()
@@ -186,13 +182,8 @@ async def get_submission(
         raise HTTPException(403, "Not your submission")
 
     if user["role"] == "organizer":
-        event_result = (
-            supabase.table("events")
-            .select("organizer_id")
-            .eq("id", sub["event_id"])
-            .execute()
-        )
-        if event_result.data and event_result.data[0]["organizer_id"] != user["id"]:
+        event = await event_cache.get(sub["event_id"])
+        if event and event["organizer_id"] != user["id"]:
             raise HTTPException(403, "Not the event organizer")
 
     return await submission_service.enrich_for_display(sub)
@@ -207,7 +198,7 @@ async def update_submission(
 ):
     """Update own submission. Only allowed when the event is still open."""
     result = (
-        supabase.table("submissions")
+        await db.table("submissions")
         .select("*")
         .eq("id", submission_id)
         .execute()
@@ -221,7 +212,7 @@ async def update_submission(
 
     # Check event is still open
     event_result = (
-        supabase.table("events")
+        await db.table("events")
         .select("status")
         .eq("id", sub["event_id"])
         .execute()
@@ -233,7 +224,7 @@ async def update_submission(
     await submission_service.validate_form_data(sub["event_id"], body.form_data)
 
     update_result = (
-        supabase.table("submissions")
+        await db.table("submissions")
         .update({"form_data": body.form_data})
         .eq("id", submission_id)
         .execute()
@@ -241,6 +232,7 @@ async def update_submission(
     if not update_result.data:
         raise HTTPException(400, "Failed to update submission")
 
+    leaderboard_engine.invalidate(sub["event_id"])
     return update_result.data[0]
 
 
@@ -252,7 +244,7 @@ async def delete_submission(
 ):
     """Delete own submission. Only allowed when the event is still open."""
     result = (
-        supabase.table("submissions")
+        await db.table("submissions")
         .select("*")
         .eq("id", submission_id)
         .execute()
@@ -265,7 +257,7 @@ async def delete_submission(
         raise HTTPException(403, "Not your submission")
 
     event_result = (
-        supabase.table("events")
+        await db.table("events")
         .select("status")
         .eq("id", sub["event_id"])
         .execute()
@@ -273,5 +265,6 @@ async def delete_submission(
     if not event_result.data or event_result.data[0]["status"] != "open":
         raise HTTPException(400, "Event is no longer accepting deletions")
 
-    supabase.table("submissions").delete().eq("id", submission_id).execute()
+    await db.table("submissions").delete().eq("id", submission_id).execute()
+    leaderboard_engine.invalidate(sub["event_id"])
     return {"message": "Submission deleted"}
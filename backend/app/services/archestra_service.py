@@ -2,17 +2,26 @@
 Juryline -- Archestra A2A Client
 Calls Archestra agents via JSON-RPC 2.0 protocol.
 Falls back to deterministic FallbackService when Archestra is offline/unconfigured.
+
+Agent calls share one pooled httpx client (keep-alive, optional HTTP/2),
+opened and closed from the FastAPI lifespan. Each agent has a circuit
+breaker, so a failing agent goes straight to the fallback instead of
+waiting out its timeout on every call, and a semaphore capping how many
+calls to it are in flight.
 """
 
 import re
 import json
+import asyncio
 import logging
 from uuid import uuid4
 
 import httpx
 
 from app.config import get_settings
+from app.services.assignment_solver import balance_metrics, check_assignment, solve_assignment
 from app.services.fallback_service import fallback_service
+from app.utils.circuit_breaker import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +40,57 @@ class ArchestraService:
             "aggregate": settings.archestra_aggregate_prompt_id,
             "feedback": settings.archestra_feedback_prompt_id,
         }
+        self._limits = httpx.Limits(
+            max_connections=settings.archestra_max_connections,
+            max_keepalive_connections=settings.archestra_max_keepalive,
+            keepalive_expiry=settings.archestra_keepalive_expiry_seconds,
+        )
+        self._http2 = settings.archestra_http2
+        self._connect_timeout = settings.archestra_connect_timeout_seconds
+        self._default_timeout = settings.archestra_timeout_seconds
+        self._agent_timeouts = settings.archestra_agent_timeout_map
+        self._client: httpx.AsyncClient | None = None
+
+        self._queue_timeout = settings.archestra_queue_timeout_seconds
+        self._max_concurrency = settings.archestra_max_concurrency
+        self._breakers = {
+            name: CircuitBreaker(
+                name,
+                failure_threshold=settings.archestra_breaker_failure_threshold,
+                recovery_timeout=settings.archestra_breaker_recovery_seconds,
+            )
+            for name in self.prompt_ids
+        }
+        self._semaphores = {
+            name: asyncio.Semaphore(settings.archestra_max_concurrency)
+            for name in self.prompt_ids
+        }
+        self._in_flight = {name: 0 for name in self.prompt_ids}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it if the lifespan hasn't."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=self._limits,
+                http2=self._http2,
+                timeout=httpx.Timeout(self._default_timeout, connect=self._connect_timeout),
+                headers={"Authorization": f"Bearer {self.api_key}"} if self.api_key else None,
+            )
+        return self._client
+
+    async def start(self):
+        """Open the pooled client (called from the app lifespan)."""
+        if self.is_configured:
+            self._get_client()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _timeout_for(self, agent_name: str) -> httpx.Timeout:
+        read = self._agent_timeouts.get(agent_name, self._default_timeout)
+        return httpx.Timeout(read, connect=self._connect_timeout)
 
     @property
     def is_configured(self) -> bool:
@@ -75,57 +135,125 @@ class ArchestraService:
             },
         }
 
+        breaker = self._breakers[agent_name]
+        if not breaker.allow():
+            logger.info("Archestra agent '%s' circuit open, using fallback", agent_name)
+            return None
+
+        semaphore = self._semaphores[agent_name]
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(
-                    f"{self.base_url}/v1/a2a/{prompt_id}",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json=body,
-                    timeout=60.0,
-                )
-                resp.raise_for_status()
-                result = resp.json()
-                agent_text = result["result"]["parts"][0]["text"]
-                
-                cleaned_text = self._clean_json_text(agent_text)
-                return json.loads(cleaned_text)
-        except Exception as e:
+            await asyncio.wait_for(semaphore.acquire(), self._queue_timeout)
+        except asyncio.TimeoutError:
+            breaker.record_abandoned()
+            logger.warning("Archestra agent '%s' at concurrency limit, using fallback", agent_name)
+            return None
+        except BaseException:
+            breaker.record_abandoned()
+            raise
+
+        self._in_flight[agent_name] += 1
+        try:
+            resp = await self._get_client().post(
+                f"{self.base_url}/v1/a2a/{prompt_id}",
+                json=body,
+                timeout=self._timeout_for(agent_name),
+            )
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            breaker.record_failure()
             logger.warning("Archestra agent '%s' call failed: %s. Using fallback.", agent_name, e)
             return None
+        except BaseException:
+            breaker.record_abandoned()
+            raise
+        finally:
+            self._in_flight[agent_name] -= 1
+            semaphore.release()
+
+        # The agent answered; a malformed reply doesn't count against the breaker
+        breaker.record_success()
+        try:
+            result = resp.json()
+            agent_text = result["result"]["parts"][0]["text"]
+
+            cleaned_text = self._clean_json_text(agent_text)
+            return json.loads(cleaned_text)
+        except Exception as e:
+            logger.warning("Archestra agent '%s' returned an unusable reply: %s. Using fallback.", agent_name, e)
+            return None
+
+    def has_agent(self, agent_name: str) -> bool:
+        """Whether calls to this agent go to Archestra rather than straight to the fallback."""
+        return self.is_configured and bool(self.prompt_ids.get(agent_name))
+
+    async def try_validate_submission(self, form_data: dict) -> dict | None:
+        """Validate a submission, or None if the Ingest agent is unavailable."""
+        result = await self._call_agent("ingest", form_data)
+        return result or None
+
+    def validation_pass_through(self, form_data: dict) -> dict:
+        """Result used when ingest validation is not set up: no validation, just pass through."""
+        return {"valid": True, "warnings": [], "errors": [], "normalized": form_data}
 
     async def validate_submission(self, form_data: dict) -> dict:
         """Validate a submission via the Ingest agent, or pass-through."""
-        result = await self._call_agent("ingest", form_data)
+        result = await self.try_validate_submission(form_data)
         if result:
             return result
-        # Fallback: no validation, just pass through
-        return {"valid": True, "warnings": [], "errors": [], "normalized": form_data}
+        return self.validation_pass_through(form_data)
 
     async def assign_judges(
         self,
         judges: list[dict],
         submissions: list[dict],
         judges_per_submission: int,
+        exclusions: set[tuple[str, str]] | None = None,
+        max_load: int | None = None,
     ) -> dict:
-        """Assign judges via the Assignment agent, or deterministic round-robin."""
+        """
+        Assign judges via the Assignment agent, or the deterministic solver.
+        The agent's answer is only used if it satisfies every constraint.
+        """
         result = await self._call_agent("assign", {
             "judges": judges,
             "submissions": submissions,
             "judges_per_submission": judges_per_submission,
+            "exclusions": [
+                {"judge_id": jid, "submission_id": sid} for jid, sid in sorted(exclusions or ())
+            ],
+            "max_load_per_judge": max_load,
         })
-        if result and "assignments" in result:
-            # If AI returns 0 assignments but we have data, likely a failure/refusal
-            if not result["assignments"] and submissions and judges:
-                logger.warning("Archestra returned 0 assignments. Falling back.")
-            else:
-                return result
+        if result and isinstance(result.get("assignments"), list):
+            problems = check_assignment(
+                result["assignments"], judges, submissions,
+                judges_per_submission, exclusions, max_load,
+            )
+            if not problems:
+                assignments = [
+                    {"submission_id": a["submission_id"], "judge_id": a["judge_id"]}
+                    for a in result["assignments"]
+                ]
+                judge_loads = {j["id"]: 0 for j in judges}
+                for a in assignments:
+                    judge_loads[a["judge_id"]] += 1
+                return {
+                    "assignments": assignments,
+                    "judge_loads": judge_loads,
+                    "strategy": result.get("strategy", "archestra"),
+                    "balance": balance_metrics({
+                        j["id"]: (j.get("current_load", 0) or 0) + judge_loads[j["id"]]
+                        for j in judges
+                    }),
+                    "unfilled": [],
+                }
+            logger.warning(
+                "Archestra assignment violates %d constraint(s) (e.g. %s). Falling back.",
+                len(problems), problems[0],
+            )
         # Fallback
-        logger.info("Using fallback round-robin judge assignment")
-        return fallback_service.assign_judges_round_robin(
-            judges, submissions, judges_per_submission
+        logger.info("Using deterministic solver for judge assignment")
+        return solve_assignment(
+            judges, submissions, judges_per_submission, exclusions, max_load,
         )
 
     async def get_progress(self, assignments: list[dict]) -> dict:
@@ -149,20 +277,22 @@ class ArchestraService:
             return result
         return fallback_service.aggregate_scores(criteria, submissions_with_reviews)
 
-    async def generate_feedback(
+    async def try_generate_feedback(
         self,
         submission: dict,
         reviews: list[dict],
         criteria: list[dict],
-    ) -> dict:
-        """Generate AI feedback summary. No fallback (requires LLM)."""
+    ) -> dict | None:
+        """Generate AI feedback summary, or None if the Feedback agent is unavailable."""
         result = await self._call_agent("feedback", {
             "submission": submission,
             "reviews": reviews,
             "criteria": criteria,
         })
-        if result:
-            return result
+        return result or None
+
+    def feedback_unavailable(self) -> dict:
+        """Placeholder shown when feedback can't be generated."""
         return {
             "summary": "Feedback generation requires Archestra to be configured.",
             "strengths": [],
@@ -170,18 +300,43 @@ class ArchestraService:
             "overall_sentiment": "mixed",
         }
 
+    async def generate_feedback(
+        self,
+        submission: dict,
+        reviews: list[dict],
+        criteria: list[dict],
+    ) -> dict:
+        """Generate AI feedback summary. No fallback (requires LLM)."""
+        result = await self.try_generate_feedback(submission, reviews, criteria)
+        if result:
+            return result
+        return self.feedback_unavailable()
+
     async def health_check(self) -> dict:
         """Check if Archestra platform is reachable."""
         if not self.is_configured:
             return {"status": "not_configured", "message": "Archestra env vars not set. Using fallbacks."}
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(f"{self.base_url}/health", timeout=5.0)
-                if resp.status_code == 200:
-                    return {"status": "healthy", "url": self.base_url}
-                return {"status": "unhealthy", "code": resp.status_code}
+            resp = await self._get_client().get(f"{self.base_url}/health", timeout=5.0)
+            if resp.status_code == 200:
+                status = {"status": "healthy", "url": self.base_url}
+            else:
+                status = {"status": "unhealthy", "code": resp.status_code}
         except Exception as e:
-            return {"status": "unreachable", "error": str(e)}
+            status = {"status": "unreachable", "error": str(e)}
+        status["agents"] = self.agent_stats()
+        return status
+
+    def agent_stats(self) -> dict:
+        """Circuit breaker state and in-flight calls per agent."""
+        return {
+            name: {
+                **breaker.stats(),
+                "in_flight": self._in_flight[name],
+                "max_concurrency": self._max_concurrency,
+            }
+            for name, breaker in self._breakers.items()
+        }
 
 
 archestra_service = ArchestraService()
@@ -0,0 +1,337 @@
+"""
+Juryline -- Assignment Solver
+Deterministic, load-balanced judge assignment.
+
+Greedy over a min-heap of judges keyed by (load, rotation): each
+submission takes the least-loaded eligible judges, where eligible means
+not excluded for that submission (conflict of interest) and below its
+capacity. Judges that tie on load are used in rotation, so with no
+constraints the result matches a balanced round-robin that also honours
+each judge's existing load. Submissions with the most exclusions are
+placed first, since they have the fewest options.
+
+Cost is O(S * k * log J) for S submissions, k judges per submission and
+J judges, plus one extra heap operation per exclusion hit.
+"""
+
+import heapq
+from statistics import pstdev
+
+STRATEGY = "balanced_heap"
+
+
+def _capacity(judge: dict, max_load: int | None) -> float:
+    """A judge's total load limit (existing + new); inf if unlimited."""
+    limit = judge.get("max_load")
+    if limit is None:
+        limit = max_load
+    return float("inf") if limit is None else limit
+
+
+def balance_metrics(loads: dict[str, int]) -> dict:
+    """Spread of total load across judges."""
+    values = list(loads.values())
+    if not values:
+        return {"min_load": 0, "max_load": 0, "mean_load": 0, "stddev": 0, "spread": 0}
+    return {
+        "min_load": min(values),
+        "max_load": max(values),
+        "mean_load": round(sum(values) / len(values), 2),
+        "stddev": round(pstdev(values), 2),
+        "spread": max(values) - min(values),
+    }
+
+
+def solve_assignment(
+    judges: list[dict],
+    submissions: list[dict],
+    judges_per_submission: int,
+    exclusions: set[tuple[str, str]] | None = None,
+    max_load: int | None = None,
+) -> dict:
+    """
+    Assign exactly judges_per_submission distinct judges to each submission
+    (or submission["judges_needed"] where given).
+
+    judges: {"id", "current_load"?, "max_load"?} -- current_load counts
+        existing assignments; max_load caps existing + new for that judge
+        and overrides the global max_load.
+    exclusions: (judge_id, submission_id) pairs that must not be assigned.
+
+    Returns assignments, new assignments per judge (judge_loads), balance
+    metrics over total loads, and the submissions that could not be given
+    enough judges (unfilled) with how many are missing.
+    """
+    exclusions = exclusions or set()
+    excluded_by_sub: dict[str, set[str]] = {}
+    for judge_id, submission_id in exclusions:
+        excluded_by_sub.setdefault(submission_id, set()).add(judge_id)
+
+    loads = {j["id"]: j.get("current_load", 0) or 0 for j in judges}
+    capacity = {j["id"]: _capacity(j, max_load) for j in judges}
+    new_loads = {j["id"]: 0 for j in judges}
+
+    # (load, rotation, judge_id); rotation breaks ties round-robin style
+    heap = [
+        (loads[jid], i, jid)
+        for i, jid in enumerate(j["id"] for j in judges)
+        if loads[jid] < capacity[jid]
+    ]
+    heapq.heapify(heap)
+    rotation = len(judges)
+
+    order = sorted(
+        range(len(submissions)),
+        key=lambda i: -len(excluded_by_sub.get(submissions[i]["id"], ())),
+    )
+
+    picked_by_index: dict[int, list[str]] = {}
+    for i in order:
+        sid = submissions[i]["id"]
+        excluded = excluded_by_sub.get(sid, ())
+        needed = submissions[i].get("judges_needed", judges_per_submission)
+        picked: list[str] = []
+        skipped = []
+        while heap and len(picked) < needed:
+            entry = heapq.heappop(heap)
+            if entry[2] in excluded:
+                skipped.append(entry)
+            else:
+                picked.append(entry[2])
+
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        for jid in picked:
+            loads[jid] += 1
+            new_loads[jid] += 1
+            if loads[jid] < capacity[jid]:
+                heapq.heappush(heap, (loads[jid], rotation, jid))
+                rotation += 1
+
+        picked_by_index[i] = picked
+
+    assignments = []
+    unfilled = []
+    for i, sub in enumerate(submissions):
+        picked = picked_by_index[i]
+        needed = sub.get("judges_needed", judges_per_submission)
+        assignments.extend({"submission_id": sub["id"], "judge_id": jid} for jid in picked)
+        if len(picked) < needed:
+            unfilled.append({"submission_id": sub["id"], "missing": needed - len(picked)})
+
+    return {
+        "assignments": assignments,
+        "judge_loads": new_loads,
+        "strategy": STRATEGY,
+        "balance": balance_metrics(loads),
+        "unfilled": unfilled,
+    }
+
+
+def check_assignment(
+    assignments: list[dict],
+    judges: list[dict],
+    submissions: list[dict],
+    judges_per_submission: int,
+    exclusions: set[tuple[str, str]] | None = None,
+    max_load: int | None = None,
+) -> list[str]:
+    """
+    Problems with an externally produced assignment (e.g. from the AI
+    agent): unknown ids, duplicate pairs, excluded pairs, capacity
+    overruns, or a submission without exactly judges_per_submission
+    judges (or every judge, if there are fewer). Empty if it satisfies
+    every constraint.
+    """
+    exclusions = exclusions or set()
+    judge_by_id = {j["id"]: j for j in judges}
+    sub_ids = {s["id"] for s in submissions}
+    loads = {j["id"]: j.get("current_load", 0) or 0 for j in judges}
+    per_sub: dict[str, int] = {}
+    seen = set()
+    problems = []
+
+    for a in assignments:
+        pair = (a.get("judge_id"), a.get("submission_id"))
+        if pair[0] not in judge_by_id or pair[1] not in sub_ids:
+            problems.append(f"unknown judge or submission in {pair}")
+            continue
+        if pair in seen:
+            problems.append(f"duplicate assignment {pair}")
+            continue
+        if pair in exclusions:
+            problems.append(f"excluded pair {pair}")
+        seen.add(pair)
+        loads[pair[0]] += 1
+        per_sub[pair[1]] = per_sub.get(pair[1], 0) + 1
+
+    for jid, load in loads.items():
+        if load > _capacity(judge_by_id[jid], max_load):
+            problems.append(f"judge {jid} over capacity ({load})")
+    expected = min(judges_per_submission, len(judges))
+    for sid in sub_ids:
+        if per_sub.get(sid, 0) != expected:
+            problems.append(f"submission {sid} has {per_sub.get(sid, 0)} judges")
+    return problems
+
+
+def plan_incremental(
+    judges: list[dict],
+    submissions: list[dict],
+    existing: list[dict],
+    locked: set[tuple[str, str]],
+    judges_per_submission: int,
+    exclusions: set[tuple[str, str]] | None = None,
+    max_load: int | None = None,
+) -> dict:
+    """
+    Minimal change set that brings existing assignments up to date.
+
+    existing: current rows {"id", "judge_id", "submission_id"}.
+    locked: (judge_id, submission_id) pairs that are never touched
+        (completed, or already reviewed).
+
+    Unlocked pairs are dropped if their judge or submission is gone, the
+    pair is excluded, or the submission has more than
+    judges_per_submission judges. Under-covered submissions are then
+    filled by the solver on top of the kept loads. Only when the judge
+    set changed (a judge with no assignments, or assignments for someone
+    no longer judging) is pending work moved from the most- to the
+    least-loaded judges, one pair at a time, until loads differ by at
+    most one or no legal move is left.
+
+    Returns the rows to insert, the ids to delete, and the same
+    judge_loads / balance / unfilled report as solve_assignment.
+    """
+    exclusions = exclusions or set()
+    judge_ids = {j["id"] for j in judges}
+    sub_ids = {s["id"] for s in submissions}
+    capacity = {j["id"]: _capacity(j, max_load) for j in judges}
+
+    assigned_judges = {row["judge_id"] for row in existing}
+    rebalance = bool(existing) and (
+        bool(judge_ids - assigned_judges) or bool(assigned_judges - judge_ids)
+    )
+
+    delete: list[dict] = []
+    kept: list[dict] = []
+    for row in existing:
+        pair = (row["judge_id"], row["submission_id"])
+        if pair in locked:
+            kept.append(row)
+        elif row["judge_id"] not in judge_ids or row["submission_id"] not in sub_ids or pair in exclusions:
+            delete.append(row)
+        else:
+            kept.append(row)
+
+    loads = {jid: 0 for jid in judge_ids}
+    for row in kept:
+        if row["judge_id"] in loads:
+            loads[row["judge_id"]] += 1
+
+    # Trim over-covered submissions, taking pending pairs from the busiest judges
+    by_sub: dict[str, list[dict]] = {}
+    for row in kept:
+        by_sub.setdefault(row["submission_id"], []).append(row)
+    trimmed = set()
+    for sid, rows in by_sub.items():
+        surplus = len(rows) - judges_per_submission
+        if surplus <= 0:
+            continue
+        movable = sorted(
+            (r for r in rows if (r["judge_id"], sid) not in locked),
+            key=lambda r: -loads.get(r["judge_id"], 0),
+        )
+        for row in movable[:surplus]:
+            trimmed.add(row["id"])
+            delete.append(row)
+            loads[row["judge_id"]] -= 1
+    kept = [row for row in kept if row["id"] not in trimmed]
+
+    # Fill under-covered submissions
+    sub_judges: dict[str, set[str]] = {sid: set() for sid in sub_ids}
+    for row in kept:
+        sub_judges.setdefault(row["submission_id"], set()).add(row["judge_id"])
+    needing = [
+        {"id": s["id"], "judges_needed": judges_per_submission - len(sub_judges[s["id"]])}
+        for s in submissions
+        if len(sub_judges[s["id"]]) < judges_per_submission
+    ]
+    taken = {(row["judge_id"], row["submission_id"]) for row in kept}
+    filled = solve_assignment(
+        [{**j, "current_load": loads[j["id"]]} for j in judges],
+        needing,
+        judges_per_submission,
+        exclusions | taken,
+        max_load,
+    )
+    insert = [dict(a) for a in filled["assignments"]]
+    new_loads = dict(filled["judge_loads"])
+    for a in insert:
+        loads[a["judge_id"]] += 1
+        sub_judges[a["submission_id"]].add(a["judge_id"])
+
+    moved = 0
+    if rebalance:
+        movable_by_judge: dict[str, list[dict]] = {}
+        for row in kept:
+            if (row["judge_id"], row["submission_id"]) not in locked and row["judge_id"] in loads:
+                movable_by_judge.setdefault(row["judge_id"], []).append(row)
+
+        donors = [(-loads[jid], jid) for jid in movable_by_judge]
+        receivers = [(loads[jid], jid) for jid in judge_ids if loads[jid] < capacity[jid]]
+        heapq.heapify(donors)
+        heapq.heapify(receivers)
+
+        while donors and receivers:
+            neg_load, donor = donors[0]
+            if -neg_load != loads[donor] or not movable_by_judge[donor]:
+                heapq.heappop(donors)
+                continue
+            recv_load, receiver = receivers[0]
+            if recv_load != loads[receiver]:
+                heapq.heappop(receivers)
+                continue
+            if loads[donor] - loads[receiver] <= 1:
+                break
+
+            row = next(
+                (
+                    r for r in movable_by_judge[donor]
+                    if receiver not in sub_judges[r["submission_id"]]
+                    and (receiver, r["submission_id"]) not in exclusions
+                ),
+                None,
+            )
+            heapq.heappop(donors)
+            if row is None:
+                continue  # Nothing this donor can hand over; leave it as is
+            heapq.heappop(receivers)
+
+            sid = row["submission_id"]
+            movable_by_judge[donor].remove(row)
+            sub_judges[sid].discard(donor)
+            sub_judges[sid].add(receiver)
+            delete.append(row)
+            insert.append({"submission_id": sid, "judge_id": receiver})
+            loads[donor] -= 1
+            loads[receiver] += 1
+            new_loads[receiver] = new_loads.get(receiver, 0) + 1
+            moved += 1
+
+            if movable_by_judge[donor]:
+                heapq.heappush(donors, (-loads[donor], donor))
+            if loads[receiver] < capacity[receiver]:
+                heapq.heappush(receivers, (loads[receiver], receiver))
+
+    return {
+        "insert": insert,
+        "delete_ids": [row["id"] for row in delete],
+        "kept": len(existing) - len(delete),
+        "moved": moved,
+        "rebalanced": rebalance,
+        "judge_loads": new_loads,
+        "strategy": f"incremental_{STRATEGY}",
+        "balance": balance_metrics(loads),
+        "unfilled": filled["unfilled"],
+    }
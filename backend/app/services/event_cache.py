@@ -0,0 +1,76 @@
+"""
+Juryline -- Event Metadata Cache
+Caches the few event columns that hot routes check on every request
+(owner, status, judges_per_submission, name) so ownership and status
+guards don't cost a round trip each time.
+
+Invalidated by the event write routes (update, delete, status transition).
+Other workers may see a stale status for up to the TTL; since status only
+moves forward (draft -> open -> judging -> closed), checks that must not
+be permissive (e.g. the draft lock) re-read the row when the cached status
+would allow the write.
+"""
+
+from fastapi import HTTPException
+
+from app.config import get_settings
+from app.supabase_client import db
+from app.utils.cache import TTLCache
+
+EVENT_META_COLUMNS = "id, organizer_id, status, judges_per_submission, name"
+
+
+class EventCache:
+    """TTL cache of event metadata keyed by event id."""
+
+    def __init__(self):
+        settings = get_settings()
+        self._cache = TTLCache(
+            maxsize=settings.event_cache_size,
+            ttl=settings.event_cache_ttl_seconds,
+        )
+
+    async def get(self, event_id: str, fresh: bool = False) -> dict | None:
+        """Return event metadata, or None if the event does not exist."""
+        if not fresh:
+            cached = self._cache.get(event_id)
+            if cached is not None:
+                return cached
+
+        result = (
+            await db.table("events")
+            .select(EVENT_META_COLUMNS)
+            .eq("id", event_id)
+            .execute()
+        )
+        if not result.data:
+            self._cache.invalidate(event_id)
+            return None
+        self._cache.set(event_id, result.data[0])
+        return result.data[0]
+
+    def peek(self, event_id: str) -> dict | None:
+        """Return cached metadata without touching the database."""
+        return self._cache.get(event_id)
+
+    def age(self, event_id: str) -> float | None:
+        """Seconds since the cached metadata was read, or None if not cached."""
+        return self._cache.age(event_id)
+
+    async def get_owned(self, event_id: str, user_id: str) -> dict:
+        """Return event metadata, raising 404/403 unless the user owns the event."""
+        event = await self.get(event_id)
+        if not event:
+            raise HTTPException(404, "Event not found")
+        if event["organizer_id"] != user_id:
+            raise HTTPException(403, "Not the event organizer")
+        return event
+
+    def invalidate(self, event_id: str):
+        self._cache.invalidate(event_id)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+event_cache = EventCache()
@@ -0,0 +1,94 @@
+"""
+Juryline -- Event Snapshot
+Loads the rows the dashboard computations share (event, judges,
+assignments, reviews, submission count) once per request, concurrently
+and with only the columns they read, so stats, judge progress, bias and
+leaderboard don't each re-query the same tables.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+
+from app.supabase_client import db
+from app.utils.etag import event_version
+
+
+@dataclass
+class EventSnapshot:
+    """Projected rows for one event, fetched together."""
+
+    event_id: str
+    event: dict | None = None
+    judges: list[dict] = field(default_factory=list)       # judge_id, profiles(id, name)
+    assignments: list[dict] = field(default_factory=list)  # judge_id, status
+    reviews: list[dict] = field(default_factory=list)      # submission_id, judge_id, scores
+    submission_count: int = 0
+    version: int | None = None  # event change version, read before the reviews
+
+    @classmethod
+    async def load(
+        cls,
+        event_id: str,
+        *,
+        event: bool = True,
+        judges: bool = True,
+        assignments: bool = True,
+        reviews: bool = True,
+        submissions: bool = True,
+    ) -> "EventSnapshot":
+        """Fetch the requested parts in parallel."""
+        snapshot = cls(event_id=event_id)
+        if reviews:
+            snapshot.version = await event_version(event_id)
+        queries = []
+
+        if event:
+            async def load_event():
+                result = await db.table("events").select("*").eq("id", event_id).execute()
+                snapshot.event = result.data[0] if result.data else None
+            queries.append(load_event())
+
+        if judges:
+            async def load_judges():
+                snapshot.judges = (
+                    await db.table("event_judges")
+                    .select("judge_id, profiles:judge_id(id, name)")
+                    .eq("event_id", event_id)
+                    .execute()
+                ).data or []
+            queries.append(load_judges())
+
+        if assignments:
+            async def load_assignments():
+                snapshot.assignments = (
+                    await db.table("judge_assignments")
+                    .select("judge_id, status")
+                    .eq("event_id", event_id)
+                    .execute()
+                ).data or []
+            queries.append(load_assignments())
+
+        if reviews:
+            async def load_reviews():
+                snapshot.reviews = (
+                    await db.table("reviews")
+                    .select("submission_id, judge_id, scores")
+                    .eq("event_id", event_id)
+                    .execute()
+                ).data or []
+            queries.append(load_reviews())
+
+        if submissions:
+            async def load_submission_count():
+                result = (
+                    await db.table("submissions")
+                    .select("id", count="exact")
+                    .eq("event_id", event_id)
+                    .limit(1)
+                    .execute()
+                )
+                snapshot.submission_count = result.count or 0
+            queries.append(load_submission_count())
+
+        await asyncio.gather(*queries)
+        return snapshot
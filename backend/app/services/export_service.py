@@ -0,0 +1,153 @@
+"""
+Juryline -- Review Export Service
+Columnar (Parquet / Arrow IPC) export of raw review scores, one row per
+(submission, judge, criterion). Rows are written in record batches and the
+encoded bytes are yielded as each batch is flushed, so memory is bounded by
+the batch size rather than the size of the event.
+
+pyarrow is optional (requirements-export.txt) and imported lazily; without
+it the export endpoint answers 501 and the rest of the API is unaffected.
+"""
+
+from datetime import datetime
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+
+from app.supabase_client import db
+from app.services.scoring_service import scoring_service
+
+EXPORT_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+def _load_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise HTTPException(501, "Columnar export requires pyarrow to be installed")
+    return pyarrow
+
+
+def _review_schema(pa):
+    return pa.schema([
+        ("submission_id", pa.string()),
+        ("judge_id", pa.string()),
+        ("criterion_id", pa.string()),
+        ("criterion_name", pa.string()),
+        ("score", pa.float64()),
+        ("weight", pa.float64()),
+        ("submitted_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last take()."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _parse_timestamp(value) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ExportService:
+    """Service for bulk columnar exports."""
+
+    def check_format(self, fmt: str):
+        """Validate the format and that pyarrow is available before streaming starts."""
+        if fmt not in EXPORT_FORMATS:
+            raise HTTPException(400, f"Unsupported export format: {fmt}")
+        _load_pyarrow()
+
+    async def stream_reviews(
+        self,
+        event_id: str,
+        fmt: str,
+        batch_size: int = 10000,
+    ) -> AsyncIterator[bytes]:
+        """Yield the encoded review export for an event, one record batch at a time."""
+        pa = _load_pyarrow()
+        schema = _review_schema(pa)
+
+        criteria = (
+            await db.table("criteria")
+            .select("id, name, weight")
+            .eq("event_id", event_id)
+            .order("sort_order")
+            .execute()
+        ).data or []
+        names = {crit["id"]: crit["name"] for crit in criteria}
+        weights = {crit["id"]: float(crit.get("weight", 1.0)) for crit in criteria}
+
+        sink = _ChunkSink()
+        if fmt == "parquet":
+            writer = pa.parquet.ParquetWriter(sink, schema)
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+
+        columns: dict[str, list] = {name: [] for name in schema.names}
+
+        def flush_batch() -> bytes:
+            batch = pa.RecordBatch.from_pydict(columns, schema=schema)
+            writer.write_batch(batch)
+            for values in columns.values():
+                values.clear()
+            return sink.take()
+
+        rows = 0
+        async for score in scoring_service.iter_review_scores(event_id, list(names)):
+            try:
+                value = float(score["score"])
+            except (TypeError, ValueError):
+                value = None
+            crit_id = score["criterion_id"]
+            columns["submission_id"].append(score["submission_id"])
+            columns["judge_id"].append(score["judge_id"])
+            columns["criterion_id"].append(crit_id)
+            columns["criterion_name"].append(names[crit_id])
+            columns["score"].append(value)
+            columns["weight"].append(weights[crit_id])
+            columns["submitted_at"].append(_parse_timestamp(score["submitted_at"]))
+            rows += 1
+            if rows >= batch_size:
+                yield flush_batch()
+                rows = 0
+
+        if rows:
+            yield flush_batch()
+        writer.close()
+        yield sink.take()
+
+
+export_service = ExportService()
@@ -1,72 +1,26 @@
 """
 Juryline -- Fallback Service
-Deterministic implementations of judge assignment, progress tracking,
-and score aggregation. Used when Archestra is offline or unconfigured.
+Deterministic implementations of progress tracking and score
+aggregation. Used when Archestra is offline or unconfigured. Judge
+assignment lives in assignment_solver.
 """
 
-import json
 from statistics import mean
 
+import numpy as np
 
-def _ensure_dict(val: any) -> dict:
-    """JSONB columns may be returned as JSON strings. Parse if needed."""
-    if isinstance(val, str):
-        try:
-            return json.loads(val)
-        except (json.JSONDecodeError, TypeError):
-            return {}
-    return val if isinstance(val, dict) else {}
+from app.services.scoring_kernels import (
+    ScoreMatrix,
+    group_scores,
+    round2,
+    rounded_means,
+    weighted_totals,
+)
 
 
 class FallbackService:
     """Pure Python fallbacks — no LLM, always works."""
 
-    def assign_judges_round_robin(
-        self,
-        judges: list[dict],
-        submissions: list[dict],
-        judges_per_submission: int,
-    ) -> dict:
-        """
-        Balanced round-robin assignment. Each submission gets exactly
-        judges_per_submission judges. Distributes load evenly.
-        """
-        if not judges:
-            return {"assignments": [], "judge_loads": {}, "strategy": "round_robin"}
-        if not submissions:
-            return {"assignments": [], "judge_loads": {}, "strategy": "round_robin"}
-
-        assignments = []
-        judge_loads: dict[str, int] = {j["id"]: 0 for j in judges}
-        judge_idx = 0
-        n_judges = len(judges)
-
-        for sub in submissions:
-            assigned_to_sub: set[str] = set()
-            count = min(judges_per_submission, n_judges)
-
-            for _ in range(count):
-                # Find next judge not already assigned to this submission
-                attempts = 0
-                while judges[judge_idx % n_judges]["id"] in assigned_to_sub and attempts < n_judges:
-                    judge_idx += 1
-                    attempts += 1
-
-                jid = judges[judge_idx % n_judges]["id"]
-                assigned_to_sub.add(jid)
-                assignments.append({
-                    "submission_id": sub["id"],
-                    "judge_id": jid,
-                })
-                judge_loads[jid] = judge_loads.get(jid, 0) + 1
-                judge_idx += 1
-
-        return {
-            "assignments": assignments,
-            "judge_loads": judge_loads,
-            "strategy": "balanced_round_robin",
-        }
-
     def compute_progress(self, assignments: list[dict]) -> dict:
         """
         Compute review progress from assignment statuses.
@@ -141,64 +95,62 @@ class FallbackService:
         submissions_with_reviews: [{id, project_name, reviews: [{scores: {crit_id: val}, ...}]}]
         """
         weight_sum = sum(c.get("weight", 1.0) for c in criteria)
-        crit_map = {c["id"]: c for c in criteria}
+        weights = [c.get("weight", 1.0) for c in criteria]
+        crit_ids = [c["id"] for c in criteria]
+
+        # One matrix row per review, grouped by submission
+        subs = [sub for sub in submissions_with_reviews if sub.get("reviews")]
+        reviews = [rev for sub in subs for rev in sub["reviews"]]
+        groups = np.repeat(np.arange(len(subs)), [len(sub["reviews"]) for sub in subs])
+
+        matrix = ScoreMatrix([rev.get("scores", {}) for rev in reviews], crit_ids)
+        grouped = group_scores(matrix, groups, len(subs))
+        present = grouped.counts > 0
+        averages = rounded_means(grouped)
+        if weight_sum:
+            totals = round2(weighted_totals(averages, present, weights) / weight_sum)
+        else:
+            totals = [0] * len(subs)
 
         leaderboard = []
         all_totals = []
-        outliers = []
-
-        for sub in submissions_with_reviews:
-            reviews = sub.get("reviews", [])
-            if not reviews:
-                continue
-
-            # Per-criterion averages
-            crit_averages: dict[str, float] = {}
-            crit_all_scores: dict[str, list[float]] = {}
-            for crit in criteria:
-                scores_for_crit = []
-                for rev in reviews:
-                    rev_scores = _ensure_dict(rev.get("scores", {}))
-                    s = rev_scores.get(crit["id"])
-                    if s is not None:
-                        scores_for_crit.append(float(s))
-                if scores_for_crit:
-                    crit_averages[crit["id"]] = round(mean(scores_for_crit), 2)
-                    crit_all_scores[crit["id"]] = scores_for_crit
-
-            # Weighted total
-            weighted_total = 0.0
-            for crit in criteria:
-                avg = crit_averages.get(crit["id"], 0)
-                w = crit.get("weight", 1.0)
-                weighted_total += avg * w
-            total_score = round(weighted_total / weight_sum, 2) if weight_sum else 0
-
+        averages_list = averages.tolist()
+        present_list = present.tolist()
+        for i, sub in enumerate(subs):
+            crit_averages = {
+                cid: averages_list[i][j]
+                for j, cid in enumerate(crit_ids)
+                if present_list[i][j]
+            }
             leaderboard.append({
                 "submission_id": sub["id"],
                 "project_name": sub.get("project_name", "Unknown"),
-                "total_score": total_score,
+                "total_score": totals[i],
                 "criteria_averages": crit_averages,
-                "review_count": len(reviews),
+                "review_count": len(sub["reviews"]),
+            })
+            all_totals.append(totals[i])
+
+        # Outlier detection (|score - mean| > 2), for criteria with 2+ scores
+        means = np.where(present, grouped.means, 0.0)
+        flagged = (
+            matrix.mask
+            & (grouped.counts[groups] >= 2)
+            & (np.abs(matrix.values - means[groups]) > 2)
+        )
+        rows, cols = np.nonzero(flagged)
+        # Report in submission -> criterion -> review order
+        order = np.lexsort((rows, cols, groups[rows]))
+        outliers = []
+        for r, j in zip(rows[order].tolist(), cols[order].tolist()):
+            g = int(groups[r])
+            outliers.append({
+                "judge_id": reviews[r].get("judge_id", ""),
+                "submission_id": subs[g]["id"],
+                "criterion_id": crit_ids[j],
+                "judge_score": float(matrix.values[r, j]),
+                "mean_score": round(float(means[g, j]), 2),
             })
-            all_totals.append(total_score)
-
-            # Outlier detection (|score - mean| > 2)
-            for crit_id, scores_list in crit_all_scores.items():
-                if len(scores_list) < 2:
-                    continue
-                avg = mean(scores_list)
-                for rev in reviews:
-                    rev_scores = _ensure_dict(rev.get("scores", {}))
-                    s = rev_scores.get(crit_id)
-                    if s is not None and abs(float(s) - avg) > 2:
-                        outliers.append({
-                            "judge_id": rev.get("judge_id", ""),
-                            "submission_id": sub["id"],
-                            "criterion_id": crit_id,
-                            "judge_score": float(s),
-                            "mean_score": round(avg, 2),
-                        })
 
         # Sort by total_score descending, assign ranks
         leaderboard.sort(key=lambda x: x["total_score"], reverse=True)
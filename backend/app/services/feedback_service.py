@@ -0,0 +1,230 @@
+"""
+Juryline -- Feedback Service
+Serves AI feedback for a submission from the submission_feedback table
+while its inputs are unchanged, and only calls the Feedback agent when
+the content hash of those inputs (form data, review scores and notes,
+criteria) differs from the stored one, or when a refresh is forced.
+
+Also provides the "feedback_batch" job, which generates feedback for
+every reviewed submission of an event in the background.
+"""
+
+import asyncio
+import hashlib
+import json
+from datetime import datetime
+
+from app.config import get_settings
+from app.supabase_client import db
+from app.services.archestra_service import archestra_service
+from app.services.job_service import JobContext, job_service
+
+FEEDBACK_BATCH_JOB = "feedback_batch"
+
+
+def _ensure_dict(value) -> dict:
+    """Safely coerce a value to a dict. Handles JSON strings from JSONB columns."""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+            if isinstance(parsed, dict):
+                return parsed
+        except (json.JSONDecodeError, TypeError):
+            pass
+    return {}
+
+
+def feedback_content_hash(submission: dict, reviews: list[dict], criteria: list[dict]) -> str:
+    """
+    sha256 over a canonical JSON encoding of everything the feedback depends on.
+    The background ingest validation result (_ai_validation) is left out, so
+    writing it late doesn't invalidate feedback for unchanged answers.
+    """
+    form_data = {
+        key: value
+        for key, value in _ensure_dict(submission.get("form_data")).items()
+        if key != "_ai_validation"
+    }
+    payload = {
+        "form_data": form_data,
+        "reviews": sorted(
+            (
+                {
+                    "judge_id": r.get("judge_id"),
+                    "scores": _ensure_dict(r.get("scores")),
+                    "notes": r.get("notes"),
+                }
+                for r in reviews
+            ),
+            key=lambda r: str(r["judge_id"]),
+        ),
+        "criteria": sorted(
+            (
+                {
+                    "id": c.get("id"),
+                    "name": c.get("name"),
+                    "description": c.get("description"),
+                    "scale_min": c.get("scale_min"),
+                    "scale_max": c.get("scale_max"),
+                    "weight": c.get("weight"),
+                }
+                for c in criteria
+            ),
+            key=lambda c: str(c["id"]),
+        ),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class FeedbackService:
+    """Content-addressed persistence for generated submission feedback."""
+
+    async def get_stored(self, submission_id: str) -> dict | None:
+        result = (
+            await db.table("submission_feedback")
+            .select("content_hash, feedback, updated_at")
+            .eq("submission_id", submission_id)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    async def get_or_generate(
+        self,
+        submission: dict,
+        reviews: list[dict],
+        criteria: list[dict],
+        force: bool = False,
+    ) -> dict:
+        """
+        Return feedback for the submission, reusing the stored copy when
+        its content hash matches. The response carries `cached` and
+        `generated_at`. The placeholder returned when the agent is
+        unavailable is never stored.
+        """
+        content_hash = feedback_content_hash(submission, reviews, criteria)
+
+        if not force:
+            stored = await self.get_stored(submission["id"])
+            if stored and stored["content_hash"] == content_hash:
+                return {
+                    **_ensure_dict(stored["feedback"]),
+                    "cached": True,
+                    "generated_at": stored.get("updated_at"),
+                }
+
+        feedback, generated_at = await self._generate_and_store(
+            submission, reviews, criteria, content_hash,
+        )
+        if feedback is None:
+            return {**archestra_service.feedback_unavailable(), "cached": False}
+        return {**feedback, "cached": False, "generated_at": generated_at}
+
+    async def _generate_and_store(
+        self,
+        submission: dict,
+        reviews: list[dict],
+        criteria: list[dict],
+        content_hash: str,
+    ) -> tuple[dict | None, str | None]:
+        """Call the Feedback agent and persist the result. (None, None) if unavailable."""
+        feedback = await archestra_service.try_generate_feedback(
+            submission=submission, reviews=reviews, criteria=criteria,
+        )
+        if feedback is None:
+            return None, None
+
+        saved = (
+            await db.table("submission_feedback")
+            .upsert(
+                {
+                    "submission_id": submission["id"],
+                    "event_id": submission["event_id"],
+                    "content_hash": content_hash,
+                    "feedback": feedback,
+                },
+                on_conflict="submission_id",
+            )
+            .execute()
+        )
+        generated_at = saved.data[0].get("updated_at") if saved.data else None
+        return feedback, generated_at
+
+    async def run_event_job(self, ctx: JobContext) -> dict:
+        """
+        Generate feedback for every reviewed submission in the job's event.
+
+        Submissions whose stored hash already matches are skipped, which is
+        also how a resumed job avoids redoing finished items. With force,
+        only rows written before the job was created count as stale.
+        """
+        event_id = ctx.job["event_id"]
+        force = bool(ctx.params.get("force"))
+        job_started = datetime.fromisoformat(ctx.job["created_at"])
+
+        subs_result, reviews_result, criteria_result, stored_result = await asyncio.gather(
+            db.table("submissions")
+            .select("id, event_id, participant_id, form_data, status")
+            .eq("event_id", event_id)
+            .execute(),
+            db.table("reviews").select("*").eq("event_id", event_id).execute(),
+            db.table("criteria").select("*").eq("event_id", event_id).execute(),
+            db.table("submission_feedback")
+            .select("submission_id, content_hash, updated_at")
+            .eq("event_id", event_id)
+            .execute(),
+        )
+        criteria = criteria_result.data or []
+        stored = {row["submission_id"]: row for row in stored_result.data or []}
+
+        review_map: dict[str, list] = {}
+        for review in reviews_result.data or []:
+            review_map.setdefault(review["submission_id"], []).append(review)
+
+        pending = []
+        skipped = 0
+        for sub in subs_result.data or []:
+            sub_reviews = review_map.get(sub["id"])
+            if not sub_reviews:
+                continue
+            content_hash = feedback_content_hash(sub, sub_reviews, criteria)
+            row = stored.get(sub["id"])
+            if row and row["content_hash"] == content_hash and (
+                not force or datetime.fromisoformat(row["updated_at"]) >= job_started
+            ):
+                skipped += 1
+                continue
+            pending.append((sub, sub_reviews, content_hash))
+
+        await ctx.set_progress(
+            force=True,
+            total=skipped + len(pending),
+            skipped=skipped,
+            generated=0,
+            failed=0,
+        )
+
+        semaphore = asyncio.Semaphore(get_settings().feedback_job_concurrency)
+
+        async def generate(sub: dict, sub_reviews: list[dict], content_hash: str):
+            async with semaphore:
+                try:
+                    feedback, _ = await self._generate_and_store(
+                        sub, sub_reviews, criteria, content_hash,
+                    )
+                except Exception:
+                    feedback = None
+            if feedback is None:
+                await ctx.increment(failed=1)
+            else:
+                await ctx.increment(generated=1)
+
+        await asyncio.gather(*(generate(*item) for item in pending))
+        await ctx.set_progress(force=True)
+        return ctx.progress
+
+
+feedback_service = FeedbackService()
+job_service.register(FEEDBACK_BATCH_JOB, feedback_service.run_event_job)
@@ -0,0 +1,323 @@
+"""
+Juryline -- Job Service
+Runs long, event-level work (judge assignment, score aggregation, bulk
+feedback generation) as background tasks inside the API workers, backed
+by the `jobs` table.
+
+- Submitting a job inserts a pending row. Each worker runs a dispatcher
+  that claims runnable jobs while it has free slots (job_max_concurrent),
+  so the table doubles as the queue shared by all workers.
+- A job is owned by the worker whose id is in `claimed_by` while that
+  worker keeps `heartbeat_at` fresh.
+- Claiming is a conditional UPDATE (pending, or running with a stale
+  heartbeat), so when several workers race for a job only one wins.
+- There is at most one active job per (event, kind); submitting again
+  returns the job already in flight. An idempotency key returns the
+  original job even after it finished.
+- Handlers are registered per job kind and must be resumable: after a
+  restart a job is run again from the start, and the handler skips the
+  items it already finished.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from postgrest.exceptions import APIError
+
+from app.config import get_settings
+from app.supabase_client import db
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("pending", "running")
+UNIQUE_VIOLATION = "23505"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class JobContext:
+    """Handle passed to a job handler for reporting progress."""
+
+    def __init__(self, service: "JobService", job: dict):
+        self.job = job
+        self.params: dict = job.get("params") or {}
+        self._service = service
+        self._progress: dict = dict(job.get("progress") or {})
+        self._last_flush = 0.0
+
+    @property
+    def progress(self) -> dict:
+        return dict(self._progress)
+
+    async def set_progress(self, force: bool = False, **counts):
+        """Update progress counters; writes are throttled unless force=True."""
+        self._progress.update(counts)
+        loop = asyncio.get_running_loop()
+        if force or loop.time() - self._last_flush >= self._service.progress_interval:
+            self._last_flush = loop.time()
+            await self._service._write(self.job["id"], {"progress": self._progress})
+
+    async def increment(self, **deltas):
+        for key, delta in deltas.items():
+            self._progress[key] = self._progress.get(key, 0) + delta
+        await self.set_progress()
+
+
+JobHandler = Callable[[JobContext], Awaitable[dict | None]]
+
+
+class JobService:
+    """Creates, claims, runs and reports on background jobs."""
+
+    def __init__(self):
+        settings = get_settings()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.heartbeat_interval = settings.job_heartbeat_seconds
+        self.stale_after = settings.job_stale_after_seconds
+        self.progress_interval = settings.job_progress_interval_seconds
+        self.max_concurrent = settings.job_max_concurrent
+        self.poll_interval = settings.job_poll_interval_seconds
+        self._handlers: dict[str, JobHandler] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._dispatcher: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    def register(self, kind: str, handler: JobHandler):
+        self._handlers[kind] = handler
+
+    # ── Queries ──
+
+    async def get(self, job_id: str) -> dict | None:
+        result = await db.table("jobs").select("*").eq("id", job_id).execute()
+        return result.data[0] if result.data else None
+
+    async def find_active(self, event_id: str, kind: str) -> dict | None:
+        """Return a pending/running job of this kind for the event, if any."""
+        result = (
+            await db.table("jobs")
+            .select("*")
+            .eq("event_id", event_id)
+            .eq("kind", kind)
+            .in_("status", list(ACTIVE_STATUSES))
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    async def find_by_key(self, event_id: str, kind: str, idempotency_key: str) -> dict | None:
+        result = (
+            await db.table("jobs")
+            .select("*")
+            .eq("event_id", event_id)
+            .eq("kind", kind)
+            .eq("idempotency_key", idempotency_key)
+            .limit(1)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    # ── Lifecycle ──
+
+    async def submit(
+        self,
+        kind: str,
+        event_id: str,
+        params: dict,
+        created_by: str | None = None,
+        idempotency_key: str | None = None,
+    ) -> dict:
+        """
+        Queue a job and return it. If the key was used before, or a job of
+        this kind is already active for the event, that job is returned.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+
+        existing = await self._find_existing(event_id, kind, idempotency_key)
+        if existing:
+            return existing
+
+        try:
+            result = (
+                await db.table("jobs")
+                .insert({
+                    "kind": kind,
+                    "event_id": event_id,
+                    "params": params,
+                    "status": "pending",
+                    "created_by": created_by,
+                    "idempotency_key": idempotency_key,
+                })
+                .execute()
+            )
+        except APIError as e:
+            # Lost a race with a concurrent submit; return the winner's job
+            if e.code != UNIQUE_VIOLATION:
+                raise
+            existing = await self._find_existing(event_id, kind, idempotency_key)
+            if not existing:
+                raise
+            return existing
+
+        self._wakeup.set()
+        return result.data[0]
+
+    async def claim(self, job_id: str) -> dict | None:
+        """Take over a pending job or a running job whose heartbeat is stale."""
+        cutoff = _iso(_utcnow() - timedelta(seconds=self.stale_after))
+        result = (
+            await db.table("jobs")
+            .update({
+                "status": "running",
+                "claimed_by": self.worker_id,
+                "heartbeat_at": _iso(_utcnow()),
+            })
+            .eq("id", job_id)
+            .in_("status", list(ACTIVE_STATUSES))
+            .or_(f"status.eq.pending,heartbeat_at.is.null,heartbeat_at.lt.{cutoff}")
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    async def dispatch(self) -> int:
+        """
+        Claim and start runnable jobs (pending, or abandoned by a worker
+        that stopped heartbeating) up to this worker's free slots.
+        Returns how many were started.
+        """
+        free = self.max_concurrent - len(self._tasks)
+        if free <= 0 or not self._handlers:
+            return 0
+        cutoff = _iso(_utcnow() - timedelta(seconds=self.stale_after))
+        result = (
+            await db.table("jobs")
+            .select("id, status")
+            .in_("kind", list(self._handlers))
+            .in_("status", list(ACTIVE_STATUSES))
+            .or_(f"status.eq.pending,heartbeat_at.is.null,heartbeat_at.lt.{cutoff}")
+            .order("created_at")
+            .limit(free)
+            .execute()
+        )
+        started = 0
+        for row in result.data or []:
+            job = await self.claim(row["id"])
+            if job:
+                if row["status"] == "running":
+                    logger.info("Resuming %s job %s", job["kind"], job["id"])
+                self._spawn(job)
+                started += 1
+        return started
+
+    async def start(self):
+        """Start this worker's dispatcher loop."""
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    async def shutdown(self):
+        """Stop local jobs; their heartbeats go stale and another worker resumes them."""
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "running": len(self._tasks),
+            "max_concurrent": self.max_concurrent,
+        }
+
+    # ── Internals ──
+
+    async def _find_existing(
+        self, event_id: str, kind: str, idempotency_key: str | None,
+    ) -> dict | None:
+        if idempotency_key:
+            job = await self.find_by_key(event_id, kind, idempotency_key)
+            if job:
+                return job
+        return await self.find_active(event_id, kind)
+
+    async def _dispatch_loop(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.dispatch()
+            except Exception as e:
+                logger.warning("Job dispatch failed: %s", e)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _spawn(self, job: dict):
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job["id"]] = task
+        task.add_done_callback(lambda _t, job_id=job["id"]: self._finished(job_id))
+
+    def _finished(self, job_id: str):
+        self._tasks.pop(job_id, None)
+        # A slot freed up; pick up anything queued behind it
+        self._wakeup.set()
+
+    async def _run(self, job: dict):
+        ctx = JobContext(self, job)
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            result = await self._handlers[job["kind"]](ctx)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job["id"], job["kind"])
+            await self._write(job["id"], {
+                "status": "failed",
+                "error": str(e),
+                "progress": ctx.progress,
+                "finished_at": _iso(_utcnow()),
+            })
+        else:
+            await self._write(job["id"], {
+                "status": "completed",
+                "result": result,
+                "progress": ctx.progress,
+                "finished_at": _iso(_utcnow()),
+            })
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self._write(job_id, {"heartbeat_at": _iso(_utcnow())})
+            except Exception as e:
+                logger.warning("Heartbeat for job %s failed: %s", job_id, e)
+
+    async def _write(self, job_id: str, data: dict):
+        # Only the owning worker may update the row
+        await (
+            db.table("jobs")
+            .update(data)
+            .eq("id", job_id)
+            .eq("claimed_by", self.worker_id)
+            .execute()
+        )
+
+
+job_service = JobService()
@@ -0,0 +1,304 @@
+"""
+Juryline -- Incremental Leaderboard Engine
+Keeps each event's leaderboard in memory so a dashboard poll of an
+unchanged event costs one version check, instead of re-reading every
+review and recomputing every mean.
+
+Per (submission, criterion) the engine keeps a sorted list of scores (so
+min/max survive score edits) and its average, recomputed with
+statistics.mean when the list changes; a running float sum would drift
+from the from-scratch rounding after enough edits. Reviews are applied
+to a board as deltas (a judge's old scores removed, the new ones added),
+and submissions with at least one review sit in a sorted rank list, so
+reading the top k is O(k).
+
+Each board records the event's change version (event_versions, bumped by
+triggers on every write) read before its rows were fetched. A read
+compares it with the current version, one primary-key lookup, and
+rebuilds when the event has changed, so every API worker serves the same
+up-to-date ranking wherever the write was handled. Idle boards are
+evicted after a TTL.
+
+ScoringService.compute_leaderboard is the from-scratch reference;
+get_leaderboard(verify=True) rebuilds the board and diffs it against it.
+"""
+
+import asyncio
+import json
+from bisect import bisect_left, insort
+from statistics import mean
+
+from app.config import get_settings
+from app.supabase_client import db
+from app.services.submission_service import submission_service
+from app.utils.cache import TTLCache
+from app.utils.etag import event_version
+
+
+def _ensure_dict(value) -> dict:
+    """Safely coerce a value to a dict. Handles JSON strings from JSONB columns."""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+            if isinstance(parsed, dict):
+                return parsed
+        except (json.JSONDecodeError, TypeError):
+            pass
+    return {}
+
+
+class _CriterionAggregate:
+    """Sorted scores and their rounded average for one (submission, criterion)."""
+
+    __slots__ = ("scores", "_average")
+
+    def __init__(self):
+        self.scores: list[float] = []
+        self._average: float | None = None
+
+    @property
+    def count(self) -> int:
+        return len(self.scores)
+
+    @property
+    def average(self) -> float:
+        if self._average is None:
+            self._average = round(mean(self.scores), 2)
+        return self._average
+
+    def add(self, score: float):
+        insort(self.scores, score)
+        self._average = None
+
+    def remove(self, score: float):
+        del self.scores[bisect_left(self.scores, score)]
+        self._average = None
+
+
+class _SubmissionState:
+    """Aggregates and ranking key for one submission."""
+
+    __slots__ = ("id", "project_name", "order", "reviews", "aggregates", "weighted_score")
+
+    def __init__(self, submission_id: str, project_name: str, order: int, criterion_ids):
+        self.id = submission_id
+        self.project_name = project_name
+        self.order = order
+        self.reviews: dict[str, dict[str, float]] = {}
+        self.aggregates = {cid: _CriterionAggregate() for cid in criterion_ids}
+        self.weighted_score = 0.0
+
+    @property
+    def rank_key(self) -> tuple:
+        return (-self.weighted_score, self.order, self.id)
+
+
+class _EventBoard:
+    """In-memory leaderboard for a single event."""
+
+    def __init__(self, criteria: list[dict], version: int = 0):
+        self.criteria = [
+            (c["id"], c["name"], c.get("weight", 1.0)) for c in criteria
+        ]
+        self.total_weight = sum(weight for _, _, weight in self.criteria)
+        self.submissions: dict[str, _SubmissionState] = {}
+        self.ranking: list[tuple] = []
+        # Event change version read before the board's rows were fetched
+        self.version = version
+
+    def add_submission(self, submission_id: str, project_name: str):
+        self.submissions[submission_id] = _SubmissionState(
+            submission_id,
+            project_name,
+            len(self.submissions),
+            [cid for cid, _, _ in self.criteria],
+        )
+
+    def apply(self, submission_id: str, judge_id: str, scores: dict) -> bool:
+        """Set a judge's scores for a submission. Returns False if the submission is unknown."""
+        state = self.submissions.get(submission_id)
+        if state is None:
+            return False
+
+        new_scores = {
+            cid: float(scores.get(cid, 0))
+            for cid, _, _ in self.criteria
+            if cid in scores
+        }
+        old_scores = state.reviews.get(judge_id)
+        if old_scores == new_scores:
+            return True
+
+        if state.reviews:
+            del self.ranking[bisect_left(self.ranking, state.rank_key)]
+
+        for cid, score in (old_scores or {}).items():
+            state.aggregates[cid].remove(score)
+        for cid, score in new_scores.items():
+            state.aggregates[cid].add(score)
+        state.reviews[judge_id] = new_scores
+
+        state.weighted_score = self._weighted_score(state)
+        insort(self.ranking, state.rank_key)
+        return True
+
+    def _criteria_scores(self, state: _SubmissionState) -> dict:
+        criteria_scores = {}
+        for cid, name, weight in self.criteria:
+            agg = state.aggregates[cid]
+            if agg.count:
+                criteria_scores[cid] = {
+                    "criterion_name": name,
+                    "average": agg.average,
+                    "min_score": agg.scores[0],
+                    "max_score": agg.scores[-1],
+                    "weight": weight,
+                }
+        return criteria_scores
+
+    def _weighted_score(self, state: _SubmissionState) -> float:
+        if self.total_weight <= 0:
+            return 0
+        criteria_scores = self._criteria_scores(state)
+        return round(
+            sum(cs["average"] * cs["weight"] for cs in criteria_scores.values())
+            / self.total_weight,
+            2,
+        )
+
+    def entries(self, limit: int | None = None) -> list[dict]:
+        """Return the top `limit` leaderboard entries (all when None)."""
+        if not self.criteria:
+            return []
+        keys = self.ranking if limit is None else self.ranking[:limit]
+        leaderboard = []
+        for i, (_, _, submission_id) in enumerate(keys):
+            state = self.submissions[submission_id]
+            leaderboard.append({
+                "submission_id": submission_id,
+                "project_name": state.project_name,
+                "weighted_score": state.weighted_score,
+                "criteria_scores": self._criteria_scores(state),
+                "review_count": len(state.reviews),
+                "rank": i + 1,
+            })
+        return leaderboard
+
+
+class LeaderboardEngine:
+    """Per-event leaderboards, rebuilt (single-flight) when the event's version moves."""
+
+    def __init__(self):
+        settings = get_settings()
+        self._boards = TTLCache(
+            maxsize=settings.leaderboard_cache_size,
+            ttl=settings.leaderboard_rebuild_ttl_seconds,
+        )
+        # (event id, version) -> build in flight
+        self._builds: dict[tuple[str, int], asyncio.Future] = {}
+
+    async def top(
+        self,
+        event_id: str,
+        limit: int | None = None,
+        reviews: list[dict] | None = None,
+        version: int | None = None,
+    ) -> list[dict]:
+        """
+        Return the ranked leaderboard (top `limit` entries, or all).
+        `version` is the event's change version as the caller read it
+        (fetched here when None). `reviews` (submission_id, judge_id,
+        scores) that the caller fetched after reading that version are
+        used instead of re-fetching when a build is needed.
+        """
+        if version is None:
+            version = await event_version(event_id)
+            reviews = None
+        board = self._boards.get(event_id)
+        if board is None or board.version < version:
+            board = await self._build(event_id, version, reviews)
+        return board.entries(limit)
+
+    async def rebuild(self, event_id: str) -> list[dict]:
+        """Rebuild the board from the database, whatever its version."""
+        board = await self._build(event_id, await event_version(event_id), fresh=True)
+        return board.entries()
+
+    def invalidate(self, event_id: str):
+        """Drop the board so the next read rebuilds it (criteria or submission changes)."""
+        self._boards.invalidate(event_id)
+
+    async def _build(
+        self,
+        event_id: str,
+        version: int,
+        reviews: list[dict] | None = None,
+        fresh: bool = False,
+    ) -> _EventBoard:
+        key = (event_id, version)
+        in_flight = self._builds.get(key)
+        if in_flight is not None and not fresh:
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._builds[key] = future
+        try:
+            board = await self._load(event_id, version, reviews)
+            # A slower build of an older version must not replace a newer board
+            current = self._boards.get(event_id)
+            if current is None or current.version <= board.version:
+                self._boards.set(event_id, board)
+            future.set_result(board)
+            return board
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so a build nobody else awaited doesn't warn
+            future.exception()
+            raise
+        finally:
+            if self._builds.get(key) is future:
+                del self._builds[key]
+
+    async def _load(
+        self, event_id: str, version: int, reviews: list[dict] | None = None,
+    ) -> _EventBoard:
+        async def fetch_reviews():
+            if reviews is not None:
+                return reviews
+            return (
+                await db.table("reviews")
+                .select("submission_id, judge_id, scores")
+                .eq("event_id", event_id)
+                .execute()
+            ).data or []
+
+        criteria_result, submissions_result, review_rows, schema = await asyncio.gather(
+            db.table("criteria")
+            .select("id, name, weight")
+            .eq("event_id", event_id)
+            .order("sort_order")
+            .execute(),
+            db.table("submissions")
+            .select("id, form_data")
+            .eq("event_id", event_id)
+            .execute(),
+            fetch_reviews(),
+            submission_service.get_form_schema(event_id),
+        )
+        criteria = criteria_result.data or []
+        submissions = submissions_result.data or []
+
+        submission_service.enrich_many(submissions, schema.fields)
+
+        board = _EventBoard(criteria, version)
+        for sub in submissions:
+            board.add_submission(sub["id"], submission_service.project_name(sub))
+        for review in review_rows:
+            scores = _ensure_dict(review.get("scores"))
+            board.apply(review["submission_id"], review["judge_id"], scores)
+        return board
+
+
+leaderboard_engine = LeaderboardEngine()
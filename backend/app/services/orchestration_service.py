@@ -0,0 +1,293 @@
+"""
+Juryline -- Orchestration Service
+Event-level workflows that run as background jobs: judge assignment
+and score aggregation. The routers validate the request and queue a
+job; the handlers here do the heavy work and return the result that
+used to be the endpoint's response body.
+"""
+
+import asyncio
+
+from app.config import get_settings
+from app.supabase_client import db
+from app.services.archestra_service import archestra_service
+from app.services.assignment_solver import plan_incremental, solve_assignment
+from app.services.event_cache import event_cache
+from app.services.job_service import JobContext, job_service
+from app.services.submission_service import submission_service
+from app.utils.bulk_writer import BulkWriter
+
+ASSIGN_JUDGES_JOB = "assign_judges"
+AGGREGATE_SCORES_JOB = "aggregate_scores"
+
+
+class OrchestrationService:
+    """Judge assignment and score aggregation for one event."""
+
+    def __init__(self):
+        settings = get_settings()
+        self._writer = BulkWriter(
+            db,
+            chunk_size=settings.bulk_write_chunk_size,
+            concurrency=settings.bulk_write_concurrency,
+            max_retries=settings.bulk_write_max_retries,
+        )
+
+    async def assign_judges(
+        self,
+        event_id: str,
+        judges_per_submission: int,
+        use_current_load: bool = True,
+        max_load: int | None = None,
+        exclusions: list[dict] | None = None,
+        use_ai: bool = False,
+        mode: str = "replace",
+    ) -> dict:
+        """
+        Assign judges to every submission.
+
+        mode="replace" rebuilds all assignments with the deterministic
+        load-balancing solver; with use_ai the Archestra Assignment agent
+        is asked first and its answer kept only if it meets the
+        constraints. mode="incremental" keeps existing work and writes
+        only the difference (see _assign_incremental). Judges are never
+        assigned their own submission, nor any pair listed in exclusions.
+        """
+        ej_result, existing_assigns, subs_result = await asyncio.gather(
+            db.table("event_judges")
+            .select("judge_id, profiles:judge_id(id, name, email)")
+            .eq("event_id", event_id)
+            .execute(),
+            db.table("judge_assignments")
+            .select("id, judge_id, submission_id, status")
+            .eq("event_id", event_id)
+            .execute(),
+            db.table("submissions")
+            .select("id, participant_id, form_data")
+            .eq("event_id", event_id)
+            .execute(),
+        )
+        judges_raw = ej_result.data or []
+        if not judges_raw:
+            raise ValueError("No judges invited to this event")
+        submissions = subs_result.data or []
+        if not submissions:
+            raise ValueError("No submissions to assign")
+
+        excluded = {(e["judge_id"], e["submission_id"]) for e in exclusions or []}
+        judge_ids = {ej["judge_id"] for ej in judges_raw}
+        excluded.update(
+            (sub["participant_id"], sub["id"])
+            for sub in submissions
+            if sub.get("participant_id") in judge_ids
+        )
+
+        if mode == "incremental":
+            return await self._assign_incremental(
+                event_id,
+                judges=[{"id": ej["judge_id"]} for ej in judges_raw],
+                submissions=submissions,
+                existing=existing_assigns.data or [],
+                judges_per_submission=judges_per_submission,
+                exclusions=excluded,
+                max_load=max_load,
+            )
+
+        # Current assignment counts for load balancing
+        load_map: dict[str, int] = {}
+        if use_current_load:
+            for a in (existing_assigns.data or []):
+                load_map[a["judge_id"]] = load_map.get(a["judge_id"], 0) + 1
+
+        judges = []
+        for ej in judges_raw:
+            profile = ej.get("profiles") or {}
+            jid = ej["judge_id"]
+            judges.append({
+                "id": jid,
+                "name": profile.get("name", ""),
+                "current_load": load_map.get(jid, 0),
+            })
+
+        if use_ai:
+            # Enrich submissions with project_name for the agent
+            schema = await submission_service.get_form_schema(event_id)
+            submission_service.enrich_many(submissions, schema.fields)
+            for sub in submissions:
+                sub["project_name"] = submission_service.project_name(sub)
+
+            result = await archestra_service.assign_judges(
+                judges=judges,
+                submissions=submissions,
+                judges_per_submission=judges_per_submission,
+                exclusions=excluded,
+                max_load=max_load,
+            )
+        else:
+            result = solve_assignment(
+                judges, submissions, judges_per_submission, excluded, max_load,
+            )
+
+        # Clear existing assignments for this event, then insert new ones
+        await db.table("judge_assignments").delete().eq("event_id", event_id).execute()
+
+        new_assignments = [
+            {
+                "event_id": event_id,
+                "judge_id": a["judge_id"],
+                "submission_id": a["submission_id"],
+                "status": "pending",
+            }
+            for a in result.get("assignments", [])
+        ]
+        await self._write_assignments(new_assignments)
+
+        return {
+            "message": f"Assigned {len(new_assignments)} judge-submission pairs",
+            "strategy": result.get("strategy", "unknown"),
+            "judge_loads": result.get("judge_loads", {}),
+            "assignment_count": len(new_assignments),
+            "balance": result.get("balance"),
+            "unfilled": result.get("unfilled", []),
+        }
+
+    async def _assign_incremental(
+        self,
+        event_id: str,
+        judges: list[dict],
+        submissions: list[dict],
+        existing: list[dict],
+        judges_per_submission: int,
+        exclusions: set[tuple[str, str]],
+        max_load: int | None,
+    ) -> dict:
+        """
+        Bring assignments up to date without discarding work: completed
+        and already-reviewed pairs are kept, only unassigned or
+        under-covered submissions get new judges, and pending work is
+        re-balanced only when the judge set changed. Writes are the
+        planned diff; deletes only ever remove still-pending rows.
+        """
+        reviewed = (
+            await db.table("reviews")
+            .select("judge_id, submission_id")
+            .eq("event_id", event_id)
+            .execute()
+        ).data or []
+        locked = {(r["judge_id"], r["submission_id"]) for r in reviewed}
+        locked.update(
+            (a["judge_id"], a["submission_id"])
+            for a in existing
+            if a.get("status") == "completed"
+        )
+
+        plan = plan_incremental(
+            judges, submissions, existing, locked,
+            judges_per_submission, exclusions, max_load,
+        )
+
+        delete_ids = plan["delete_ids"]
+        await self._writer.delete_in(
+            "judge_assignments", "id", delete_ids, filters={"status": "pending"},
+        )
+        await self._write_assignments([
+            {
+                "event_id": event_id,
+                "judge_id": a["judge_id"],
+                "submission_id": a["submission_id"],
+                "status": "pending",
+            }
+            for a in plan["insert"]
+        ])
+
+        added, removed = len(plan["insert"]), len(delete_ids)
+        return {
+            "message": (
+                f"Added {added} and removed {removed} judge-submission pairs "
+                f"({plan['kept']} unchanged)"
+            ),
+            "strategy": plan["strategy"],
+            "mode": "incremental",
+            "judge_loads": plan["judge_loads"],
+            "assignment_count": plan["kept"] + added,
+            "added": added,
+            "removed": removed,
+            "moved": plan["moved"],
+            "rebalanced": plan["rebalanced"],
+            "balance": plan["balance"],
+            "unfilled": plan["unfilled"],
+        }
+
+    async def _write_assignments(self, rows: list[dict]):
+        # Upsert keyed on the pair, so a job resumed after a partial write
+        # skips the chunks that already landed
+        await self._writer.upsert(
+            "judge_assignments", rows,
+            on_conflict="judge_id,submission_id",
+            ignore_duplicates=True,
+        )
+
+    async def aggregate_scores(self, event_id: str) -> dict:
+        """
+        Aggregate all review scores for an event into a leaderboard.
+        Uses weighted averages from criteria.
+        """
+        criteria_result, subs_result, reviews_result, schema = await asyncio.gather(
+            db.table("criteria")
+            .select("*")
+            .eq("event_id", event_id)
+            .order("sort_order")
+            .execute(),
+            db.table("submissions")
+            .select("*")
+            .eq("event_id", event_id)
+            .execute(),
+            db.table("reviews")
+            .select("*")
+            .eq("event_id", event_id)
+            .execute(),
+            submission_service.get_form_schema(event_id),
+        )
+        criteria = criteria_result.data or []
+        if not criteria:
+            raise ValueError("No criteria defined")
+
+        review_map: dict[str, list] = {}
+        for r in reviews_result.data or []:
+            review_map.setdefault(r["submission_id"], []).append(r)
+
+        submissions_with_reviews = []
+        for sub in submission_service.enrich_many(subs_result.data or [], schema.fields):
+            submissions_with_reviews.append({
+                "id": sub["id"],
+                "project_name": submission_service.project_name(sub),
+                "reviews": review_map.get(sub["id"], []),
+            })
+
+        return await archestra_service.aggregate_scores(criteria, submissions_with_reviews)
+
+    # ── Job handlers ──
+
+    async def run_assign_job(self, ctx: JobContext) -> dict:
+        event_id = ctx.job["event_id"]
+        judges_per_submission = ctx.params.get("judges_per_submission")
+        if judges_per_submission is None:
+            event = await event_cache.get(event_id) or {}
+            judges_per_submission = event.get("judges_per_submission", 2)
+        return await self.assign_judges(
+            event_id,
+            judges_per_submission=judges_per_submission,
+            use_current_load=ctx.params.get("use_current_load", True),
+            max_load=ctx.params.get("max_load_per_judge"),
+            exclusions=ctx.params.get("exclusions"),
+            use_ai=ctx.params.get("use_ai", False),
+            mode=ctx.params.get("mode", "replace"),
+        )
+
+    async def run_aggregate_job(self, ctx: JobContext) -> dict:
+        return await self.aggregate_scores(ctx.job["event_id"])
+
+
+orchestration_service = OrchestrationService()
+job_service.register(ASSIGN_JUDGES_JOB, orchestration_service.run_assign_job)
+job_service.register(AGGREGATE_SCORES_JOB, orchestration_service.run_aggregate_job)
@@ -3,9 +3,15 @@ Juryline -- Review Service
 Judge queue building, score validation, and review upsert logic.
 """
 
+import asyncio
 import json
 from fastapi import HTTPException
-from app.supabase_client import supabase
+from app.config import get_settings
+from app.supabase_client import db
+from app.services.event_cache import event_cache
+from app.services.leaderboard_engine import leaderboard_engine
+from app.services.submission_service import submission_service
+from app.utils.cache import TTLCache
 
 
 def _ensure_dict(value) -> dict:
@@ -37,9 +43,54 @@ def _enrich_form_data(form_data, form_fields: list) -> list[dict]:
     return display
 
 
+class CriteriaIndex:
+    """An event's criteria compiled for score validation (ordered by sort_order)."""
+
+    def __init__(self, criteria: list[dict]):
+        self.criteria = criteria
+        self.ids = tuple(c["id"] for c in criteria)
+        self.id_set = frozenset(self.ids)
+        self.position = {cid: i for i, cid in enumerate(self.ids)}
+        self.mins = [c["scale_min"] for c in criteria]
+        self.maxs = [c["scale_max"] for c in criteria]
+        self.names = [c["name"] for c in criteria]
+        self.weights = [c.get("weight", 1.0) for c in criteria]
+
+    def validate(self, scores: dict[str, float]):
+        """Raise 400 on unknown criteria, out-of-range scores, or missing criteria."""
+        if not self.ids:
+            raise HTTPException(400, "Event has no judging criteria")
+
+        for crit_id, score in scores.items():
+            i = self.position.get(crit_id)
+            if i is None:
+                raise HTTPException(400, f"Unknown criterion: {crit_id}")
+            if not (self.mins[i] <= score <= self.maxs[i]):
+                raise HTTPException(
+                    400,
+                    f"Score {score} out of range [{self.mins[i]}-{self.maxs[i]}] "
+                    f"for '{self.names[i]}'",
+                )
+
+        # Ensure ALL criteria are scored (every key is known, so compare sizes)
+        if len(scores) != len(self.ids):
+            names = [self.names[i] for i, cid in enumerate(self.ids) if cid not in scores]
+            raise HTTPException(400, f"Missing scores for: {', '.join(names)}")
+
+
 class ReviewService:
     """Handles judge queue, score validation, and review persistence."""
 
+    def __init__(self):
+        settings = get_settings()
+        # Criteria indexes keyed by event id. Only cached once the event has
+        # left draft, when criteria are locked.
+        self._criteria = TTLCache(
+            maxsize=settings.schema_cache_size,
+            ttl=settings.schema_cache_ttl_seconds,
+        )
+        self._judging_max_age = settings.judging_status_max_age_seconds
+
     async def get_judge_queue(self, judge_id: str, event_id: str) -> dict:
         """
         Build the full judge queue for an event:
@@ -51,7 +102,7 @@ class ReviewService:
         """
         # 1. Form fields for this event
         ff_result = (
-            supabase.table("form_fields")
+            await db.table("form_fields")
             .select("*")
             .eq("event_id", event_id)
             .order("sort_order")
@@ -60,19 +111,11 @@ class ReviewService:
         form_fields = ff_result.data or []
 
         # 2. Verify judge is assigned to this event
-        ej_result = (
-            supabase.table("event_judges")
-            .select("*")
-            .eq("event_id", event_id)
-            .eq("judge_id", judge_id)
-            .execute()
-        )
-        if not ej_result.data:
-            raise HTTPException(403, "You are not a judge for this event")
+        await self.require_event_judge(judge_id, event_id)
 
         # 3. Get all assignments for this judge + event, with submissions
         assign_result = (
-            supabase.table("judge_assignments")
+            await db.table("judge_assignments")
             .select("*, submissions(*)")
             .eq("judge_id", judge_id)
             .eq("event_id", event_id)
@@ -92,7 +135,7 @@ class ReviewService:
 
         # 4. Get existing reviews by this judge for this event
         rev_result = (
-            supabase.table("reviews")
+            await db.table("reviews")
             .select("*")
             .eq("judge_id", judge_id)
             .eq("event_id", event_id)
@@ -151,39 +194,172 @@ class ReviewService:
             "submissions": items,
         }
 
-    async def validate_scores(self, event_id: str, scores: dict[str, float]):
+    async def get_judge_queue_window(
+        self,
+        judge_id: str,
+        event_id: str,
+        offset: int | None = None,
+        limit: int = 5,
+    ) -> dict:
         """
-        Validate that all criteria are scored and values are within bounds.
+        Lean, paginated judge queue.
+
+        Form field definitions are sent once at the top level; each item
+        carries only its display values keyed by field id. `queue` lists
+        every assignment (submission_id + is_completed) so the UI can show
+        progress and fetch further windows by offset; full submissions and
+        reviews are loaded only for the items in the window. Without an
+        offset the window starts one item before current_index, so the
+        judge can step back as well as forward.
         """
+        schema, ej_result, assign_result = await asyncio.gather(
+            submission_service.get_form_schema(event_id),
+            db.table("event_judges")
+            .select("id")
+            .eq("event_id", event_id)
+            .eq("judge_id", judge_id)
+            .execute(),
+            db.table("judge_assignments")
+            .select("submission_id, status")
+            .eq("judge_id", judge_id)
+            .eq("event_id", event_id)
+            .order("assigned_at")
+            .execute(),
+        )
+        if not ej_result.data:
+            raise HTTPException(403, "You are not a judge for this event")
+
+        form_fields = schema.fields
+        queue = [
+            {"submission_id": a["submission_id"], "is_completed": a["status"] == "completed"}
+            for a in assign_result.data or []
+        ]
+        total = len(queue)
+        completed = sum(1 for q in queue if q["is_completed"])
+        current_index = next(
+            (i for i, q in enumerate(queue) if not q["is_completed"]),
+            max(total - 1, 0),
+        )
+
+        if offset is None:
+            offset = max(current_index - 1, 0)
+        window = queue[offset:offset + limit]
+        window_ids = [q["submission_id"] for q in window]
+
+        items = []
+        if window_ids:
+            subs_result, rev_result = await asyncio.gather(
+                db.table("submissions")
+                .select("id, status, form_data, created_at")
+                .in_("id", window_ids)
+                .execute(),
+                db.table("reviews")
+                .select("*")
+                .eq("judge_id", judge_id)
+                .in_("submission_id", window_ids)
+                .execute(),
+            )
+            subs_map = {s["id"]: s for s in subs_result.data or []}
+            reviews_map: dict[str, dict] = {}
+            for r in rev_result.data or []:
+                r["scores"] = _ensure_dict(r.get("scores", {}))
+                reviews_map[r["submission_id"]] = r
+
+            for i, q in enumerate(window, start=offset):
+                sub = subs_map.get(q["submission_id"])
+                if not sub:
+                    continue
+                raw = _ensure_dict(sub.get("form_data"))
+                items.append({
+                    "index": i,
+                    "submission_id": sub["id"],
+                    "status": sub.get("status"),
+                    "created_at": sub.get("created_at"),
+                    # Try lookup by field ID first, then fall back to label
+                    "values": {
+                        f["id"]: raw.get(f["id"]) or raw.get(f["label"])
+                        for f in form_fields
+                    },
+                    "review": reviews_map.get(sub["id"]),
+                    "is_completed": q["is_completed"],
+                })
+
+        return {
+            "total_assigned": total,
+            "completed": completed,
+            "remaining": total - completed,
+            "current_index": current_index,
+            "form_fields": form_fields,
+            "offset": offset,
+            "limit": limit,
+            "has_more": offset + limit < total,
+            "queue": queue,
+            "items": items,
+        }
+
+    async def get_criteria_index(self, event_id: str) -> CriteriaIndex:
+        """Return the compiled criteria index for an event."""
+        index = self._criteria.get(event_id)
+        if index is not None:
+            return index
+
         crit_result = (
-            supabase.table("criteria")
+            await db.table("criteria")
             .select("*")
             .eq("event_id", event_id)
+            .order("sort_order")
             .execute()
         )
-        criteria = crit_result.data or []
+        index = CriteriaIndex(crit_result.data or [])
 
-        if not criteria:
-            raise HTTPException(400, "Event has no judging criteria")
+        event = await event_cache.get(event_id)
+        if event and event["status"] != "draft":
+            self._criteria.set(event_id, index)
+        return index
 
-        criteria_map = {c["id"]: c for c in criteria}
+    @staticmethod
+    async def require_event_judge(judge_id: str, event_id: str):
+        """Raise 403 unless the user judges this event."""
+        result = (
+            await db.table("event_judges")
+            .select("id")
+            .eq("event_id", event_id)
+            .eq("judge_id", judge_id)
+            .execute()
+        )
+        if not result.data:
+            raise HTTPException(403, "You are not a judge for this event")
 
-        for crit_id, score in scores.items():
-            if crit_id not in criteria_map:
-                raise HTTPException(400, f"Unknown criterion: {crit_id}")
-            crit = criteria_map[crit_id]
-            if not (crit["scale_min"] <= score <= crit["scale_max"]):
-                raise HTTPException(
-                    400,
-                    f"Score {score} out of range [{crit['scale_min']}-{crit['scale_max']}] "
-                    f"for '{crit['name']}'",
-                )
+    async def _require_judging(self, event_id: str):
+        """
+        Raise 400 unless the event is in judging. Status only moves forward,
+        so a cached "closed" is final and a cached earlier status is
+        re-read (judging may have opened on another worker). A cached
+        "judging" is trusted for judging_status_max_age_seconds: a save can
+        land that long after judging closed on another worker, in exchange
+        for not reading the event on every score save.
+        """
+        event = event_cache.peek(event_id)
+        trusted = event is not None and (
+            event["status"] == "closed"
+            or (event["status"] == "judging" and event_cache.age(event_id) <= self._judging_max_age)
+        )
+        if not trusted:
+            event = await event_cache.get(event_id, fresh=True)
+        if not event or event["status"] != "judging":
+            raise HTTPException(400, "Event is not in judging phase")
 
-        # Ensure ALL criteria are scored
-        if set(scores.keys()) != set(criteria_map.keys()):
-            missing = set(criteria_map.keys()) - set(scores.keys())
-            names = [criteria_map[m]["name"] for m in missing]
-            raise HTTPException(400, f"Missing scores for: {', '.join(names)}")
+    def invalidate_criteria(self, event_id: str):
+        """Drop the criteria index (and the leaderboard built on it) after criterion CRUD."""
+        self._criteria.invalidate(event_id)
+        leaderboard_engine.invalidate(event_id)
+
+    async def validate_scores(self, event_id: str, scores: dict[str, float]):
+        """
+        Validate that all criteria are scored and values are within bounds.
+        """
+        index = await self.get_criteria_index(event_id)
+        index.validate(scores)
 
     async def create_or_update_review(
         self, judge_id: str, submission_id: str, scores: dict[str, float],
@@ -195,7 +371,7 @@ class ReviewService:
         """
         # 1. Verify judge is assigned to this submission
         assign_result = (
-            supabase.table("judge_assignments")
+            await db.table("judge_assignments")
             .select("*")
             .eq("judge_id", judge_id)
             .eq("submission_id", submission_id)
@@ -208,15 +384,7 @@ class ReviewService:
         event_id = assignment["event_id"]
 
         # 2. Verify event is in judging status
-        event_result = (
-            supabase.table("events")
-            .select("status")
-            .eq("id", event_id)
-            .single()
-            .execute()
-        )
-        if not event_result.data or event_result.data["status"] != "judging":
-            raise HTTPException(400, "Event is not in judging phase")
+        await self._require_judging(event_id)
 
         # 3. Validate scores against criteria
         await self.validate_scores(event_id, scores)
@@ -230,7 +398,7 @@ class ReviewService:
             "notes": notes,
         }
         review_result = (
-            supabase.table("reviews")
+            await db.table("reviews")
             .upsert(review_data, on_conflict="submission_id,judge_id")
             .execute()
         )
@@ -238,7 +406,7 @@ class ReviewService:
             raise HTTPException(500, "Failed to save review")
 
         # 5. Mark assignment as completed
-        supabase.table("judge_assignments").update(
+        await db.table("judge_assignments").update(
             {"status": "completed"}
         ).eq("id", assignment["id"]).execute()
 
@@ -247,7 +415,7 @@ class ReviewService:
     async def get_review(self, review_id: str) -> dict:
         """Get a single review by ID."""
         result = (
-            supabase.table("reviews")
+            await db.table("reviews")
             .select("*")
             .eq("id", review_id)
             .single()
@@ -267,15 +435,7 @@ class ReviewService:
             raise HTTPException(403, "Not your review")
 
         # Verify event is still in judging
-        event_result = (
-            supabase.table("events")
-            .select("status")
-            .eq("id", review["event_id"])
-            .single()
-            .execute()
-        )
-        if not event_result.data or event_result.data["status"] != "judging":
-            raise HTTPException(400, "Event is not in judging phase")
+        await self._require_judging(review["event_id"])
 
         update_data: dict = {}
         if scores is not None:
@@ -288,19 +448,20 @@ class ReviewService:
             return review
 
         result = (
-            supabase.table("reviews")
+            await db.table("reviews")
             .update(update_data)
             .eq("id", review_id)
             .execute()
         )
         if not result.data:
             raise HTTPException(500, "Failed to update review")
+
         return result.data[0]
 
     async def list_event_reviews(self, event_id: str) -> list[dict]:
         """List all reviews for an event (organizer view)."""
         result = (
-            supabase.table("reviews")
+            await db.table("reviews")
             .select("*")
             .eq("event_id", event_id)
             .order("submitted_at")
@@ -0,0 +1,315 @@
+"""
+Juryline -- Scoring Kernels
+Vectorized building blocks for score aggregation. Reviews are parsed once
+into a dense (review x criterion) float matrix with a validity mask; the
+leaderboard, event stats, bias report and fallback aggregation are then
+grouped reductions over that matrix.
+
+Means and the standard deviation must equal statistics.mean/stdev, as
+the original loops used: those are exact and rounded once, whereas a
+float sum/count can land on the other side of a 2-decimal rounding
+boundary. Scores are integers in the common case, and then a float64
+sum is exact and sum / count is already correctly rounded, so those
+groups stay vectorized; only groups holding a fractional score (or sums
+too large to be exact) go through statistics.mean. Rounding to 2
+decimals goes through Python's round() (not np.round) and
+per-submission weighted totals are summed in criteria order, so results
+match the original loops value for value.
+"""
+
+import json
+import math
+import sys
+from dataclasses import dataclass
+from fractions import Fraction
+from itertools import chain
+from statistics import mean, stdev
+
+import numpy as np
+
+# Integer sums below this are exact in float64
+_EXACT_LIMIT = 2.0 ** 53
+# Working precision of the correctly rounded square root (as statistics uses)
+_SQRT_BIT_WIDTH = 2 * sys.float_info.mant_dig + 3
+
+
+def _ensure_dict(value) -> dict:
+    """Safely coerce a value to a dict. Handles JSON strings from JSONB columns."""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+            if isinstance(parsed, dict):
+                return parsed
+        except (json.JSONDecodeError, TypeError):
+            pass
+    return {}
+
+
+def _to_float(value) -> float:
+    """A score as float, like the original float(s); NaN (treated as missing) if it isn't one."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def round2(values: np.ndarray) -> list[float]:
+    """Round each element to 2 decimals with Python semantics."""
+    return [round(v, 2) for v in values.tolist()]
+
+
+class ScoreMatrix:
+    """
+    Review scores as a dense matrix. Column j holds the score for keys[j];
+    mask marks which cells were present (and not null) in the review.
+    With include_unknown=True, score keys that aren't in `keys` get extra
+    columns appended in order of first appearance.
+    """
+
+    def __init__(self, score_dicts: list, keys: list[str], include_unknown: bool = False):
+        parsed = [_ensure_dict(raw) for raw in score_dicts]
+        self.keys = list(keys)
+        if include_unknown:
+            known = set(self.keys)
+            self.keys.extend(
+                key for key in dict.fromkeys(chain.from_iterable(parsed))
+                if key not in known
+            )
+
+        # Column-wise extraction; numpy maps missing (None) cells to NaN.
+        # A column holding something float() can't parse is converted
+        # cell by cell, so a stray bad score is skipped instead of failing.
+        self.values = np.empty((len(parsed), len(self.keys)), dtype=np.float64)
+        for j, key in enumerate(self.keys):
+            cells = [d.get(key) for d in parsed]
+            try:
+                self.values[:, j] = np.array(cells, dtype=np.float64)
+            except (TypeError, ValueError):
+                self.values[:, j] = [_to_float(cell) for cell in cells]
+        self.mask = ~np.isnan(self.values)
+        self.values[~self.mask] = 0.0
+
+    @property
+    def n_rows(self) -> int:
+        return self.values.shape[0]
+
+    def valid_values(self) -> np.ndarray:
+        """All present scores, flattened row by row."""
+        return self.values[self.mask]
+
+
+def _exact_sums(values: np.ndarray) -> bool:
+    """Whether values are integers small enough that sums and sums of squares are exact."""
+    if not values.size:
+        return True
+    peak = float(np.abs(values).max())
+    return peak * peak * values.size < _EXACT_LIMIT and bool(np.all(values == np.floor(values)))
+
+
+def group_means(values: np.ndarray, codes: np.ndarray, n_groups: int) -> np.ndarray:
+    """statistics.mean of the values in each group; NaN for empty groups."""
+    counts = np.bincount(codes, minlength=n_groups)
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    with np.errstate(invalid="ignore"):
+        means = sums / counts
+    if _exact_sums(values):
+        return means
+
+    # Recompute exactly the groups holding a fractional score (all of
+    # them if the magnitudes are too large for exact float sums)
+    if float(np.abs(values).max()) ** 2 * values.size >= _EXACT_LIMIT:
+        inexact = counts > 0
+    else:
+        inexact = np.bincount(codes[values != np.floor(values)], minlength=n_groups) > 0
+    selected = inexact[codes]
+    sub_codes = codes[selected]
+    order = np.argsort(sub_codes, kind="stable")
+    ordered = values[selected][order].tolist()
+    start = 0
+    for g, n in enumerate(np.bincount(sub_codes, minlength=n_groups).tolist()):
+        if n:
+            means[g] = mean(ordered[start:start + n])
+            start += n
+    return means
+
+
+def exact_mean(values: np.ndarray) -> float:
+    """statistics.mean of a non-empty array."""
+    if _exact_sums(values):
+        return int(values.sum()) / int(values.size)
+    return mean(values.tolist())
+
+
+def _isqrt_rto(n: int, m: int) -> int:
+    """isqrt(n / m), rounded to odd."""
+    root = math.isqrt(n // m)
+    return root | (root * root * m != n)
+
+
+def _sqrt_of_frac(n: int, m: int) -> float:
+    """Correctly rounded sqrt(n / m), computed the way statistics.stdev does."""
+    q = (n.bit_length() - m.bit_length() - _SQRT_BIT_WIDTH) // 2
+    if q >= 0:
+        return (_isqrt_rto(n, m << 2 * q) << q) / 1
+    return _isqrt_rto(n << -2 * q, m) / (1 << -q)
+
+
+def mean_and_stdev(values: np.ndarray) -> tuple[float, float]:
+    """statistics.mean and stdev (0 for a single value) of a non-empty array."""
+    n = int(values.size)
+    if n == 1:
+        return exact_mean(values), 0
+    if not _exact_sums(values):
+        all_values = values.tolist()
+        return mean(all_values), stdev(all_values)
+    total = int(values.sum())
+    squares = int((values * values).sum())
+    variance = Fraction(n * squares - total * total, n * (n - 1))
+    return total / n, _sqrt_of_frac(variance.numerator, variance.denominator)
+
+
+@dataclass
+class GroupedScores:
+    """Per-(group, column) reductions over a ScoreMatrix."""
+
+    means: np.ndarray   # NaN where a group has no score for the column
+    counts: np.ndarray
+    mins: np.ndarray
+    maxs: np.ndarray
+    rows: np.ndarray  # reviews per group, including ones with no valid scores
+
+
+def group_scores(matrix: ScoreMatrix, groups: np.ndarray, n_groups: int) -> GroupedScores:
+    """Reduce matrix rows into n_groups buckets given each row's group index."""
+    n_cols = len(matrix.keys)
+
+    means = np.full((n_groups, n_cols), np.nan)
+    counts = np.zeros((n_groups, n_cols), dtype=np.int64)
+    for j in range(n_cols):
+        present = matrix.mask[:, j]
+        counts[:, j] = np.bincount(groups[present], minlength=n_groups)
+        means[:, j] = group_means(matrix.values[present, j], groups[present], n_groups)
+
+    mins = np.full((n_groups, n_cols), np.inf)
+    maxs = np.full((n_groups, n_cols), -np.inf)
+    np.minimum.at(mins, groups, np.where(matrix.mask, matrix.values, np.inf))
+    np.maximum.at(maxs, groups, np.where(matrix.mask, matrix.values, -np.inf))
+
+    rows = np.bincount(groups, minlength=n_groups)
+    return GroupedScores(means=means, counts=counts, mins=mins, maxs=maxs, rows=rows)
+
+
+def rounded_means(grouped: GroupedScores) -> np.ndarray:
+    """Per-cell means rounded to 2 decimals (Python rounding); 0 where empty."""
+    present = grouped.counts > 0
+    means = np.where(present, grouped.means, 0.0)
+    return np.array(round2(means.ravel()), dtype=np.float64).reshape(means.shape)
+
+
+def weighted_totals(averages: np.ndarray, present: np.ndarray, weights: list[float]) -> np.ndarray:
+    """
+    Sum of average * weight over present columns, accumulated column by
+    column in order (matching a `total += avg * w` loop over criteria).
+    """
+    totals = np.zeros(averages.shape[0])
+    for j, weight in enumerate(weights):
+        totals = totals + np.where(present[:, j], averages[:, j] * weight, 0.0)
+    return totals
+
+
+def factorize(labels: list) -> tuple[np.ndarray, list]:
+    """Map labels to integer codes in order of first appearance."""
+    index: dict = {}
+    codes = [index.setdefault(label, len(index)) for label in labels]
+    return np.array(codes, dtype=np.int64), list(index)
+
+
+def leaderboard_entries(
+    criteria: list[dict],
+    submissions: list[tuple[str, str]],
+    reviews: list[dict],
+) -> list[dict]:
+    """
+    Ranked leaderboard for (submission_id, project_name) pairs, in the
+    shape returned by ScoringService.compute_leaderboard. Submissions
+    without reviews are left out; ties keep the order of `submissions`.
+    """
+    position = {sid: i for i, (sid, _) in enumerate(submissions)}
+    kept = [r for r in reviews if r["submission_id"] in position]
+    groups = np.array([position[r["submission_id"]] for r in kept], dtype=np.int64)
+
+    crit_ids = [c["id"] for c in criteria]
+    weights = [c.get("weight", 1.0) for c in criteria]
+    total_weight = sum(weights)
+
+    matrix = ScoreMatrix([r.get("scores") for r in kept], crit_ids)
+    grouped = group_scores(matrix, groups, len(submissions))
+    present = grouped.counts > 0
+    averages = rounded_means(grouped)
+
+    averages_list = averages.tolist()
+    mins_list = grouped.mins.tolist()
+    maxs_list = grouped.maxs.tolist()
+    present_list = present.tolist()
+    review_counts = grouped.rows.tolist()
+
+    leaderboard = []
+    for i, (sid, project_name) in enumerate(submissions):
+        if not review_counts[i]:
+            continue
+        criteria_scores = {}
+        for j, crit in enumerate(criteria):
+            if present_list[i][j]:
+                criteria_scores[crit["id"]] = {
+                    "criterion_name": crit["name"],
+                    "average": averages_list[i][j],
+                    "min_score": mins_list[i][j],
+                    "max_score": maxs_list[i][j],
+                    "weight": weights[j],
+                }
+        # Built-in sum() (compensated on 3.12+) over at most C terms, as before
+        weighted_score = (
+            sum(cs["average"] * cs["weight"] for cs in criteria_scores.values())
+            / total_weight
+            if total_weight > 0
+            else 0
+        )
+        leaderboard.append({
+            "submission_id": sid,
+            "project_name": project_name,
+            "weighted_score": round(weighted_score, 2),
+            "criteria_scores": criteria_scores,
+            "review_count": review_counts[i],
+        })
+
+    leaderboard.sort(key=lambda x: x["weighted_score"], reverse=True)
+    for i, entry in enumerate(leaderboard):
+        entry["rank"] = i + 1
+    return leaderboard
+
+
+def score_summary(reviews: list[dict]) -> tuple[ScoreMatrix, np.ndarray]:
+    """Matrix over every score key in the reviews, plus each row's valid-score count."""
+    matrix = ScoreMatrix([r.get("scores") for r in reviews], [], include_unknown=True)
+    return matrix, matrix.mask.sum(axis=1)
+
+
+def judge_means(reviews: list[dict]) -> tuple[list[str], np.ndarray, float, float] | None:
+    """
+    Per-judge mean of all scores given (judges in order of first review),
+    with the event-wide mean and sample std-dev. None if there are no scores.
+    """
+    matrix, row_counts = score_summary(reviews)
+    values = matrix.valid_values()
+    if not values.size:
+        return None
+
+    codes, judge_ids = factorize([r["judge_id"] for r in reviews])
+    # valid_values() is row-major, so each value's row repeats row_counts times
+    value_codes = np.repeat(codes, row_counts)
+    means = group_means(values, value_codes, len(judge_ids))
+
+    event_avg, event_std = mean_and_stdev(values)
+    return judge_ids, means, event_avg, event_std
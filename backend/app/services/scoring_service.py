@@ -4,8 +4,15 @@ Compute leaderboards, judge progress, bias detection, and statistics.
 """
 
 import json
-from statistics import mean, stdev
-from app.supabase_client import supabase
+import logging
+from typing import AsyncIterator
+from app.supabase_client import db
+from app.services.event_snapshot import EventSnapshot
+from app.services.leaderboard_engine import leaderboard_engine
+from app.services.scoring_kernels import exact_mean, judge_means, leaderboard_entries, score_summary
+from app.services.submission_service import submission_service
+
+logger = logging.getLogger(__name__)
 
 
 def _ensure_dict(value) -> dict:
@@ -25,14 +32,49 @@ def _ensure_dict(value) -> dict:
 class ScoringService:
     """Service for scoring aggregation and analytics."""
 
+    async def get_leaderboard(
+        self,
+        event_id: str,
+        limit: int | None = None,
+        verify: bool = False,
+        snapshot: EventSnapshot | None = None,
+    ) -> list[dict]:
+        """
+        Ranked leaderboard served from the incremental engine.
+        verify=True rebuilds the board from the database and logs any
+        difference from compute_leaderboard; a snapshot's reviews are
+        reused if the engine has to build the board.
+        """
+        if verify:
+            entries = await leaderboard_engine.rebuild(event_id)
+            reference = await self.compute_leaderboard(event_id)
+            engine_entries = {e["submission_id"]: e for e in entries}
+            reference_entries = {e["submission_id"]: e for e in reference}
+            drifted = [
+                sid for sid in engine_entries.keys() | reference_entries.keys()
+                if engine_entries.get(sid) != reference_entries.get(sid)
+            ]
+            if drifted:
+                logger.warning(
+                    "Leaderboard for event %s differs from the from-scratch "
+                    "computation on %d submissions (or changed while checking)",
+                    event_id, len(drifted),
+                )
+            return entries if limit is None else entries[:limit]
+        if snapshot is None or snapshot.version is None:
+            return await leaderboard_engine.top(event_id, limit)
+        return await leaderboard_engine.top(
+            event_id, limit, reviews=snapshot.reviews, version=snapshot.version,
+        )
+
     async def compute_leaderboard(self, event_id: str) -> list[dict]:
         """
-        Compute ranked leaderboard with weighted scores.
+        Compute ranked leaderboard with weighted scores from scratch.
         Returns sorted list with ranks, criteria breakdowns, and review counts.
         """
         # Fetch criteria with weights
         criteria_result = (
-            supabase.table("criteria")
+            await db.table("criteria")
             .select("*")
             .eq("event_id", event_id)
             .order("sort_order")
@@ -45,7 +87,7 @@ class ScoringService:
 
         # Fetch submissions
         submissions_result = (
-            supabase.table("submissions")
+            await db.table("submissions")
             .select("*")
             .eq("event_id", event_id)
             .execute()
@@ -54,134 +96,88 @@ class ScoringService:
 
         # Fetch all reviews for this event
         reviews_result = (
-            supabase.table("reviews")
+            await db.table("reviews")
             .select("*")
             .eq("event_id", event_id)
             .execute()
         )
         reviews = reviews_result.data or []
 
-        # Group reviews by submission
-        review_map: dict[str, list] = {}
-        for review in reviews:
-            sid = review["submission_id"]
-            if sid not in review_map:
-                review_map[sid] = []
-            review_map[sid].append(review)
-
-        # Fetch form fields for project name extraction
-        form_fields_result = (
-            supabase.table("form_fields")
-            .select("*")
-            .eq("event_id", event_id)
-            .order("sort_order")
-            .execute()
-        )
-        form_fields = form_fields_result.data or []
-
-        # Build leaderboard
-        leaderboard = []
-        for sub in submissions:
-            sub_reviews = review_map.get(sub["id"], [])
-            if not sub_reviews:
-                continue
+        # Form fields for project name extraction
+        reviewed_ids = {review["submission_id"] for review in reviews}
+        reviewed = [sub for sub in submissions if sub["id"] in reviewed_ids]
+        schema = await submission_service.get_form_schema(event_id)
+        submission_service.enrich_many(reviewed, schema.fields)
 
-            # Extract project name from form data
-            raw_form = _ensure_dict(sub.get("form_data", {}))
-            # Try to find a short_text field value for the project name
-            project_name = None
-            for field in form_fields:
-                val = raw_form.get(field["id"]) or raw_form.get(field["label"])
-                if field["field_type"] == "short_text" and val:
-                    project_name = val
-                    break
-            if not project_name:
-                project_name = f"Submission {sub['id'][:8]}"
-
-            # Compute per-criterion scores
-            criteria_scores = {}
-            for crit in criteria:
-                crit_id = crit["id"]
-                scores = [
-                    float(_ensure_dict(r["scores"]).get(crit_id, 0))
-                    for r in sub_reviews
-                    if crit_id in _ensure_dict(r.get("scores", {}))
-                ]
-
-                if scores:
-                    criteria_scores[crit_id] = {
-                        "criterion_name": crit["name"],
-                        "average": round(mean(scores), 2),
-                        "min_score": min(scores),
-                        "max_score": max(scores),
-                        "weight": crit.get("weight", 1.0),
-                    }
+        return leaderboard_entries(
+            criteria,
+            [(sub["id"], submission_service.project_name(sub)) for sub in reviewed],
+            reviews,
+        )
 
-            # Compute weighted total
-            total_weight = sum(c.get("weight", 1.0) for c in criteria)
-            weighted_score = (
-                sum(cs["average"] * cs["weight"] for cs in criteria_scores.values())
-                / total_weight
-                if total_weight > 0
-                else 0
+    async def iter_review_scores(
+        self,
+        event_id: str,
+        criterion_ids: list[str],
+        page_size: int = 1000,
+    ) -> AsyncIterator[dict]:
+        """
+        Yield one dict per (submission, judge, criterion) score, in criterion
+        order. Reviews are fetched in keyset pages ordered by the unique
+        (submission_id, judge_id), so only one page is held in memory, each
+        page is an index range scan, and reviews written mid-export can't
+        shift rows between pages.
+        """
+        after: tuple[str, str] | None = None
+        while True:
+            query = (
+                db.table("reviews")
+                .select("submission_id, judge_id, scores, submitted_at")
+                .eq("event_id", event_id)
             )
+            if after:
+                sid, jid = after
+                query = query.or_(
+                    f"submission_id.gt.{sid},"
+                    f"and(submission_id.eq.{sid},judge_id.gt.{jid})"
+                )
+            page = (
+                await query.order("submission_id").order("judge_id").limit(page_size).execute()
+            ).data or []
+
+            for review in page:
+                scores = _ensure_dict(review.get("scores"))
+                for crit_id in criterion_ids:
+                    if crit_id not in scores:
+                        continue
+                    yield {
+                        "submission_id": review["submission_id"],
+                        "judge_id": review["judge_id"],
+                        "criterion_id": crit_id,
+                        "score": scores[crit_id],
+                        "submitted_at": review.get("submitted_at") or "",
+                    }
 
-            leaderboard.append({
-                "submission_id": sub["id"],
-                "project_name": project_name,
-                "weighted_score": round(weighted_score, 2),
-                "criteria_scores": criteria_scores,
-                "review_count": len(sub_reviews),
-            })
-
-        # Sort by weighted score descending
-        leaderboard.sort(key=lambda x: x["weighted_score"], reverse=True)
-
-        # Assign ranks
-        for i, entry in enumerate(leaderboard):
-            entry["rank"] = i + 1
-
-        return leaderboard
+            if len(page) < page_size:
+                return
+            after = (page[-1]["submission_id"], page[-1]["judge_id"])
 
-    async def compute_event_stats(self, event_id: str) -> dict:
+    async def compute_event_stats(
+        self, event_id: str, snapshot: EventSnapshot | None = None,
+    ) -> dict:
         """Compute statistics for event dashboard."""
-        # Get counts
-        submissions = (
-            supabase.table("submissions")
-            .select("id", count="exact")
-            .eq("event_id", event_id)
-            .execute()
-        )
-        total_submissions = submissions.count or 0
+        if snapshot is None:
+            snapshot = await EventSnapshot.load(event_id, event=False)
 
-        judges = (
-            supabase.table("event_judges")
-            .select("id", count="exact")
-            .eq("event_id", event_id)
-            .execute()
-        )
-        total_judges = judges.count or 0
-
-        reviews = (
-            supabase.table("reviews")
-            .select("*")
-            .eq("event_id", event_id)
-            .execute()
-        )
-        all_reviews = reviews.data or []
+        total_submissions = snapshot.submission_count
+        total_judges = len(snapshot.judges)
+        all_reviews = snapshot.reviews
         total_reviews = len(all_reviews)
 
         # Count assignments
-        assignments = (
-            supabase.table("judge_assignments")
-            .select("*")
-            .eq("event_id", event_id)
-            .execute()
-        )
-        all_assignments = assignments.data or []
-        total_assignments = len(all_assignments)
+        total_assignments = len(snapshot.assignments)
         completed_assignments = sum(
-            1 for a in all_assignments if a.get("status") == "completed"
+            1 for a in snapshot.assignments if a.get("status") == "completed"
         )
 
         completion_percent = (
@@ -191,12 +187,9 @@ class ScoringService:
         )
 
         # Compute average score
-        all_scores = []
-        for review in all_reviews:
-            scores_dict = _ensure_dict(review.get("scores", {}))
-            all_scores.extend([float(s) for s in scores_dict.values()])
-
-        avg_score = round(mean(all_scores), 2) if all_scores else None
+        matrix, _ = score_summary(all_reviews)
+        all_scores = matrix.valid_values()
+        avg_score = round(exact_mean(all_scores), 2) if all_scores.size else None
 
         return {
             "total_submissions": total_submissions,
@@ -208,25 +201,16 @@ class ScoringService:
             "avg_score": avg_score,
         }
 
-    async def compute_judge_progress(self, event_id: str) -> list[dict]:
+    async def compute_judge_progress(
+        self, event_id: str, snapshot: EventSnapshot | None = None,
+    ) -> list[dict]:
         """Compute per-judge progress statistics."""
-        # Get all judges for event
-        judges_result = (
-            supabase.table("event_judges")
-            .select("judge_id, profiles:judge_id(id, name)")
-            .eq("event_id", event_id)
-            .execute()
-        )
-        judges_data = judges_result.data or []
-
-        # Get all assignments
-        assignments_result = (
-            supabase.table("judge_assignments")
-            .select("*")
-            .eq("event_id", event_id)
-            .execute()
-        )
-        assignments = assignments_result.data or []
+        if snapshot is None:
+            snapshot = await EventSnapshot.load(
+                event_id, event=False, reviews=False, submissions=False,
+            )
+        judges_data = snapshot.judges
+        assignments = snapshot.assignments
 
         # Build per-judge stats
         judge_map: dict[str, dict] = {}
@@ -281,59 +265,39 @@ class ScoringService:
 
         return progress_list
 
-    async def compute_bias_report(self, event_id: str) -> list[dict]:
+    async def compute_bias_report(
+        self, event_id: str, snapshot: EventSnapshot | None = None,
+    ) -> list[dict]:
         """
         Detect judge bias by comparing average scores given vs event average.
         Flags outliers (> 1.5 standard deviations from mean).
         """
-        # Get all reviews
-        reviews_result = (
-            supabase.table("reviews")
-            .select("*")
-            .eq("event_id", event_id)
-            .execute()
-        )
-        reviews = reviews_result.data or []
+        if snapshot is None:
+            snapshot = await EventSnapshot.load(
+                event_id, event=False, assignments=False, submissions=False,
+            )
+        reviews = snapshot.reviews
 
         if not reviews:
             return []
 
-        # Get judge names
-        judges_result = (
-            supabase.table("event_judges")
-            .select("judge_id, profiles:judge_id(name)")
-            .eq("event_id", event_id)
-            .execute()
-        )
+        # Judge names
         judge_name_map = {}
-        for j in judges_result.data or []:
+        for j in snapshot.judges:
             profile = j.get("profiles") or {}
             judge_name_map[j["judge_id"]] = profile.get("name", "Unknown")
 
         # Compute per-judge average scores
-        judge_scores: dict[str, list[float]] = {}
-        all_scores: list[float] = []
-
-        for review in reviews:
-            jid = review["judge_id"]
-            scores_dict = _ensure_dict(review.get("scores", {}))
-            scores = [float(s) for s in scores_dict.values()]
-
-            if jid not in judge_scores:
-                judge_scores[jid] = []
-            judge_scores[jid].extend(scores)
-            all_scores.extend(scores)
-
-        if not all_scores:
+        summary = judge_means(reviews)
+        if summary is None:
             return []
-
-        event_avg = mean(all_scores)
-        event_std = stdev(all_scores) if len(all_scores) > 1 else 0
+        judge_ids, means, event_avg, event_std = summary
 
         # Build bias report
         bias_report = []
-        for jid, scores in judge_scores.items():
-            judge_avg = mean(scores)
+        for jid, judge_avg in zip(judge_ids, means.tolist()):
+            if judge_avg != judge_avg:  # NaN: judge has reviews but no scores
+                continue
             deviation = judge_avg - event_avg
             is_outlier = abs(deviation) > (1.5 * event_std) if event_std > 0 else False
 
@@ -351,19 +315,23 @@ class ScoringService:
 
         return bias_report
 
-    async def get_full_dashboard(self, event_id: str) -> dict:
-        """Get complete dashboard data in one call."""
-        # Get event details
-        event_result = supabase.table("events").select("*").eq("id", event_id).single().execute()
-        event = event_result.data
+    async def get_full_dashboard(self, event_id: str, event: dict | None = None) -> dict:
+        """
+        Get complete dashboard data in one call. Shared rows are loaded
+        once, in parallel, and passed to each computation. `event` is the
+        metadata the caller already loaded (event_cache); the event row is
+        fetched only when it isn't given.
+        """
+        snapshot = await EventSnapshot.load(event_id, event=event is None)
+        if event is not None:
+            snapshot.event = event
 
-        # Compute all dashboard data
-        stats = await self.compute_event_stats(event_id)
-        judge_progress = await self.compute_judge_progress(event_id)
-        leaderboard = await self.compute_leaderboard(event_id)
+        stats = await self.compute_event_stats(event_id, snapshot)
+        judge_progress = await self.compute_judge_progress(event_id, snapshot)
+        leaderboard = await self.get_leaderboard(event_id, snapshot=snapshot)
 
         return {
-            "event": event,
+            "event": snapshot.event,
             "stats": stats,
             "judge_progress": judge_progress,
             "leaderboard": leaderboard,
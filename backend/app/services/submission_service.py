@@ -4,161 +4,401 @@ Dynamic validation of form_data against form_fields, and enrichment
 of stored submissions with human-readable labels for display.
 """
 
+import base64
+import json
 from datetime import datetime
+from uuid import UUID
 from fastapi import HTTPException
-from app.supabase_client import supabase
+from app.config import get_settings
+from app.supabase_client import db
+from app.services.event_cache import event_cache
+from app.utils.cache import TTLCache
 
 
-class SubmissionService:
-    """Validates and enriches submissions against dynamic form schemas."""
+def _ensure_dict(value) -> dict:
+    """Safely coerce a value to a dict. Handles JSON strings from JSONB columns."""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+            if isinstance(parsed, dict):
+                return parsed
+        except (json.JSONDecodeError, TypeError):
+            pass
+    return {}
 
-    async def validate_form_data(self, event_id: str, form_data: dict):
-        """Validate submitted form_data against the event's form_fields schema."""
-        fields_result = (
-            supabase.table("form_fields")
-            .select("*")
-            .eq("event_id", event_id)
-            .order("sort_order")
-            .execute()
-        )
-        fields = fields_result.data or []
 
-        if not fields:
-            raise HTTPException(400, "Event has no form fields defined")
+def _option_lookup(options) -> tuple[frozenset, list] | None:
+    """
+    Precompute a set for O(1) option checks. Unhashable options (rare) stay
+    in a list that is scanned as before.
+    """
+    if not isinstance(options, list):
+        return None
+    hashable, unhashable = [], []
+    for opt in options:
+        try:
+            hash(opt)
+            hashable.append(opt)
+        except TypeError:
+            unhashable.append(opt)
+    return frozenset(hashable), unhashable
+
+
+def _in_options(value, lookup: tuple[frozenset, list]) -> bool:
+    option_set, unhashable = lookup
+    try:
+        if value in option_set:
+            return True
+    except TypeError:
+        pass  # Unhashable value can only match an unhashable option
+    return bool(unhashable) and value in unhashable
+
+
+def _compile_field(field: dict):
+    """
+    Compile one form field into a check(value) -> error | None closure.
+    Field config (validation bounds, options) is read once here instead of
+    on every submission.
+    """
+    label = field["label"]
+    ftype = field["field_type"]
+    validation = field.get("validation")
+    validation = validation if isinstance(validation, dict) else {}
+
+    match ftype:
+        case "short_text":
+            max_length = validation.get("max_length")
+
+            def check(value):
+                if not isinstance(value, str):
+                    return [f"{label} must be text"]
+                if max_length and len(value) > max_length:
+                    return [f"{label} exceeds {max_length} characters"]
+                return None
+
+        case "long_text":
+            def check(value):
+                if not isinstance(value, str):
+                    return [f"{label} must be text"]
+                return None
+
+        case "number":
+            min_val = validation.get("min")
+            max_val = validation.get("max")
+
+            def check(value):
+                if not isinstance(value, (int, float)):
+                    return [f"{label} must be a number"]
+                errors = []
+                if min_val is not None and value < min_val:
+                    errors.append(f"{label} must be >= {min_val}")
+                if max_val is not None and value > max_val:
+                    errors.append(f"{label} must be <= {max_val}")
+                return errors or None
 
+        case "url":
+            def check(value):
+                if not isinstance(value, str) or not value.startswith("http"):
+                    return [f"{label} must be a valid URL"]
+                return None
+
+        case "email":
+            def check(value):
+                if not isinstance(value, str) or "@" not in value:
+                    return [f"{label} must be a valid email"]
+                return None
+
+        case "dropdown" | "multiple_choice":
+            lookup = _option_lookup(field.get("options", []))
+
+            def check(value):
+                if lookup is not None and not _in_options(value, lookup):
+                    return [f"{label}: invalid option '{value}'"]
+                return None
+
+        case "checkboxes":
+            lookup = _option_lookup(field.get("options", []))
+
+            def check(value):
+                if not isinstance(value, list):
+                    return [f"{label} must be a list"]
+                if lookup is not None and not all(_in_options(v, lookup) for v in value):
+                    return [f"{label}: invalid option(s)"]
+                return None
+
+        case "file_upload":
+            def check(value):
+                if not isinstance(value, list):
+                    return [f"{label} must be a list of file URLs"]
+                return None
+
+        case "date":
+            def check(value):
+                try:
+                    datetime.fromisoformat(str(value))
+                except (ValueError, TypeError):
+                    return [f"{label} must be a valid date"]
+                return None
+
+        case "linear_scale":
+            opts = field.get("options", {})
+            if isinstance(opts, dict):
+                min_val = opts.get("min", 1)
+                max_val = opts.get("max", 10)
+            else:
+                min_val, max_val = 1, 10
+
+            def check(value):
+                if not isinstance(value, (int, float)) or not (
+                    min_val <= value <= max_val
+                ):
+                    return [f"{label} must be between {min_val} and {max_val}"]
+                return None
+
+        case _:
+            def check(value):
+                return None
+
+    return check
+
+
+class CompiledFormSchema:
+    """An event's form fields compiled into reusable validators."""
+
+    def __init__(self, fields: list[dict]):
+        self.fields = fields
+        self.known_ids = frozenset(f["id"] for f in fields)
+        self._checks = [
+            (f["id"], f["label"], bool(f["is_required"]), _compile_field(f))
+            for f in fields
+        ]
+
+    def validate(self, form_data: dict) -> list[str]:
+        """Return the list of validation errors (empty if valid)."""
         errors: list[str] = []
 
-        for field in fields:
-            fid = field["id"]
+        for fid, label, is_required, check in self._checks:
             value = form_data.get(fid)
-            ftype = field["field_type"]
-            label = field["label"]
 
             # Check required
-            if field["is_required"] and (
-                value is None or value == "" or value == []
-            ):
+            if is_required and (value is None or value == "" or value == []):
                 errors.append(f"{label} is required")
                 continue
 
             if value is None:
                 continue  # Optional and not provided
 
-            # Type-specific validation
-            match ftype:
-                case "short_text":
-                    if not isinstance(value, str):
-                        errors.append(f"{label} must be text")
-                    elif field.get("validation"):
-                        v = field["validation"]
-                        if v.get("max_length") and len(value) > v["max_length"]:
-                            errors.append(
-                                f"{label} exceeds {v['max_length']} characters"
-                            )
-
-                case "long_text":
-                    if not isinstance(value, str):
-                        errors.append(f"{label} must be text")
-
-                case "number":
-                    if not isinstance(value, (int, float)):
-                        errors.append(f"{label} must be a number")
-                    elif field.get("validation"):
-                        v = field["validation"]
-                        if v.get("min") is not None and value < v["min"]:
-                            errors.append(f"{label} must be >= {v['min']}")
-                        if v.get("max") is not None and value > v["max"]:
-                            errors.append(f"{label} must be <= {v['max']}")
-
-                case "url":
-                    if not isinstance(value, str) or not value.startswith("http"):
-                        errors.append(f"{label} must be a valid URL")
-
-                case "email":
-                    if not isinstance(value, str) or "@" not in value:
-                        errors.append(f"{label} must be a valid email")
-
-                case "dropdown" | "multiple_choice":
-                    options = field.get("options", [])
-                    if isinstance(options, list) and value not in options:
-                        errors.append(f"{label}: invalid option '{value}'")
-
-                case "checkboxes":
-                    options = field.get("options", [])
-                    if not isinstance(value, list):
-                        errors.append(f"{label} must be a list")
-                    elif isinstance(options, list) and not all(
-                        v in options for v in value
-                    ):
-                        errors.append(f"{label}: invalid option(s)")
-
-                case "file_upload":
-                    if not isinstance(value, list):
-                        errors.append(f"{label} must be a list of file URLs")
-
-                case "date":
-                    try:
-                        datetime.fromisoformat(str(value))
-                    except (ValueError, TypeError):
-                        errors.append(f"{label} must be a valid date")
-
-                case "linear_scale":
-                    opts = field.get("options", {})
-                    if isinstance(opts, dict):
-                        min_val = opts.get("min", 1)
-                        max_val = opts.get("max", 10)
-                    else:
-                        min_val, max_val = 1, 10
-                    if not isinstance(value, (int, float)) or not (
-                        min_val <= value <= max_val
-                    ):
-                        errors.append(
-                            f"{label} must be between {min_val} and {max_val}"
-                        )
+            field_errors = check(value)
+            if field_errors:
+                errors.extend(field_errors)
 
         # Check for unknown fields
-        known_ids = {f["id"] for f in fields}
         for key in form_data:
-            if key not in known_ids:
+            if key not in self.known_ids:
                 errors.append(f"Unknown field: {key}")
 
-        if errors:
-            raise HTTPException(400, detail={"errors": errors})
+        return errors
+
+
+class SubmissionService:
+    """Validates and enriches submissions against dynamic form schemas."""
+
+    def __init__(self):
+        settings = get_settings()
+        # Compiled schemas keyed by event id. Only cached once the event has
+        # left draft, when form fields are locked.
+        self._schemas = TTLCache(
+            maxsize=settings.schema_cache_size,
+            ttl=settings.schema_cache_ttl_seconds,
+        )
+
+    async def get_form_schema(self, event_id: str) -> CompiledFormSchema:
+        """Return the compiled form schema for an event."""
+        schema = self._schemas.get(event_id)
+        if schema is not None:
+            return schema
 
-    async def enrich_for_display(self, submission: dict) -> dict:
-        """Add form_data_display with field labels and types for frontend."""
         fields_result = (
-            supabase.table("form_fields")
+            await db.table("form_fields")
             .select("*")
-            .eq("event_id", submission["event_id"])
+            .eq("event_id", event_id)
             .order("sort_order")
             .execute()
         )
+        schema = CompiledFormSchema(fields_result.data or [])
+
+        event = await event_cache.get(event_id)
+        if event and event["status"] != "draft":
+            self._schemas.set(event_id, schema)
+        return schema
+
+    def invalidate_form_schema(self, event_id: str):
+        """Drop the compiled schema after form field CRUD."""
+        self._schemas.invalidate(event_id)
 
-        # form_data may be a JSON string (from DB) or already a dict
-        raw = submission.get("form_data", {})
-        if isinstance(raw, str):
-            import json
-            try:
-                raw = json.loads(raw)
-            except (json.JSONDecodeError, TypeError):
-                raw = {}
-
-        display = []
-        for field in fields_result.data or []:
-            # Try lookup by field ID first, then fall back to label
-            value = raw.get(field["id"]) or raw.get(field["label"])
-            display.append(
+    async def validate_form_data(self, event_id: str, form_data: dict):
+        """Validate submitted form_data against the event's form_fields schema."""
+        schema = await self.get_form_schema(event_id)
+
+        if not schema.fields:
+            raise HTTPException(400, "Event has no form fields defined")
+
+        errors = schema.validate(form_data)
+        if errors:
+            raise HTTPException(400, detail={"errors": errors})
+
+    def enrich_many(self, submissions: list[dict], form_fields: list[dict]) -> list[dict]:
+        """
+        Add form_data_display to many submissions in one pass.
+        The field id/label lookup is built once for the whole batch.
+        """
+        lookup = [
+            (f["id"], f["label"], f["field_type"]) for f in form_fields
+        ]
+        for submission in submissions:
+            # form_data may be a JSON string (from DB) or already a dict
+            raw = _ensure_dict(submission.get("form_data"))
+            submission["form_data_display"] = [
                 {
-                    "field_id": field["id"],
-                    "label": field["label"],
-                    "field_type": field["field_type"],
-                    "value": value,
+                    "field_id": fid,
+                    "label": label,
+                    "field_type": ftype,
+                    # Try lookup by field ID first, then fall back to label
+                    "value": raw.get(fid) or raw.get(label),
                 }
+                for fid, label, ftype in lookup
+            ]
+        return submissions
+
+    async def enrich_for_display(self, submission: dict) -> dict:
+        """Add form_data_display with field labels and types for frontend."""
+        schema = await self.get_form_schema(submission["event_id"])
+        return self.enrich_many([submission], schema.fields)[0]
+
+    @staticmethod
+    def project_name(submission: dict) -> str:
+        """First non-empty short_text value of an enriched submission."""
+        return next(
+            (
+                d["value"]
+                for d in submission.get("form_data_display", [])
+                if d["field_type"] == "short_text" and d["value"]
+            ),
+            f"Submission {submission['id'][:8]}",
+        )
+
+
+    # ── Listing ──
+
+    @staticmethod
+    def encode_cursor(row: dict) -> str:
+        """Opaque keyset cursor for (created_at, id)."""
+        raw = json.dumps([row["created_at"], row["id"]]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[str, str]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, sid = json.loads(base64.urlsafe_b64decode(padded))
+            # Both values are interpolated into a filter, so validate strictly
+            datetime.fromisoformat(created_at)
+            return created_at, str(UUID(sid))
+        except (ValueError, TypeError, AttributeError):
+            raise HTTPException(400, "Invalid cursor")
+
+    @staticmethod
+    def _summarize(sub: dict) -> dict:
+        """Lightweight projection for listing tables."""
+        ai = _ensure_dict(_ensure_dict(sub.get("form_data")).get("_ai_validation"))
+        return {
+            "id": sub["id"],
+            "participant_id": sub["participant_id"],
+            "status": sub["status"],
+            "created_at": sub["created_at"],
+            "updated_at": sub.get("updated_at"),
+            "project_name": SubmissionService.project_name(sub),
+            "review_count": len(sub.get("reviews") or []),
+            "ai_flagged": ai.get("valid") is False,
+            "ai_validation_status": sub.get("ai_validation_status"),
+        }
+
+    async def list_for_event(
+        self,
+        event_id: str,
+        *,
+        view: str = "full",
+        status: str | None = None,
+        has_reviews: bool | None = None,
+        flagged: bool | None = None,
+        validation_status: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        List an event's submissions, newest first, with optional filters.
+
+        With `limit`, returns one keyset page (ordered by created_at, id)
+        plus the cursor for the next page, or None on the last page.
+        view="summary" returns the lightweight projection instead of
+        fully enriched rows.
+        """
+        if view == "summary":
+            select = "id, participant_id, status, created_at, updated_at, form_data, ai_validation_status"
+        else:
+            select = "*"
+        if has_reviews is True:
+            select += ", reviews!inner(id)"
+        elif has_reviews is False or view == "summary":
+            select += ", reviews(id)"
+
+        query = (
+            db.table("submissions")
+            .select(select)
+            .eq("event_id", event_id)
+        )
+        if status:
+            query = query.eq("status", status)
+        if has_reviews is False:
+            query = query.is_("reviews", "null")
+        if flagged is True:
+            query = query.eq("form_data->_ai_validation->>valid", "false")
+        elif flagged is False:
+            query = query.or_(
+                "form_data->_ai_validation->>valid.is.null,"
+                "form_data->_ai_validation->>valid.neq.false"
+            )
+        if validation_status:
+            query = query.eq("ai_validation_status", validation_status)
+        if cursor:
+            created_at, sid = self.decode_cursor(cursor)
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{sid})'
             )
 
-        submission["form_data_display"] = display
-        return submission
+        query = query.order("created_at", desc=True).order("id", desc=True)
+        if limit is not None:
+            # Fetch one extra row to know whether another page exists
+            query = query.limit(limit + 1)
+
+        rows = (await query.execute()).data or []
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(rows[-1])
+
+        schema = await self.get_form_schema(event_id)
+        self.enrich_many(rows, schema.fields)
+        if view == "summary":
+            return [self._summarize(sub) for sub in rows], next_cursor
+
+        for sub in rows:
+            sub.pop("reviews", None)
+        return rows, next_cursor
 
 
 submission_service = SubmissionService()
@@ -0,0 +1,261 @@
+"""
+Juryline -- Ingest Validation Service
+Runs Archestra Ingest-agent validation for new submissions in the
+background, so creating a submission never waits on the agent.
+
+- The submissions table is the durable queue: new rows are stored with
+  ai_validation_status='pending' and their id is pushed onto an
+  in-process queue drained by a bounded set of workers.
+- Claiming is a conditional UPDATE (pending, or running with a stale
+  claim), so when several API workers see the same row only one
+  validates it. A periodic sweep picks up rows queued by a worker that
+  died or restarted.
+- The result is written to form_data._ai_validation only if the row is
+  unchanged since it was claimed; if the participant edited it in the
+  meantime, the new form data is validated instead.
+- If the Ingest agent is configured but unavailable (down, circuit open,
+  saturated), the row is put back as pending for the next sweep rather
+  than marked validated with the pass-through result. That doesn't count
+  toward max_attempts, so an outage delays validation instead of
+  failing every submission that arrived during it.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app.config import get_settings
+from app.supabase_client import db
+from app.services.archestra_service import archestra_service
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_STATUSES = ("pending", "running", "completed", "failed")
+QUEUED_STATUSES = ("pending", "running")
+SWEEP_BATCH = 500
+
+
+def _ensure_dict(value) -> dict:
+    """Safely coerce a value to a dict. Handles JSON strings from JSONB columns."""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+            if isinstance(parsed, dict):
+                return parsed
+        except (json.JSONDecodeError, TypeError):
+            pass
+    return {}
+
+
+def _iso(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class IngestValidationService:
+    """Bounded background queue for submission ingest validation."""
+
+    def __init__(self):
+        settings = get_settings()
+        self.concurrency = settings.ingest_validation_concurrency
+        self.sweep_interval = settings.ingest_validation_sweep_seconds
+        self.stale_after = settings.ingest_validation_stale_seconds
+        self.max_attempts = settings.ingest_validation_max_attempts
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._queued: set[str] = set()
+        self._workers: list[asyncio.Task] = []
+        self._sweeper: asyncio.Task | None = None
+        self._completed = 0
+        self._failed = 0
+
+    def enqueue(self, submission_id: str):
+        """Schedule validation of a submission stored with status 'pending'."""
+        if submission_id not in self._queued:
+            self._queued.add(submission_id)
+            self._queue.put_nowait(submission_id)
+
+    # ── Lifecycle ──
+
+    async def start(self):
+        """Start the workers and the periodic sweep (which runs once immediately)."""
+        if self._workers:
+            return
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def shutdown(self):
+        """Stop the workers; unfinished rows stay queued in the table."""
+        tasks = self._workers + ([self._sweeper] if self._sweeper else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._sweeper = None
+
+    async def sweep(self) -> int:
+        """Enqueue pending rows and rows whose claim went stale. Returns how many were added."""
+        cutoff = _iso(datetime.now(timezone.utc) - timedelta(seconds=self.stale_after))
+        result = (
+            await db.table("submissions")
+            .select("id")
+            .in_("ai_validation_status", list(QUEUED_STATUSES))
+            .or_(f"ai_validation_status.eq.pending,ai_validation_claimed_at.lt.{cutoff}")
+            .order("created_at")
+            .limit(SWEEP_BATCH)
+            .execute()
+        )
+        added = 0
+        for row in result.data or []:
+            if row["id"] not in self._queued:
+                self.enqueue(row["id"])
+                added += 1
+        return added
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "workers": len(self._workers),
+            "completed": self._completed,
+            "failed": self._failed,
+        }
+
+    # ── Processing ──
+
+    async def process(self, submission_id: str) -> bool:
+        """Claim and validate one submission. Returns True if a result was written."""
+        row = await self._claim(submission_id)
+        if not row:
+            return False
+        claimed_at = row["ai_validation_claimed_at"]
+
+        while True:
+            form_data = {
+                key: value
+                for key, value in _ensure_dict(row.get("form_data")).items()
+                if key != "_ai_validation"
+            }
+            try:
+                validation = await self._validate(form_data)
+            except Exception as e:
+                await self._release_failed(row, claimed_at, e)
+                return False
+            if validation is None:
+                await self._release_unavailable(row, claimed_at)
+                return False
+
+            saved = (
+                await db.table("submissions")
+                .update({
+                    "form_data": {**form_data, "_ai_validation": validation},
+                    "ai_validation_status": "completed",
+                })
+                .eq("id", submission_id)
+                .eq("ai_validation_claimed_at", claimed_at)
+                .eq("updated_at", row["updated_at"])
+                .execute()
+            )
+            if saved.data:
+                self._completed += 1
+                if not validation.get("valid", True):
+                    logger.info(f"Archestra flagged submission {submission_id} with errors/warnings")
+                return True
+
+            # Edited while we validated (or our claim was taken over); retry
+            # with the current form data only if the claim is still ours.
+            current = await self._fetch(submission_id)
+            if not current or current["ai_validation_claimed_at"] != claimed_at:
+                return False
+            row = current
+
+    # ── Internals ──
+
+    async def _worker(self):
+        while True:
+            submission_id = await self._queue.get()
+            self._queued.discard(submission_id)
+            try:
+                await self.process(submission_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Ingest validation of submission {submission_id} failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _sweep_loop(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.warning(f"Ingest validation sweep failed: {e}")
+            await asyncio.sleep(self.sweep_interval)
+
+    async def _validate(self, form_data: dict) -> dict | None:
+        """
+        The Ingest agent's result, or None if it is set up but unavailable
+        (down, circuit open, saturated, unusable reply). Only deployments
+        without an Ingest agent get the pass-through result.
+        """
+        if not archestra_service.has_agent("ingest"):
+            return archestra_service.validation_pass_through(form_data)
+        return await archestra_service.try_validate_submission(form_data)
+
+    async def _claim(self, submission_id: str) -> dict | None:
+        now = datetime.now(timezone.utc)
+        cutoff = _iso(now - timedelta(seconds=self.stale_after))
+        result = (
+            await db.table("submissions")
+            .update({"ai_validation_status": "running", "ai_validation_claimed_at": _iso(now)})
+            .eq("id", submission_id)
+            .in_("ai_validation_status", list(QUEUED_STATUSES))
+            .or_(f"ai_validation_status.eq.pending,ai_validation_claimed_at.lt.{cutoff}")
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    async def _fetch(self, submission_id: str) -> dict | None:
+        result = (
+            await db.table("submissions")
+            .select("id, form_data, updated_at, ai_validation_status, ai_validation_claimed_at, ai_validation_attempts")
+            .eq("id", submission_id)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    async def _release_unavailable(self, row: dict, claimed_at: str):
+        """Put the row back for the next sweep without using up an attempt."""
+        logger.info(f"Ingest agent unavailable; submission {row['id']} stays queued")
+        await (
+            db.table("submissions")
+            .update({"ai_validation_status": "pending", "ai_validation_claimed_at": None})
+            .eq("id", row["id"])
+            .eq("ai_validation_claimed_at", claimed_at)
+            .execute()
+        )
+
+    async def _release_failed(self, row: dict, claimed_at: str, error: Exception):
+        """Put the row back for the next sweep, or give up after max_attempts."""
+        attempts = (row.get("ai_validation_attempts") or 0) + 1
+        status = "failed" if attempts >= self.max_attempts else "pending"
+        logger.warning(
+            f"Ingest validation of submission {row['id']} failed "
+            f"(attempt {attempts}/{self.max_attempts}): {error}"
+        )
+        await (
+            db.table("submissions")
+            .update({
+                "ai_validation_status": status,
+                "ai_validation_claimed_at": None,
+                "ai_validation_attempts": attempts,
+            })
+            .eq("id", row["id"])
+            .eq("ai_validation_claimed_at", claimed_at)
+            .execute()
+        )
+        if status == "failed":
+            self._failed += 1
+
+
+ingest_validation_service = IngestValidationService()
@@ -1,9 +1,17 @@
 """
 Juryline — Supabase Client
-Creates the Supabase client using the service role key.
+Creates the Supabase clients using the service role key.
 Backend always uses service role to bypass RLS.
+
+- `supabase`: sync client, kept for Supabase Auth admin calls.
+- `db`: async PostgREST client over a pooled httpx connection pool.
+  All table queries from async routes and services go through `db`
+  so a slow query never blocks the event loop.
 """
 
+import httpx
+from postgrest import AsyncPostgrestClient, AsyncRequestBuilder
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
 from supabase import create_client, Client
 from app.config import get_settings
 
@@ -19,3 +27,74 @@ def get_supabase_client() -> Client:
 
 # Singleton client for use across the app
 supabase: Client = get_supabase_client()
+
+
+class _PooledPostgrestClient(AsyncPostgrestClient):
+    """AsyncPostgrestClient whose httpx session uses configurable pool limits."""
+
+    def __init__(self, base_url: str, *, limits: httpx.Limits, **kwargs):
+        self._limits = limits
+        super().__init__(base_url, **kwargs)
+
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            proxy=proxy,
+            follow_redirects=True,
+            http2=True,
+            limits=self._limits,
+        )
+
+
+class AsyncDatabase:
+    """
+    Async data-access layer with the same query surface as `supabase.table()`:
+        await db.table("events").select("*").eq("id", event_id).execute()
+
+    The underlying client is created lazily on first use and closed from
+    the FastAPI lifespan on shutdown.
+    """
+
+    def __init__(self):
+        self._client: AsyncPostgrestClient | None = None
+
+    @property
+    def client(self) -> AsyncPostgrestClient:
+        if self._client is None:
+            settings = get_settings()
+            key = settings.supabase_service_key
+            self._client = _PooledPostgrestClient(
+                f"{settings.supabase_url}/rest/v1",
+                headers={
+                    **DEFAULT_POSTGREST_CLIENT_HEADERS,
+                    "apiKey": key,
+                    "Authorization": f"Bearer {key}",
+                },
+                timeout=settings.db_timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=settings.db_pool_max_connections,
+                    max_keepalive_connections=settings.db_pool_max_keepalive,
+                ),
+            )
+        return self._client
+
+    def table(self, table_name: str) -> AsyncRequestBuilder:
+        """Start a query against a table."""
+        return self.client.from_(table_name)
+
+    def rpc(self, fn: str, params: dict):
+        """Call a Postgres function."""
+        return self.client.rpc(fn, params)
+
+    async def aclose(self):
+        """Close pooled connections (called on application shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Singleton async client for table queries
+db = AsyncDatabase()
@@ -0,0 +1,168 @@
+"""
+Juryline -- Bulk Writer
+Splits large inserts/upserts/deletes into chunks and sends them to
+PostgREST with bounded parallelism and per-chunk retry, instead of one
+multi-megabyte request (or one request per row).
+
+Works with anything exposing `.table(name)` that returns async PostgREST
+request builders: the app's `db` singleton, or a plain
+AsyncPostgrestClient (as the seed scripts use, without app settings).
+
+Retries:
+- upsert: any transient failure (timeouts, dropped connections,
+  statement timeout, serialization/deadlock). Upserts are idempotent,
+  so re-sending a chunk, or re-running a whole script, is safe.
+- insert: only failures where the request never reached the server
+  (connect errors); anything later could duplicate rows.
+- delete: like upsert (deleting twice is harmless).
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+import httpx
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+logger = logging.getLogger(__name__)
+
+# Postgres error codes worth retrying: statement timeout,
+# serialization failure, deadlock, connection failures
+TRANSIENT_PG_CODES = {"57014", "40001", "40P01", "08000", "08003", "08006"}
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, APIError) and error.code in TRANSIENT_PG_CODES
+
+
+def _not_sent(error: Exception) -> bool:
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+
+@dataclass
+class BulkResult:
+    """Outcome of a bulk write."""
+
+    rows: int = 0       # rows sent (or ids deleted)
+    chunks: int = 0
+    retries: int = 0
+    data: list[dict] = field(default_factory=list)  # returned rows, if requested
+
+
+class BulkWriter:
+    """Chunked, concurrent, retrying writes for one database client."""
+
+    def __init__(
+        self,
+        client,
+        chunk_size: int = 500,
+        concurrency: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+    ):
+        self.client = client
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    async def insert(
+        self, table: str, rows: list[dict], returning: bool = False,
+    ) -> BulkResult:
+        """Insert rows in chunks. Set returning=True to collect the inserted rows."""
+        method = ReturnMethod.representation if returning else ReturnMethod.minimal
+        return await self._run(
+            rows,
+            lambda chunk: self.client.table(table).insert(chunk, returning=method).execute(),
+            retry_on=_not_sent,
+            collect=returning,
+        )
+
+    async def upsert(
+        self,
+        table: str,
+        rows: list[dict],
+        on_conflict: str,
+        ignore_duplicates: bool = False,
+        returning: bool = False,
+    ) -> BulkResult:
+        """
+        Insert-or-update rows in chunks, keyed by the unique columns in
+        on_conflict (e.g. "judge_id,submission_id"). With
+        ignore_duplicates, existing rows are left untouched.
+        """
+        method = ReturnMethod.representation if returning else ReturnMethod.minimal
+        return await self._run(
+            rows,
+            lambda chunk: self.client.table(table).upsert(
+                chunk,
+                on_conflict=on_conflict,
+                ignore_duplicates=ignore_duplicates,
+                returning=method,
+            ).execute(),
+            retry_on=_is_transient,
+            collect=returning,
+        )
+
+    async def delete_in(
+        self,
+        table: str,
+        column: str,
+        values: list,
+        filters: dict[str, Any] | None = None,
+    ) -> BulkResult:
+        """DELETE ... WHERE column IN (chunk) [AND key = value ...] for each chunk of values."""
+
+        def send(chunk):
+            query = self.client.table(table).delete(returning=ReturnMethod.minimal).in_(column, chunk)
+            for key, value in (filters or {}).items():
+                query = query.eq(key, value)
+            return query.execute()
+
+        return await self._run(values, send, retry_on=_is_transient, collect=False)
+
+    # ── Internals ──
+
+    async def _run(
+        self,
+        items: list,
+        send: Callable[[list], Awaitable],
+        retry_on: Callable[[Exception], bool],
+        collect: bool,
+    ) -> BulkResult:
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        result = BulkResult(rows=len(items), chunks=len(chunks))
+        if not chunks:
+            return result
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        returned: list[list[dict]] = [[] for _ in chunks]
+
+        async def write(index: int, chunk: list):
+            async with semaphore:
+                attempt = 0
+                while True:
+                    try:
+                        response = await send(chunk)
+                        break
+                    except Exception as e:
+                        if attempt >= self.max_retries or not retry_on(e):
+                            raise
+                        attempt += 1
+                        result.retries += 1
+                        logger.warning(
+                            "Bulk write chunk %d/%d failed (%s); retry %d/%d",
+                            index + 1, len(chunks), e, attempt, self.max_retries,
+                        )
+                        await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                if collect:
+                    returned[index] = response.data or []
+
+        await asyncio.gather(*(write(i, chunk) for i, chunk in enumerate(chunks)))
+        if collect:
+            result.data = [row for chunk in returned for row in chunk]
+        return result
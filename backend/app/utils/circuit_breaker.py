@@ -0,0 +1,84 @@
+"""
+Juryline -- Circuit Breaker
+Small async-friendly circuit breaker for calls to external services.
+
+closed     calls go through; consecutive failures are counted
+open       calls are rejected immediately until recovery_timeout passes
+half_open  a limited number of probe calls go through; one success
+           closes the circuit, a failure re-opens it
+"""
+
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-dependency failure tracker that fails fast while the dependency is down."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed; callers must then record its outcome."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return True
+        self._rejected += 1
+        return False
+
+    def record_abandoned(self):
+        """A permitted call ended without an outcome (e.g. cancelled); free its probe slot."""
+        if self._state == HALF_OPEN and self._probes:
+            self._probes -= 1
+
+    def record_success(self):
+        self._state = CLOSED
+        self._failures = 0
+        self._probes = 0
+
+    def record_failure(self):
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+            self._probes = 0
+
+    def stats(self) -> dict:
+        state = self.state
+        retry_in = None
+        if state == OPEN:
+            retry_in = round(max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at)), 1)
+        return {
+            "state": state,
+            "consecutive_failures": self._failures,
+            "rejected_calls": self._rejected,
+            "retry_in_seconds": retry_in,
+        }
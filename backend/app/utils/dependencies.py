@@ -1,30 +1,47 @@
 """
 Juryline — FastAPI Dependencies
-Token verification via Supabase auth.get_user, current user extraction,
-and role-based guards.
+Token verification (local JWT check, with Supabase auth.get_user as
+fallback), current user extraction, and role-based guards.
 """
 
+import logging
 from fastapi import Depends, HTTPException, Header
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 
-from app.supabase_client import supabase
+from app.config import get_settings
+from app.supabase_client import supabase, db
+from app.utils.cache import TTLCache
+from app.utils.jwt_verifier import jwt_verifier, InvalidToken, UnverifiableToken
 
+logger = logging.getLogger(__name__)
 
-async def get_current_user(authorization: str = Header(...)) -> dict:
-    """
-    Extract and verify the current user from the Authorization header.
-    Expects: 'Bearer <supabase_jwt>'
-    Uses Supabase auth.get_user() so it works regardless of JWT algorithm
-    (HS256, ES256, etc.).
-    Returns the user's profile from the profiles table.
-    """
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Invalid authorization header")
+_settings = get_settings()
+
+# Profile rows keyed by user id. PATCH /profiles/me writes through.
+profile_cache = TTLCache(
+    maxsize=_settings.profile_cache_size,
+    ttl=_settings.profile_cache_ttl_seconds,
+)
 
-    token = authorization.replace("Bearer ", "")
 
+async def get_profile(user_id: str) -> dict | None:
+    """Fetch a profile row, serving from the profile cache when possible."""
+    cached = profile_cache.get(user_id)
+    if cached is not None:
+        return dict(cached)
+
+    result = await db.table("profiles").select("*").eq("id", user_id).execute()
+    if not result.data:
+        return None
+    profile_cache.set(user_id, result.data[0])
+    return dict(result.data[0])
+
+
+async def _verify_remote(token: str) -> str:
+    """Verify the token with a round trip to Supabase Auth. Returns user id."""
     try:
-        auth_response = supabase.auth.get_user(token)
+        auth_response = await run_in_threadpool(supabase.auth.get_user, token)
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -34,13 +51,47 @@ async def get_current_user(authorization: str = Header(...)) -> dict:
     user_id = auth_response.user.id
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token: no subject")
+    return user_id
 
-    # Fetch profile from Supabase
-    result = supabase.table("profiles").select("*").eq("id", user_id).execute()
-    if not result.data:
+
+async def verify_token(token: str) -> str:
+    """
+    Verify a Supabase access token and return the user id.
+    Checks locally first; falls back to auth.get_user() only when the token
+    cannot be verified locally and AUTH_REMOTE_FALLBACK is enabled.
+    """
+    settings = get_settings()
+    if not settings.auth_local_verification:
+        return await _verify_remote(token)
+
+    try:
+        return await jwt_verifier.verify(token)
+    except InvalidToken:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    except UnverifiableToken as e:
+        if not settings.auth_remote_fallback:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        logger.warning("Local token verification inconclusive (%s), using remote check", e)
+        return await _verify_remote(token)
+
+
+async def get_current_user(authorization: str = Header(...)) -> dict:
+    """
+    Extract and verify the current user from the Authorization header.
+    Expects: 'Bearer <supabase_jwt>'
+    Returns the user's profile from the profiles table.
+    """
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Invalid authorization header")
+
+    token = authorization.replace("Bearer ", "")
+    user_id = await verify_token(token)
+
+    profile = await get_profile(user_id)
+    if not profile:
         raise HTTPException(status_code=404, detail="User profile not found")
 
-    return result.data[0]
+    return profile
 
 
 async def require_organizer(user: dict = Depends(get_current_user)) -> dict:
@@ -64,23 +115,14 @@ async def require_participant(user: dict = Depends(get_current_user)) -> dict:
     return user
 
 
-def get_optional_user(authorization: Optional[str] = Header(None)) -> Optional[dict]:
+async def get_optional_user(authorization: Optional[str] = Header(None)) -> Optional[dict]:
     """Optional auth — returns user or None if no token provided."""
     if not authorization:
         return None
 
     try:
         token = authorization.replace("Bearer ", "")
-        auth_response = supabase.auth.get_user(token)
-
-        if not auth_response or not auth_response.user:
-            return None
-
-        user_id = auth_response.user.id
-        if not user_id:
-            return None
-
-        result = supabase.table("profiles").select("*").eq("id", user_id).execute()
-        return result.data[0] if result.data else None
+        user_id = await verify_token(token)
+        return await get_profile(user_id)
     except Exception:
         return None
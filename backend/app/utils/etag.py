@@ -0,0 +1,82 @@
+"""
+Juryline -- Event ETags
+Conditional GET for endpoints that poll an event's judging data.
+
+The database keeps a per-event change counter (event_versions, bumped by
+triggers on every write to the event and its form fields, criteria,
+judges, submissions, assignments and reviews). An ETag is a hash of that
+version plus whatever else shapes the response (endpoint, judge, query
+parameters). When the client's If-None-Match still matches, the endpoint
+answers 304 after one RPC, without building or serializing the body.
+
+The version is read before the body is computed: a write that lands
+mid-computation can only make the ETag older than the body, so the next
+poll gets a fresh 200 rather than a stale 304. Nothing per-worker goes
+into the tag, so it is the same whichever API worker answers.
+
+A 304 is only as private as the checks made before conditional_get:
+endpoints authorize the caller first, since compute() never runs on a
+match.
+"""
+
+import hashlib
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response
+
+from app.supabase_client import db
+
+# Browsers store the body but revalidate on every request
+CACHE_CONTROL = "private, no-cache"
+
+
+async def event_version(event_id: str) -> int:
+    """Current change version of an event (0 if unchanged since tracking began)."""
+    result = await db.rpc("event_change_version", {"p_event_id": event_id}).execute()
+    return int(result.data or 0)
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the given parts."""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether If-None-Match lists this ETag (weak comparison). '*' is not
+    honoured: no poller sends it, and it would match for any event id.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    event_id: str,
+    compute: Callable[[], Awaitable[Any]],
+    *key: Any,
+) -> Any:
+    """
+    Answer 304 if the client's copy is current, else compute the body
+    and tag it. `key` distinguishes responses for the same event (endpoint
+    name, judge id, query parameters). The caller must already have
+    checked the user may see this event.
+    """
+    version = await event_version(event_id)
+    etag = make_etag(event_id, version, *key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    body = await compute()
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return body
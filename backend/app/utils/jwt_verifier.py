@@ -0,0 +1,144 @@
+"""
+Juryline — Local JWT Verification
+Verifies Supabase access tokens in-process instead of calling
+auth.get_user() on every request.
+
+- HS256 tokens are checked against SUPABASE_JWT_SECRET.
+- Asymmetric tokens (ES256, RS256, ...) are checked against the project's
+  JWKS, fetched once and refreshed periodically or on an unknown key id.
+  A failed fetch is retried only after a backoff, so an unreachable
+  JWKS endpoint isn't hit on every request.
+- A bad signature is a 401: it is never a reason to call Supabase Auth,
+  or anyone could make every request cost a remote round trip.
+"""
+
+import asyncio
+import logging
+import time
+
+import httpx
+import jwt
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512", "EdDSA"}
+
+# Minimum gap between forced JWKS refreshes triggered by unknown key ids
+_FORCED_REFRESH_INTERVAL = 30.0
+
+# Wait after a failed JWKS fetch, doubling per consecutive failure
+_FETCH_BACKOFF_MIN = 5.0
+_FETCH_BACKOFF_MAX = 300.0
+
+
+class InvalidToken(Exception):
+    """Token is malformed, expired, or fails signature/claim checks."""
+
+
+class UnverifiableToken(Exception):
+    """Token cannot be checked locally (no key available for it)."""
+
+
+class JWTVerifier:
+    """Verifies Supabase JWTs locally with the shared secret or a cached JWKS."""
+
+    def __init__(self):
+        settings = get_settings()
+        self.secret = settings.supabase_jwt_secret
+        self.audience = settings.supabase_jwt_audience or None
+        self.jwks_url = f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
+        self.jwks_ttl = settings.jwks_cache_ttl_seconds
+        self._api_key = settings.supabase_service_key
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._fetched_at = 0.0
+        self._failures = 0
+        self._retry_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _refresh_jwks(self, force: bool = False):
+        """Fetch the JWKS if stale (or forced and not refreshed recently)."""
+        async with self._lock:
+            now = time.monotonic()
+            if now < self._retry_at:
+                return  # Backing off after a failed fetch; keep the keys we have
+            age = now - self._fetched_at
+            if force and age < _FORCED_REFRESH_INTERVAL:
+                return
+            if not force and self._keys and age < self.jwks_ttl:
+                return
+            try:
+                async with httpx.AsyncClient() as client:
+                    resp = await client.get(
+                        self.jwks_url,
+                        headers={"apikey": self._api_key},
+                        timeout=5.0,
+                    )
+                    resp.raise_for_status()
+                    jwks = resp.json()
+            except Exception as e:
+                self._failures += 1
+                backoff = min(_FETCH_BACKOFF_MIN * 2 ** (self._failures - 1), _FETCH_BACKOFF_MAX)
+                self._retry_at = time.monotonic() + backoff
+                logger.warning("JWKS fetch failed (%s); retrying in %.0fs", e, backoff)
+                return
+
+            keys: dict[str, jwt.PyJWK] = {}
+            for jwk in jwks.get("keys", []):
+                try:
+                    keys[jwk.get("kid", "")] = jwt.PyJWK(jwk)
+                except jwt.PyJWKError as e:
+                    logger.warning("Skipping unusable JWK %s: %s", jwk.get("kid"), e)
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+            self._failures = 0
+
+    async def _get_signing_key(self, kid: str):
+        await self._refresh_jwks()
+        if kid not in self._keys:
+            # Key rotation: the token may be signed with a key we have not seen yet
+            await self._refresh_jwks(force=True)
+        jwk = self._keys.get(kid)
+        if jwk is None:
+            raise UnverifiableToken(f"No JWKS key for kid '{kid}'")
+        return jwk.key
+
+    async def verify(self, token: str) -> str:
+        """
+        Verify the token and return its subject (the user id).
+        Raises InvalidToken or UnverifiableToken.
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError as e:
+            raise InvalidToken(str(e))
+
+        alg = header.get("alg")
+        if alg == "HS256":
+            if not self.secret:
+                raise UnverifiableToken("SUPABASE_JWT_SECRET not set")
+            key = self.secret
+        elif alg in _ASYMMETRIC_ALGORITHMS:
+            key = await self._get_signing_key(header.get("kid", ""))
+        else:
+            raise InvalidToken(f"Unsupported token algorithm: {alg}")
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[alg],
+                audience=self.audience,
+                options={"require": ["exp", "sub"], "verify_aud": bool(self.audience)},
+                leeway=10,
+            )
+        except jwt.InvalidTokenError as e:
+            # Includes bad signatures: the key is known (the secret, or the
+            # JWKS key for this kid), so the token itself is wrong
+            raise InvalidToken(str(e))
+
+        return claims["sub"]
+
+
+jwt_verifier = JWTVerifier()
@@ -21,7 +21,7 @@ Assets:
 Run within Docker: docker compose exec backend python seed.py
 """
 
-import os, sys, uuid, json, random
+import os, sys, uuid, json, random, asyncio
 from datetime import datetime, timedelta, timezone
 
 # Ensure we can import 'app'
@@ -48,6 +48,35 @@ if not SUPABASE_URL or not SERVICE_KEY:
 
 sb = create_client(SUPABASE_URL, SERVICE_KEY)
 
+# Bulk writes go through the app's BulkWriter (chunked, parallel, retried
+# upserts) on a plain async PostgREST client -- no app settings needed.
+from postgrest import AsyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
+from app.utils.bulk_writer import BulkWriter
+
+def bulk_upsert(table, rows, on_conflict="id"):
+    async def run():
+        client = AsyncPostgrestClient(
+            f"{SUPABASE_URL}/rest/v1",
+            headers={
+                **DEFAULT_POSTGREST_CLIENT_HEADERS,
+                "apiKey": SERVICE_KEY,
+                "Authorization": f"Bearer {SERVICE_KEY}",
+            },
+        )
+        try:
+            await BulkWriter(client, chunk_size=500, concurrency=4).upsert(table, rows, on_conflict=on_conflict)
+        finally:
+            await client.aclose()
+    asyncio.run(run())
+
+# Seeded rows get ids derived from a fixed namespace and their natural name,
+# so a re-run upserts the same rows instead of adding a second copy.
+SEED_NS = uuid.UUID("6f1c5a3e-2b7d-4e0a-9c41-8d2f7b6e1a90")
+
+def seed_id(*parts):
+    return str(uuid.uuid5(SEED_NS, "/".join(str(p) for p in parts)))
+
 # ─── Colors ───
 G = "\033[92m"  # green
 Y = "\033[93m"  # yellow
@@ -142,10 +171,10 @@ log(f"Created {len(PARTICIPANTS)} Participants")
 section("Seeding Event 1: Global AI Hackathon")
 
 now = datetime.now(timezone.utc)
-EVENT1_ID = str(uuid.uuid4())
+EVENT1_ID = seed_id("event", "Global AI Hackathon 2026")
 
 # Create Event
-sb.table("events").insert({
+bulk_upsert("events", [{
     "id": EVENT1_ID,
     "organizer_id": ORG_ID,
     "name": "Global AI Hackathon 2026",
@@ -155,7 +184,7 @@ sb.table("events").insert({
     "status": "judging",
     "judges_per_submission": 2,
     "banner_url": BANNER_AI
-}).execute()
+}])
 
 # Fields
 fields_e1 = [
@@ -166,7 +195,9 @@ fields_e1 = [
     {"event_id": EVENT1_ID, "label": "GitHub Repo", "field_type": "url", "is_required": True, "sort_order": 4},
     {"event_id": EVENT1_ID, "label": "Category", "field_type": "dropdown", "options": json.dumps({"choices": ["Health", "Finance", "Education", "Uncategorized"]}), "is_required": True, "sort_order": 5},
 ]
-sb.table("form_fields").insert(fields_e1).execute()
+for field in fields_e1:
+    field["id"] = seed_id(EVENT1_ID, "field", field["label"])
+bulk_upsert("form_fields", fields_e1)
 
 # Criteria
 crit_e1 = [
@@ -174,12 +205,17 @@ crit_e1 = [
     {"event_id": EVENT1_ID, "name": "Technical Complexity", "scale_min": 1, "scale_max": 10, "weight": 1.5, "sort_order": 1},
     {"event_id": EVENT1_ID, "name": "Business Value", "scale_min": 1, "scale_max": 10, "weight": 1.0, "sort_order": 2},
 ]
-c_resp = sb.table("criteria").insert(crit_e1).execute()
-CRITERIA_IDS_E1 = [c["id"] for c in c_resp.data]
+for crit in crit_e1:
+    crit["id"] = seed_id(EVENT1_ID, "criterion", crit["name"])
+bulk_upsert("criteria", crit_e1)
+CRITERIA_IDS_E1 = [c["id"] for c in crit_e1]
 
 # Invite Judges
-for jid in JUDGES:
-    sb.table("event_judges").insert({"event_id": EVENT1_ID, "judge_id": jid, "invite_status": "accepted"}).execute()
+bulk_upsert(
+    "event_judges",
+    [{"event_id": EVENT1_ID, "judge_id": jid, "invite_status": "accepted"} for jid in JUDGES],
+    on_conflict="event_id,judge_id",
+)
 
 # Submissions (20 items)
 projects = [
@@ -205,7 +241,8 @@ projects = [
     ("DataViz", "Uncategorized", "Instant charts")
 ]
 
-E1_SUB_IDS = []
+E1_SUB_IDS = [seed_id(EVENT1_ID, "submission", name) for name, _, _ in projects]
+e1_subs = []
 for i, (name, cat, desc) in enumerate(projects):
     video = VIDEOS[i % len(VIDEOS)]
     fd = {
@@ -216,14 +253,14 @@ for i, (name, cat, desc) in enumerate(projects):
         "GitHub Repo": f"https://github.com/demo/{name.lower()}",
         "Category": cat
     }
-    
-    res = sb.table("submissions").insert({
+    e1_subs.append({
+        "id": E1_SUB_IDS[i],
         "event_id": EVENT1_ID,
         "participant_id": PARTICIPANTS[i],
         "status": "submitted",
         "form_data": json.dumps(fd)
-    }).execute()
-    E1_SUB_IDS.append(res.data[0]["id"])
+    })
+bulk_upsert("submissions", e1_subs)
 
 # Assign & Review (Partial)
 # Judge 1 (User): Assigned 10, Reviewed 5
@@ -238,25 +275,30 @@ assign_map = {
     JUDGES[2]: list(range(10, 20))
 }
 
+# Reviews: J1 reviews its first 5 (0-4), J2 its first 8 (5-12)
+reviewed = {
+    JUDGES[0]: (range(0, 5), (6, 10), "Solid entry."),
+    JUDGES[1]: (range(5, 13), (5, 9), "Nice work."),
+}
+
+e1_assignments = []
+e1_reviews = []
 for jid, indices in assign_map.items():
     for idx in indices:
         sid = E1_SUB_IDS[idx]
-        sb.table("judge_assignments").insert({"event_id": EVENT1_ID, "judge_id": jid, "submission_id": sid, "status": "pending"}).execute()
-
-# Reviews
-# J1 reviews first 5
-for idx in range(0, 5):
-    sid = E1_SUB_IDS[idx]
-    scores = {cid: random.randint(6, 10) for cid in CRITERIA_IDS_E1}
-    sb.table("reviews").insert({"submission_id": sid, "judge_id": JUDGES[0], "event_id": EVENT1_ID, "scores": json.dumps(scores), "notes": "Solid entry."}).execute()
-    sb.table("judge_assignments").update({"status": "completed"}).eq("submission_id", sid).eq("judge_id", JUDGES[0]).execute()
-
-# J2 reviews first 8 assigned (5-12)
-for idx in range(5, 13):
-    sid = E1_SUB_IDS[idx]
-    scores = {cid: random.randint(5, 9) for cid in CRITERIA_IDS_E1}
-    sb.table("reviews").insert({"submission_id": sid, "judge_id": JUDGES[1], "event_id": EVENT1_ID, "scores": json.dumps(scores), "notes": "Nice work."}).execute()
-    sb.table("judge_assignments").update({"status": "completed"}).eq("submission_id", sid).eq("judge_id", JUDGES[1]).execute()
+        review = reviewed.get(jid)
+        done = review is not None and idx in review[0]
+        e1_assignments.append({
+            "event_id": EVENT1_ID, "judge_id": jid, "submission_id": sid,
+            "status": "completed" if done else "pending",
+        })
+        if done:
+            lo, hi = review[1]
+            scores = {cid: random.randint(lo, hi) for cid in CRITERIA_IDS_E1}
+            e1_reviews.append({"submission_id": sid, "judge_id": jid, "event_id": EVENT1_ID, "scores": json.dumps(scores), "notes": review[2]})
+
+bulk_upsert("judge_assignments", e1_assignments, on_conflict="judge_id,submission_id")
+bulk_upsert("reviews", e1_reviews, on_conflict="submission_id,judge_id")
 
 log(f"Seeded 20 subs, assignments, and reviews for Event 1")
 
@@ -265,9 +307,9 @@ log(f"Seeded 20 subs, assignments, and reviews for Event 1")
 # 4. EVENT 2: DESIGN SUMMIT (COMPLETED)
 # ════════════════════════════════════════════════════════════════
 section("Seeding Event 2: Design Systems Summit")
-EVENT2_ID = str(uuid.uuid4())
+EVENT2_ID = seed_id("event", "Design Systems Summit")
 
-sb.table("events").insert({
+bulk_upsert("events", [{
     "id": EVENT2_ID,
     "organizer_id": ORG_ID,
     "name": "Design Systems Summit",
@@ -277,23 +319,29 @@ sb.table("events").insert({
     "status": "closed",
     "judges_per_submission": 2,
     "banner_url": BANNER_DESIGN
-}).execute()
+}])
 
 # Minimal fields/criteria just to exist
-sb.table("form_fields").insert([{"event_id": EVENT2_ID, "label": "Title", "field_type": "short_text", "is_required": True, "sort_order": 0}]).execute()
-sb.table("criteria").insert([{"event_id": EVENT2_ID, "name": "Beauty", "scale_min": 1, "scale_max": 10, "weight": 1.0, "sort_order": 0}]).execute()
+bulk_upsert("form_fields", [{"id": seed_id(EVENT2_ID, "field", "Title"), "event_id": EVENT2_ID, "label": "Title", "field_type": "short_text", "is_required": True, "sort_order": 0}])
+bulk_upsert("criteria", [{"id": seed_id(EVENT2_ID, "criterion", "Beauty"), "event_id": EVENT2_ID, "name": "Beauty", "scale_min": 1, "scale_max": 10, "weight": 1.0, "sort_order": 0}])
 
-# 5 Submissions, fully reviewed
-for i in range(5):
-    res = sb.table("submissions").insert({
+# 5 Submissions, fully reviewed by J1
+e2_subs = [
+    {
+        "id": seed_id(EVENT2_ID, "submission", f"Design Project {i+1}"),
         "event_id": EVENT2_ID,
         "participant_id": PARTICIPANTS[i], # Reuse participants
         "status": "submitted",
         "form_data": json.dumps({"Title": f"Design Project {i+1}"})
-    }).execute()
-    sid = res.data[0]["id"]
-    # J1 reviewed all
-    sb.table("reviews").insert({"submission_id": sid, "judge_id": JUDGES[0], "event_id": EVENT2_ID, "scores": json.dumps({}), "notes": "Winner candidate."}).execute()
+    }
+    for i in range(5)
+]
+bulk_upsert("submissions", e2_subs)
+bulk_upsert(
+    "reviews",
+    [{"submission_id": sub["id"], "judge_id": JUDGES[0], "event_id": EVENT2_ID, "scores": json.dumps({}), "notes": "Winner candidate."} for sub in e2_subs],
+    on_conflict="submission_id,judge_id",
+)
 
 log("Seeded completed event")
 
@@ -0,0 +1,28 @@
+"""
+Test setup: the app reads its settings (and builds its clients) at import
+time, so placeholder credentials are set before any app module loads.
+No test talks to Supabase; database access is replaced per test.
+"""
+
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test.service.key")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test-jwt-secret")
+
+from fakes import FakeDB  # noqa: E402
+
+
+@pytest.fixture
+def fake_db(monkeypatch) -> FakeDB:
+    """An empty FakeDB patched in as `db` wherever an app module imported it."""
+    from app.supabase_client import db as real_db
+
+    fake = FakeDB()
+    for name, module in list(sys.modules.items()):
+        if name.startswith("app") and getattr(module, "db", None) is real_db:
+            monkeypatch.setattr(module, "db", fake)
+    return fake
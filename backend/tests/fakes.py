@@ -0,0 +1,183 @@
+"""
+In-memory stand-in for the async PostgREST client (`app.supabase_client.db`).
+
+Tables hold plain row dicts. Column names used in select/filter/order are
+checked against the schema in db/migrations, so a query naming a column
+that doesn't exist fails here the way PostgREST would reject it.
+Embedded resources (`rel(...)`) are not resolved. Updates bump
+`updated_at` where the table has one, and the per-event change version
+(`event_change_version` RPC), as the migrations' triggers do.
+"""
+
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+MIGRATIONS = Path(__file__).resolve().parents[2] / "db" / "migrations"
+
+
+def load_schema(path: Path = MIGRATIONS) -> dict[str, set[str]]:
+    """Table -> column names, from CREATE TABLE and ALTER TABLE ... ADD COLUMN."""
+    schema: dict[str, set[str]] = {}
+    for sql_file in sorted(path.glob("*.sql")):
+        sql = re.sub(r"--[^\n]*", "", sql_file.read_text())
+        for table, body in re.findall(
+            r"CREATE TABLE (?:IF NOT EXISTS )?(\w+) \((.*?)\n\);", sql, re.S,
+        ):
+            columns = schema.setdefault(table, set())
+            columns.update(re.findall(r"^\s*([a-z_]\w*)\s+[A-Z]", body, re.M))
+        for table, body in re.findall(r"ALTER TABLE (\w+)(.*?);", sql, re.S):
+            schema.setdefault(table, set()).update(
+                re.findall(r"ADD COLUMN (?:IF NOT EXISTS )?(\w+)", body)
+            )
+    return schema
+
+
+SCHEMA = load_schema()
+
+
+def _split_select(columns: str) -> list[str]:
+    """Top-level comma split, so embedded `rel(a, b)` stays one item."""
+    items, depth, current = [], 0, ""
+    for ch in columns:
+        if ch == "," and depth == 0:
+            items.append(current.strip())
+            current = ""
+            continue
+        depth += ch == "("
+        depth -= ch == ")"
+        current += ch
+    if current.strip():
+        items.append(current.strip())
+    return items
+
+
+class FakeQuery:
+    def __init__(self, db: "FakeDB", table: str):
+        if table not in SCHEMA:
+            raise AssertionError(f"unknown table {table}")
+        self.db = db
+        self.table = table
+        self.columns: list[str] | None = None
+        self.filters = []
+        self.ordering: list[tuple[str, bool]] = []
+        self.window: tuple[int, int] | None = None
+        self.changes: dict | None = None
+
+    def _check(self, column: str):
+        if column not in SCHEMA[self.table]:
+            raise AssertionError(f"column {self.table}.{column} does not exist")
+
+    def select(self, columns: str = "*", count=None):
+        self.columns = []
+        for item in _split_select(columns):
+            if item == "*" or "(" in item:
+                continue  # all columns / embedded resource
+            self._check(item)
+            self.columns.append(item)
+        if "*" in _split_select(columns):
+            self.columns = None
+        return self
+
+    def update(self, changes: dict):
+        for column in changes:
+            self._check(column)
+        self.changes = changes
+        return self
+
+    def eq(self, column, value):
+        self._check(column)
+        self.filters.append(lambda r: r.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        self._check(column)
+        values = list(values)
+        self.filters.append(lambda r: r.get(column) in values)
+        return self
+
+    def or_(self, filters: str):
+        """`col.op.value,...` with eq, gt, lt, is.null and nested and(...)."""
+        self.filters.append(self._any(filters))
+        return self
+
+    def _any(self, filters: str):
+        tests = [self._condition(part) for part in _split_select(filters)]
+        return lambda r: any(t(r) for t in tests)
+
+    def _condition(self, part: str):
+        if part.startswith("and(") and part.endswith(")"):
+            tests = [self._condition(p) for p in _split_select(part[4:-1])]
+            return lambda r: all(t(r) for t in tests)
+        column, op, value = part.split(".", 2)
+        self._check(column)
+        value = value.strip('"')
+        if op == "eq":
+            return lambda r: str(r.get(column)) == value
+        if op == "gt":
+            return lambda r: r.get(column) is not None and str(r[column]) > value
+        if op == "lt":
+            return lambda r: r.get(column) is not None and str(r[column]) < value
+        if op == "is" and value == "null":
+            return lambda r: r.get(column) is None
+        raise AssertionError(f"unsupported or_ filter {part}")
+
+    def order(self, column, desc=False):
+        self._check(column)
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, n):
+        self.window = (0, n)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end - start + 1)
+        return self
+
+    async def execute(self):
+        self.db.queries.append(self.table)
+        rows = [r for r in self.db.tables.get(self.table, []) if all(f(r) for f in self.filters)]
+        if self.changes is not None:
+            for row in rows:
+                row.update(self.changes)
+                if "updated_at" in SCHEMA[self.table]:
+                    row["updated_at"] = datetime.now(timezone.utc).isoformat()
+            key = "id" if self.table == "events" else "event_id"
+            for event_id in {row.get(key) for row in rows} - {None}:
+                self.db.bump(event_id)
+        for column, desc in reversed(self.ordering):
+            rows.sort(key=lambda r: r.get(column), reverse=desc)
+        if self.window:
+            start, n = self.window
+            rows = rows[start:start + n]
+        if self.columns is not None:
+            rows = [{c: r.get(c) for c in self.columns} for r in rows]
+        return SimpleNamespace(data=[dict(r) for r in rows], count=len(rows))
+
+
+class FakeDB:
+    """Replaces the `db` singleton in the modules under test."""
+
+    def __init__(self, **tables: list[dict]):
+        self.tables = tables
+        self.queries: list[str] = []
+        self.versions: dict[str, int] = {}
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def bump(self, event_id: str):
+        """Record a write to the event, like the event_versions triggers."""
+        self.versions[event_id] = self.versions.get(event_id, 0) + 1
+
+    def rpc(self, name: str, params: dict):
+        if name != "event_change_version":
+            raise AssertionError(f"unknown rpc {name}")
+
+        async def execute():
+            self.queries.append(f"rpc:{name}")
+            return SimpleNamespace(data=self.versions.get(params["p_event_id"], 0))
+
+        return SimpleNamespace(execute=execute)
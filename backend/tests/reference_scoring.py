@@ -0,0 +1,170 @@
+"""
+Reference (pre-vectorization, pre-engine) scoring loops, reduced to their
+pure computation, and a generator of random events to compare against.
+"""
+
+import random
+from statistics import mean, stdev
+
+
+# ── Reference implementations ──
+
+def reference_leaderboard(criteria, submissions, reviews):
+    review_map: dict[str, list] = {}
+    for review in reviews:
+        review_map.setdefault(review["submission_id"], []).append(review)
+
+    leaderboard = []
+    for sid, project_name in submissions:
+        sub_reviews = review_map.get(sid, [])
+        if not sub_reviews:
+            continue
+        criteria_scores = {}
+        for crit in criteria:
+            scores = [
+                float(r["scores"].get(crit["id"], 0))
+                for r in sub_reviews
+                if crit["id"] in r["scores"]
+            ]
+            if scores:
+                criteria_scores[crit["id"]] = {
+                    "criterion_name": crit["name"],
+                    "average": round(mean(scores), 2),
+                    "min_score": min(scores),
+                    "max_score": max(scores),
+                    "weight": crit.get("weight", 1.0),
+                }
+        total_weight = sum(c.get("weight", 1.0) for c in criteria)
+        weighted_score = (
+            sum(cs["average"] * cs["weight"] for cs in criteria_scores.values()) / total_weight
+            if total_weight > 0
+            else 0
+        )
+        leaderboard.append({
+            "submission_id": sid,
+            "project_name": project_name,
+            "weighted_score": round(weighted_score, 2),
+            "criteria_scores": criteria_scores,
+            "review_count": len(sub_reviews),
+        })
+    leaderboard.sort(key=lambda x: x["weighted_score"], reverse=True)
+    for i, entry in enumerate(leaderboard):
+        entry["rank"] = i + 1
+    return leaderboard
+
+
+def reference_avg_score(reviews):
+    all_scores = [float(s) for r in reviews for s in r["scores"].values()]
+    return round(mean(all_scores), 2) if all_scores else None
+
+
+def reference_bias_report(reviews, judge_names):
+    judge_scores: dict[str, list[float]] = {}
+    all_scores: list[float] = []
+    for review in reviews:
+        scores = [float(s) for s in review["scores"].values()]
+        judge_scores.setdefault(review["judge_id"], []).extend(scores)
+        all_scores.extend(scores)
+    if not all_scores:
+        return []
+
+    event_avg = mean(all_scores)
+    event_std = stdev(all_scores) if len(all_scores) > 1 else 0
+    report = []
+    for jid, scores in judge_scores.items():
+        judge_avg = mean(scores)
+        deviation = judge_avg - event_avg
+        report.append({
+            "judge_id": jid,
+            "judge_name": judge_names.get(jid, "Unknown"),
+            "avg_score_given": round(judge_avg, 2),
+            "event_avg": round(event_avg, 2),
+            "deviation": round(deviation, 2),
+            "is_outlier": abs(deviation) > (1.5 * event_std) if event_std > 0 else False,
+        })
+    report.sort(key=lambda x: abs(x["deviation"]), reverse=True)
+    return report
+
+
+def reference_aggregate(criteria, submissions_with_reviews):
+    weight_sum = sum(c.get("weight", 1.0) for c in criteria)
+    leaderboard, all_totals, outliers = [], [], []
+    for sub in submissions_with_reviews:
+        reviews = sub.get("reviews", [])
+        if not reviews:
+            continue
+        crit_averages, crit_all_scores = {}, {}
+        for crit in criteria:
+            found = [float(r["scores"][crit["id"]]) for r in reviews if r["scores"].get(crit["id"]) is not None]
+            if found:
+                crit_averages[crit["id"]] = round(mean(found), 2)
+                crit_all_scores[crit["id"]] = found
+        weighted_total = 0.0
+        for crit in criteria:
+            weighted_total += crit_averages.get(crit["id"], 0) * crit.get("weight", 1.0)
+        total_score = round(weighted_total / weight_sum, 2) if weight_sum else 0
+        leaderboard.append({
+            "submission_id": sub["id"],
+            "project_name": sub.get("project_name", "Unknown"),
+            "total_score": total_score,
+            "criteria_averages": crit_averages,
+            "review_count": len(reviews),
+        })
+        all_totals.append(total_score)
+        for crit_id, scores_list in crit_all_scores.items():
+            if len(scores_list) < 2:
+                continue
+            avg = mean(scores_list)
+            for rev in reviews:
+                s = rev["scores"].get(crit_id)
+                if s is not None and abs(float(s) - avg) > 2:
+                    outliers.append({
+                        "judge_id": rev.get("judge_id", ""),
+                        "submission_id": sub["id"],
+                        "criterion_id": crit_id,
+                        "judge_score": float(s),
+                        "mean_score": round(avg, 2),
+                    })
+    leaderboard.sort(key=lambda x: x["total_score"], reverse=True)
+    for i, entry in enumerate(leaderboard):
+        entry["rank"] = i + 1
+    return {
+        "leaderboard": leaderboard,
+        "outliers": outliers,
+        "statistics": {
+            "avg_total": round(mean(all_totals), 2) if all_totals else 0,
+            "highest": max(all_totals) if all_totals else 0,
+            "lowest": min(all_totals) if all_totals else 0,
+        },
+    }
+
+
+# ── Random events ──
+
+def random_score(rng: random.Random) -> float:
+    # Mix of whole, half and arbitrary 1-2 decimal scores, which is what
+    # pushes means onto 2-decimal rounding boundaries
+    return round(rng.uniform(1, 10), rng.choice([0, 1, 1, 2]))
+
+
+def random_event(seed: int, integral: bool = False):
+    """Random event; integral=True gives whole-number int scores, the common case."""
+    rng = random.Random(seed)
+    criteria = [
+        {"id": f"c{i}", "name": f"Criterion {i}", "weight": rng.choice([1.0, 0.5, 1.5, 2.0, 0.3])}
+        for i in range(rng.randint(1, 5))
+    ]
+    submissions = [(f"s{i}", f"Project {i}") for i in range(rng.randint(1, 12))]
+    judges = [f"j{i}" for i in range(rng.randint(1, 6))]
+    reviews = []
+    for sid, _ in submissions:
+        for jid in rng.sample(judges, rng.randint(0, len(judges))):
+            scores = {
+                c["id"]: rng.randint(0, 10) if integral else random_score(rng)
+                for c in criteria
+                if rng.random() < 0.9
+            }
+            if scores:
+                reviews.append({"submission_id": sid, "judge_id": jid, "scores": scores})
+    rng.shuffle(reviews)
+    return criteria, submissions, judges, reviews
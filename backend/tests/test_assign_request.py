@@ -0,0 +1,35 @@
+"""AssignJudgesRequest mode defaults and the use_ai / incremental conflict."""
+
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.assignment import AssignJudgesRequest
+from app.utils.dependencies import require_organizer
+
+
+def test_default_mode_is_incremental():
+    assert AssignJudgesRequest().mode == "incremental"
+
+
+def test_use_ai_without_mode_means_replace():
+    assert AssignJudgesRequest(use_ai=True).mode == "replace"
+
+
+def test_explicit_mode_is_kept():
+    assert AssignJudgesRequest(use_ai=True, mode="incremental").mode == "incremental"
+    assert AssignJudgesRequest(mode="replace").mode == "replace"
+
+
+def test_use_ai_with_incremental_is_rejected(fake_db):
+    app.dependency_overrides[require_organizer] = lambda: {"id": "o", "role": "organizer"}
+    try:
+        client = TestClient(app)
+        response = client.post(
+            f"/api/v1/archestra/assign-judges/{uuid.uuid4()}",
+            json={"use_ai": True, "mode": "incremental"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 400
@@ -0,0 +1,207 @@
+"""
+Judge assignment: balance, exclusions and capacity for the full solver,
+and the minimal-change guarantees of plan_incremental.
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from app.services.assignment_solver import check_assignment, plan_incremental, solve_assignment
+
+CASES = 200
+
+
+def _judges(n: int) -> list[dict]:
+    return [{"id": f"j{i}"} for i in range(n)]
+
+
+def _subs(n: int, start: int = 0) -> list[dict]:
+    return [{"id": f"s{i}"} for i in range(start, start + n)]
+
+
+def _random_exclusions(rng, judges, submissions, k) -> set[tuple[str, str]]:
+    """Sparse conflicts: every submission keeps at least k eligible judges."""
+    exclusions = set()
+    for sub in submissions:
+        spare = len(judges) - k
+        for judge in rng.sample(judges, rng.randint(0, min(spare, 2))):
+            exclusions.add((judge["id"], sub["id"]))
+    return exclusions
+
+
+def _rows(assignments: list[dict]) -> list[dict]:
+    return [{**a, "id": f"a{i}"} for i, a in enumerate(assignments)]
+
+
+def _apply(existing: list[dict], plan: dict) -> list[dict]:
+    deleted = set(plan["delete_ids"])
+    rows = [r for r in existing if r["id"] not in deleted]
+    return rows + [{**a, "id": f"new{i}"} for i, a in enumerate(plan["insert"])]
+
+
+def _pairs(rows) -> list[tuple[str, str]]:
+    return [(r["judge_id"], r["submission_id"]) for r in rows]
+
+
+# ── solve_assignment ──
+
+@pytest.mark.parametrize("seed", range(CASES))
+def test_unconstrained_is_balanced(seed):
+    rng = random.Random(seed)
+    judges = _judges(rng.randint(1, 12))
+    submissions = _subs(rng.randint(0, 60))
+    k = rng.randint(1, len(judges))
+
+    result = solve_assignment(judges, submissions, k)
+
+    assert check_assignment(result["assignments"], judges, submissions, k) == []
+    assert result["unfilled"] == []
+    loads = result["judge_loads"]
+    assert max(loads.values()) - min(loads.values()) <= 1
+    assert sum(loads.values()) == len(submissions) * k
+
+
+@pytest.mark.parametrize("seed", range(CASES))
+def test_exclusions_are_honoured(seed):
+    rng = random.Random(seed)
+    judges = _judges(rng.randint(2, 10))
+    submissions = _subs(rng.randint(1, 40))
+    k = rng.randint(1, len(judges) - 1)
+    exclusions = _random_exclusions(rng, judges, submissions, k)
+
+    result = solve_assignment(judges, submissions, k, exclusions)
+
+    assert not set(_pairs(result["assignments"])) & exclusions
+    assert check_assignment(result["assignments"], judges, submissions, k, exclusions) == []
+
+
+def test_existing_load_is_evened_out():
+    judges = [{"id": "j0", "current_load": 4}, {"id": "j1"}, {"id": "j2"}]
+    result = solve_assignment(judges, _subs(8), 1)
+    assert result["judge_loads"] == {"j0": 0, "j1": 4, "j2": 4}
+    assert result["balance"]["spread"] == 0
+
+
+def test_capacity_limits_and_unfilled_report():
+    judges = [{"id": "j0", "max_load": 1}, {"id": "j1"}]
+    result = solve_assignment(judges, _subs(4), 2, max_load=3)
+
+    loads = Counter(a["judge_id"] for a in result["assignments"])
+    assert loads == {"j0": 1, "j1": 3}
+    assert sum(u["missing"] for u in result["unfilled"]) == 4
+
+
+def test_deterministic():
+    rng = random.Random(1)
+    judges, submissions = _judges(7), _subs(30)
+    exclusions = _random_exclusions(rng, judges, submissions, 3)
+    assert solve_assignment(judges, submissions, 3, exclusions) == solve_assignment(
+        judges, submissions, 3, exclusions,
+    )
+
+
+def test_check_assignment_reports_problems():
+    judges, submissions = _judges(2), _subs(2)
+    assignments = [
+        {"judge_id": "j0", "submission_id": "s0"},
+        {"judge_id": "j0", "submission_id": "s0"},
+        {"judge_id": "j1", "submission_id": "s1"},
+        {"judge_id": "jx", "submission_id": "s1"},
+    ]
+    problems = check_assignment(assignments, judges, submissions, 1, {("j1", "s1")})
+    assert any("duplicate" in p for p in problems)
+    assert any("excluded" in p for p in problems)
+    assert any("unknown" in p for p in problems)
+
+
+# ── plan_incremental ──
+
+@pytest.mark.parametrize("seed", range(CASES))
+def test_up_to_date_plan_is_empty(seed):
+    rng = random.Random(seed)
+    judges = _judges(rng.randint(2, 10))
+    submissions = _subs(rng.randint(1, 40))
+    k = rng.randint(1, len(judges))
+    exclusions = _random_exclusions(rng, judges, submissions, k)
+    existing = _rows(solve_assignment(judges, submissions, k, exclusions)["assignments"])
+
+    plan = plan_incremental(judges, submissions, existing, set(), k, exclusions)
+
+    assert plan["insert"] == [] and plan["delete_ids"] == []
+    assert plan["kept"] == len(existing)
+
+
+def test_late_submissions_only_add_rows():
+    judges = _judges(4)
+    existing = _rows(solve_assignment(judges, _subs(10), 2)["assignments"])
+    submissions = _subs(13)
+
+    plan = plan_incremental(judges, submissions, existing, set(), 2)
+
+    assert plan["delete_ids"] == []
+    assert {a["submission_id"] for a in plan["insert"]} == {"s10", "s11", "s12"}
+    final = _apply(existing, plan)
+    assert check_assignment(final, judges, submissions, 2) == []
+
+
+@pytest.mark.parametrize("seed", range(CASES))
+def test_changes_keep_locked_pairs_and_honour_exclusions(seed):
+    rng = random.Random(seed)
+    judges = _judges(rng.randint(3, 10))
+    submissions = _subs(rng.randint(1, 30))
+    k = rng.randint(1, len(judges) - 2)
+    existing = _rows(solve_assignment(judges, submissions, k)["assignments"])
+    locked = {pair for pair in _pairs(existing) if rng.random() < 0.3}
+
+    # The event moved on: a judge left, one joined, late entries, new conflicts
+    gone = rng.choice(judges)["id"]
+    judges = [j for j in judges if j["id"] != gone] + [{"id": "late-judge"}]
+    submissions = submissions + _subs(rng.randint(0, 5), start=len(submissions))
+    exclusions = _random_exclusions(rng, judges, submissions, k)
+
+    plan = plan_incremental(judges, submissions, existing, locked, k, exclusions)
+    final = _apply(existing, plan)
+    final_pairs = _pairs(final)
+
+    assert locked <= set(final_pairs)
+    assert len(final_pairs) == len(set(final_pairs))
+    assert not {p for p in final_pairs if p not in locked} & exclusions
+    assert not any(p[0] == gone for p in final_pairs if p not in locked)
+    per_sub = Counter(p[1] for p in final_pairs)
+    missing = {u["submission_id"]: u["missing"] for u in plan["unfilled"]}
+    for sub in submissions:
+        assert per_sub[sub["id"]] + missing.get(sub["id"], 0) >= k
+
+
+@pytest.mark.parametrize("seed", range(CASES))
+def test_new_judge_is_rebalanced_in(seed):
+    rng = random.Random(seed)
+    judges = _judges(rng.randint(1, 8))
+    submissions = _subs(rng.randint(5, 40))
+    k = rng.randint(1, len(judges))
+    existing = _rows(solve_assignment(judges, submissions, k)["assignments"])
+
+    judges = judges + [{"id": "late-judge"}]
+    plan = plan_incremental(judges, submissions, existing, set(), k)
+    final = _apply(existing, plan)
+
+    assert plan["rebalanced"]
+    assert check_assignment(final, judges, submissions, k) == []
+    loads = Counter(r["judge_id"] for r in final)
+    assert max(loads[j["id"]] for j in judges) - min(loads[j["id"]] for j in judges) <= 1
+    assert len(plan["insert"]) == len(plan["delete_ids"])  # moves only, coverage unchanged
+
+
+def test_lower_judges_per_submission_trims_unlocked_pairs():
+    judges, submissions = _judges(4), _subs(6)
+    existing = _rows(solve_assignment(judges, submissions, 3)["assignments"])
+    locked = set(_pairs(existing[::3]))  # one reviewed pair per submission
+
+    plan = plan_incremental(judges, submissions, existing, locked, 2)
+    final = _apply(existing, plan)
+
+    assert plan["insert"] == []
+    assert locked <= set(_pairs(final))
+    assert check_assignment(final, judges, submissions, 2) == []
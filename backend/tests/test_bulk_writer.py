@@ -0,0 +1,144 @@
+"""BulkWriter chunking, ordering, concurrency and per-method retry policy."""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+from app.utils.bulk_writer import BulkWriter
+
+
+class ScriptedClient:
+    """
+    Records each request and answers with its rows after a random delay,
+    so chunks complete out of order. `failures` holds exceptions raised by
+    the next requests, in order.
+    """
+
+    def __init__(self, failures=(), seed: int = 0):
+        self.failures = list(failures)
+        self.requests: list[dict] = []
+        self.in_flight = 0
+        self.peak = 0
+        self._rng = random.Random(seed)
+
+    def table(self, name: str):
+        return _Request(self, name)
+
+
+class _Request:
+    def __init__(self, client: ScriptedClient, table: str):
+        self.client = client
+        self.call = {"table": table, "filters": []}
+
+    def insert(self, rows, returning=None):
+        self.call.update(method="insert", rows=rows)
+        return self
+
+    def upsert(self, rows, on_conflict="", ignore_duplicates=False, returning=None):
+        self.call.update(method="upsert", rows=rows, on_conflict=on_conflict)
+        return self
+
+    def delete(self, returning=None):
+        self.call["method"] = "delete"
+        return self
+
+    def in_(self, column, values):
+        self.call["rows"] = values
+        self.call["filters"].append((column, "in", tuple(values)))
+        return self
+
+    def eq(self, column, value):
+        self.call["filters"].append((column, "eq", value))
+        return self
+
+    async def execute(self):
+        client = self.client
+        client.requests.append(self.call)
+        client.in_flight += 1
+        client.peak = max(client.peak, client.in_flight)
+        try:
+            await asyncio.sleep(client._rng.random() / 1000)
+            if client.failures:
+                raise client.failures.pop(0)
+            return SimpleNamespace(data=list(self.call["rows"]))
+        finally:
+            client.in_flight -= 1
+
+
+def _writer(client, **kwargs) -> BulkWriter:
+    return BulkWriter(client, retry_backoff=0, **kwargs)
+
+
+def _rows(n: int) -> list[dict]:
+    return [{"n": i} for i in range(n)]
+
+
+def test_chunks_and_returns_rows_in_order():
+    client = ScriptedClient(seed=3)
+    result = asyncio.run(
+        _writer(client, chunk_size=100, concurrency=3).insert("reviews", _rows(1234), returning=True)
+    )
+
+    assert (result.rows, result.chunks, result.retries) == (1234, 13, 0)
+    assert sorted(len(r["rows"]) for r in client.requests) == [34] + [100] * 12
+    assert result.data == _rows(1234)
+    assert client.peak <= 3
+
+
+def test_empty_input_sends_nothing():
+    client = ScriptedClient()
+    result = asyncio.run(_writer(client).upsert("reviews", [], on_conflict="id"))
+    assert (result.rows, result.chunks, client.requests) == (0, 0, [])
+
+
+def test_insert_is_not_retried_once_sent():
+    client = ScriptedClient(failures=[httpx.ReadTimeout("slow")])
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(_writer(client).insert("reviews", _rows(10)))
+    assert len(client.requests) == 1
+
+
+def test_insert_is_retried_if_never_sent():
+    client = ScriptedClient(failures=[httpx.ConnectError("refused")])
+    result = asyncio.run(_writer(client).insert("reviews", _rows(10)))
+    assert result.retries == 1 and len(client.requests) == 2
+
+
+def test_upsert_retries_transient_errors():
+    client = ScriptedClient(failures=[
+        httpx.ReadTimeout("slow"),
+        APIError({"code": "40001", "message": "could not serialize access"}),
+    ])
+    result = asyncio.run(_writer(client).upsert("judge_assignments", _rows(10), on_conflict="judge_id,submission_id"))
+    assert result.retries == 2 and len(client.requests) == 3
+
+
+def test_upsert_does_not_retry_constraint_errors():
+    client = ScriptedClient(failures=[APIError({"code": "23503", "message": "foreign key violation"})])
+    with pytest.raises(APIError):
+        asyncio.run(_writer(client).upsert("judge_assignments", _rows(10), on_conflict="id"))
+    assert len(client.requests) == 1
+
+
+def test_gives_up_after_max_retries():
+    client = ScriptedClient(failures=[httpx.ReadTimeout("slow")] * 3)
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(_writer(client, max_retries=2).upsert("reviews", _rows(10), on_conflict="id"))
+    assert len(client.requests) == 3
+
+
+def test_delete_in_chunks_with_filters():
+    client = ScriptedClient()
+    ids = [f"a{i}" for i in range(250)]
+    result = asyncio.run(
+        _writer(client, chunk_size=100).delete_in("judge_assignments", "id", ids, filters={"status": "pending"})
+    )
+
+    assert result.chunks == 3
+    deleted = [value for r in client.requests for value in r["filters"][0][2]]
+    assert sorted(deleted) == sorted(ids)
+    assert all(r["filters"][1] == ("status", "eq", "pending") for r in client.requests)
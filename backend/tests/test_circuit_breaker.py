@@ -0,0 +1,112 @@
+"""CircuitBreaker state machine: opening, recovery, half-open probes."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import circuit_breaker
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Manual clock for the breaker module; advance with clock.now += seconds."""
+    fake = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=lambda: fake.now))
+    return fake
+
+
+def _tripped(clock, **kwargs) -> CircuitBreaker:
+    breaker = CircuitBreaker("agent", failure_threshold=3, recovery_timeout=30.0, **kwargs)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_at_failure_threshold(clock):
+    breaker = CircuitBreaker("agent", failure_threshold=3, recovery_timeout=30.0)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats() == {
+        "state": OPEN, "consecutive_failures": 3, "rejected_calls": 1, "retry_in_seconds": 30.0,
+    }
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("agent", failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_stays_open_until_recovery_timeout(clock):
+    breaker = _tripped(clock)
+
+    clock.now += 29.9
+    assert breaker.state == OPEN and not breaker.allow()
+    assert breaker.stats()["retry_in_seconds"] == 0.1
+
+    clock.now += 0.1
+    assert breaker.state == HALF_OPEN
+    assert breaker.stats()["retry_in_seconds"] is None
+
+
+def test_half_open_allows_a_single_probe(clock):
+    breaker = _tripped(clock)
+    clock.now += 30
+
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert all(breaker.allow() for _ in range(5))
+
+
+def test_failed_probe_reopens_for_another_timeout(clock):
+    breaker = _tripped(clock)
+    clock.now += 30
+
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN and not breaker.allow()
+    clock.now += 29
+    assert breaker.state == OPEN
+    clock.now += 1
+    assert breaker.state == HALF_OPEN and breaker.allow()
+
+
+def test_abandoned_call_is_not_a_failure(clock):
+    breaker = CircuitBreaker("agent", failure_threshold=2)
+    for _ in range(5):
+        assert breaker.allow()
+        breaker.record_abandoned()
+
+    assert breaker.state == CLOSED
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_abandoned_probe_frees_its_slot(clock):
+    breaker = _tripped(clock)
+    clock.now += 30
+
+    assert breaker.allow()
+    breaker.record_abandoned()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
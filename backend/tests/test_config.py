@@ -0,0 +1,22 @@
+"""ARCHESTRA_AGENT_TIMEOUTS parsing: good entries kept, bad ones skipped."""
+
+import logging
+
+from app.config import Settings
+
+
+def _timeouts(raw: str) -> dict[str, float]:
+    return Settings(archestra_agent_timeouts=raw).archestra_agent_timeout_map
+
+
+def test_parses_overrides():
+    assert _timeouts(" ingest = 10, feedback=90.5 ,") == {"ingest": 10.0, "feedback": 90.5}
+    assert _timeouts("") == {}
+
+
+def test_malformed_entries_are_skipped_with_a_warning(caplog):
+    with caplog.at_level(logging.WARNING, logger="app.config"):
+        timeouts = _timeouts("ingest=10,feedback=ninety,=5,judge,scoring=-1,review=nan,chat=inf")
+
+    assert timeouts == {"ingest": 10.0}
+    assert len(caplog.records) == 6
@@ -0,0 +1,24 @@
+"""The dashboard reuses the event metadata the router already loaded."""
+
+import asyncio
+import uuid
+
+from app.services.event_cache import event_cache
+from app.services.scoring_service import scoring_service
+
+
+def test_dashboard_does_not_refetch_the_event(fake_db):
+    event = {"id": str(uuid.uuid4()), "organizer_id": "o", "status": "judging", "judges_per_submission": 2, "name": "E"}
+    fake_db.tables.update({
+        "events": [event], "criteria": [], "submissions": [], "reviews": [],
+        "form_fields": [], "event_judges": [], "judge_assignments": [],
+    })
+
+    # As the router does (get_owned), which also primes this worker's cache
+    event = asyncio.run(event_cache.get(event["id"]))
+    fake_db.queries.clear()
+    dashboard = asyncio.run(scoring_service.get_full_dashboard(event["id"], event=event))
+
+    assert dashboard["event"] is event
+    assert "events" not in fake_db.queries
+    assert dashboard["stats"]["total_submissions"] == 0
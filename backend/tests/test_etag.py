@@ -0,0 +1,63 @@
+"""Conditional GET: ETags depend only on the event version, and never bypass authorization."""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.dependencies import require_judge, require_organizer
+
+
+@pytest.fixture
+def client(fake_db):
+    event_id = str(uuid.uuid4())
+    fake_db.tables.update({
+        "events": [{"id": event_id, "status": "judging", "organizer_id": "o", "judges_per_submission": 2}],
+        "criteria": [], "submissions": [], "reviews": [], "form_fields": [],
+        "event_judges": [{"id": "ej", "event_id": event_id, "judge_id": "j"}],
+        "judge_assignments": [],
+    })
+    fake_db.versions[event_id] = 7
+    app.dependency_overrides[require_organizer] = lambda: {"id": "o", "role": "organizer"}
+    app.dependency_overrides[require_judge] = lambda: {"id": "j", "role": "judge"}
+    try:
+        yield TestClient(app), event_id
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_etag_is_stable_until_the_version_moves(client, fake_db, monkeypatch):
+    from app.services import event_cache as cache_module
+    from app.services.leaderboard_engine import LeaderboardEngine
+    from app.services import scoring_service as scoring_module
+
+    http, event_id = client
+
+    async def owned(event_id, user_id):
+        return fake_db.tables["events"][0]
+    monkeypatch.setattr(cache_module.event_cache, "get_owned", owned)
+
+    url = f"/api/v1/events/{event_id}/leaderboard"
+    etag = http.get(url).headers["ETag"]
+
+    # Another worker (a fresh engine) answers with the same tag
+    monkeypatch.setattr(scoring_module, "leaderboard_engine", LeaderboardEngine())
+    assert http.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    fake_db.bump(event_id)
+    response = http.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["ETag"] != etag
+
+
+def test_wildcard_is_not_a_match(client):
+    http, event_id = client
+    response = http.get(f"/api/v1/judges/queue/{event_id}?format=lean", headers={"If-None-Match": "*"})
+    assert response.status_code == 200
+
+
+def test_judge_check_runs_before_304(client):
+    http, _ = client
+    other_event = str(uuid.uuid4())
+    response = http.get(f"/api/v1/judges/queue/{other_event}", headers={"If-None-Match": "*"})
+    assert response.status_code == 403
@@ -0,0 +1,21 @@
+"""pyarrow is optional: without it the export is refused up front with a 501."""
+
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.export_service import export_service
+
+
+def test_missing_pyarrow_is_501(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(HTTPException) as exc:
+        export_service.check_format("parquet")
+    assert exc.value.status_code == 501
+
+
+def test_unknown_format_is_400():
+    with pytest.raises(HTTPException) as exc:
+        export_service.check_format("xlsx")
+    assert exc.value.status_code == 400
@@ -0,0 +1,27 @@
+"""Feedback content hash: what invalidates stored feedback and what doesn't."""
+
+from app.services.feedback_service import feedback_content_hash
+
+CRITERIA = [{"id": "c1", "name": "Impact", "scale_min": 1, "scale_max": 10, "weight": 1.0}]
+REVIEWS = [{"judge_id": "j1", "scores": {"c1": 7}, "notes": "Solid"}]
+
+
+def _hash(form_data: dict, reviews=REVIEWS) -> str:
+    return feedback_content_hash({"form_data": form_data}, reviews, CRITERIA)
+
+
+def test_late_ingest_validation_keeps_the_hash():
+    before = _hash({"f1": "Project"})
+    after = _hash({"f1": "Project", "_ai_validation": {"valid": True, "warnings": []}})
+    assert before == after
+
+
+def test_answers_and_reviews_change_the_hash():
+    base = _hash({"f1": "Project"})
+    assert _hash({"f1": "Other project"}) != base
+    assert _hash({"f1": "Project"}, [{**REVIEWS[0], "scores": {"c1": 8}}]) != base
+
+
+def test_review_order_does_not_matter():
+    reviews = REVIEWS + [{"judge_id": "j2", "scores": {"c1": 4}, "notes": None}]
+    assert _hash({"f1": "P"}, reviews) == _hash({"f1": "P"}, reviews[::-1])
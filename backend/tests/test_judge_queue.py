@@ -0,0 +1,85 @@
+"""Lean, windowed judge queue, run against the real column list (FakeDB)."""
+
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.review_service import review_service
+
+
+def _seed(fake_db, n_items: int = 10, n_completed: int = 4):
+    event_id = str(uuid.uuid4())
+    fields = [
+        {
+            "id": f"f{i}", "event_id": event_id, "label": f"Field {i}", "field_type": "short_text",
+            "sort_order": i, "is_required": False, "options": None, "validation": None,
+        }
+        for i in range(3)
+    ]
+    fake_db.tables.update({
+        "events": [{"id": event_id, "status": "judging", "organizer_id": "o", "judges_per_submission": 2}],
+        "form_fields": fields,
+        "event_judges": [{"id": "ej", "event_id": event_id, "judge_id": "j"}],
+        "judge_assignments": [
+            {
+                "id": f"a{i}", "event_id": event_id, "judge_id": "j", "submission_id": f"s{i}",
+                "status": "completed" if i < n_completed else "pending", "assigned_at": f"2026-01-01T00:00:{i:02d}",
+            }
+            for i in range(n_items)
+        ],
+        "submissions": [
+            {
+                "id": f"s{i}", "event_id": event_id, "status": "submitted",
+                "created_at": f"2026-01-01T00:00:{i:02d}",
+                # f1 is stored under its label, as older submissions were
+                "form_data": {"f0": f"Project {i}", "Field 1": "by label"},
+            }
+            for i in range(n_items)
+        ],
+        "reviews": [
+            {"id": f"r{i}", "event_id": event_id, "judge_id": "j", "submission_id": f"s{i}", "scores": '{"c": 5}'}
+            for i in range(n_completed)
+        ],
+    })
+    return event_id
+
+
+def test_default_window_starts_before_resume_position(fake_db):
+    event_id = _seed(fake_db)
+    queue = asyncio.run(review_service.get_judge_queue_window("j", event_id))
+
+    assert (queue["total_assigned"], queue["completed"], queue["remaining"]) == (10, 4, 6)
+    assert queue["current_index"] == 4
+    assert (queue["offset"], queue["limit"], queue["has_more"]) == (3, 5, True)
+    assert [f["id"] for f in queue["form_fields"]] == ["f0", "f1", "f2"]
+    assert len(queue["queue"]) == 10
+
+    first = queue["items"][0]
+    assert [item["index"] for item in queue["items"]] == [3, 4, 5, 6, 7]
+    assert first["values"] == {"f0": "Project 3", "f1": "by label", "f2": None}
+    assert first["created_at"] == "2026-01-01T00:00:03"
+    assert first["review"]["scores"] == {"c": 5}
+    assert first["is_completed"] and not queue["items"][1]["is_completed"]
+    assert "form_fields" not in first
+
+
+def test_explicit_window_at_end(fake_db):
+    event_id = _seed(fake_db)
+    queue = asyncio.run(review_service.get_judge_queue_window("j", event_id, offset=8, limit=5))
+    assert [item["index"] for item in queue["items"]] == [8, 9]
+    assert not queue["has_more"]
+
+
+def test_all_completed_resumes_at_last(fake_db):
+    event_id = _seed(fake_db, n_items=3, n_completed=3)
+    queue = asyncio.run(review_service.get_judge_queue_window("j", event_id))
+    assert queue["current_index"] == 2
+
+
+def test_not_a_judge(fake_db):
+    event_id = _seed(fake_db)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(review_service.get_judge_queue_window("someone-else", event_id))
+    assert exc.value.status_code == 403
@@ -0,0 +1,76 @@
+"""Local JWT verification: forged tokens stay local, JWKS failures back off."""
+
+import asyncio
+import time
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+import app.utils.dependencies as dependencies
+import app.utils.jwt_verifier as jwt_verifier_module
+from app.utils.jwt_verifier import InvalidToken, JWTVerifier, UnverifiableToken
+
+
+def _token(secret: str, **claims) -> str:
+    payload = {"sub": "user-1", "aud": "authenticated", "exp": int(time.time()) + 60, **claims}
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+def test_valid_hs256_token():
+    verifier = JWTVerifier()
+    assert asyncio.run(verifier.verify(_token(verifier.secret))) == "user-1"
+
+
+def test_bad_signature_is_invalid():
+    verifier = JWTVerifier()
+    with pytest.raises(InvalidToken):
+        asyncio.run(verifier.verify(_token("not-the-secret")))
+
+
+def test_forged_token_never_reaches_remote_check(monkeypatch):
+    async def remote(token):
+        raise AssertionError("remote verification called")
+
+    monkeypatch.setattr(dependencies, "_verify_remote", remote)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(dependencies.verify_token(_token("forged")))
+    assert exc.value.status_code == 401
+
+
+class _FailingClient:
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get(self, *args, **kwargs):
+        type(self).calls += 1
+        raise jwt_verifier_module.httpx.ConnectError("unreachable")
+
+
+def test_failed_jwks_fetch_backs_off(monkeypatch):
+    _FailingClient.calls = 0
+    monkeypatch.setattr(jwt_verifier_module.httpx, "AsyncClient", _FailingClient)
+    verifier = JWTVerifier()
+
+    async def run():
+        for _ in range(5):
+            with pytest.raises(UnverifiableToken):
+                await verifier._get_signing_key("kid-1")
+
+    asyncio.run(run())
+    assert _FailingClient.calls == 1
+
+    # Once the backoff has passed, the next request tries again
+    verifier._retry_at = 0.0
+    with pytest.raises(UnverifiableToken):
+        asyncio.run(verifier._get_signing_key("kid-1"))
+    assert _FailingClient.calls == 2
+    assert verifier._failures == 2
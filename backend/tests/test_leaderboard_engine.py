@@ -0,0 +1,139 @@
+"""
+The incremental leaderboard must stay identical to a from-scratch
+computation (reference_scoring.reference_leaderboard) however reviews are
+created and edited.
+"""
+
+import asyncio
+import random
+import uuid
+
+import pytest
+
+from app.services.leaderboard_engine import LeaderboardEngine, _EventBoard
+from reference_scoring import random_event, random_score, reference_leaderboard
+
+CASES = 300
+
+
+def _edit_reviews(seed: int, criteria, submissions, judges, reviews, board):
+    """Apply random creates and re-submissions to board and review list alike."""
+    rng = random.Random(seed + 10_000)
+    current = {(r["submission_id"], r["judge_id"]): r for r in reviews}
+    for _ in range(rng.randint(1, 40)):
+        sid = rng.choice(submissions)[0]
+        jid = rng.choice(judges)
+        # A re-submission may drop criteria the earlier review scored
+        scores = {c["id"]: random_score(rng) for c in criteria if rng.random() < 0.8}
+        if not scores:
+            scores = {criteria[0]["id"]: random_score(rng)}
+        current[(sid, jid)] = {"submission_id": sid, "judge_id": jid, "scores": scores}
+        assert board.apply(sid, jid, scores)
+    return list(current.values())
+
+
+def _board(criteria, submissions, reviews) -> _EventBoard:
+    board = _EventBoard(criteria)
+    for sid, name in submissions:
+        board.add_submission(sid, name)
+    for review in reviews:
+        board.apply(review["submission_id"], review["judge_id"], review["scores"])
+    return board
+
+
+@pytest.mark.parametrize("seed", range(CASES))
+def test_board_matches_reference_after_edits(seed):
+    criteria, submissions, judges, reviews = random_event(seed)
+    board = _board(criteria, submissions, reviews)
+    assert board.entries() == reference_leaderboard(criteria, submissions, reviews)
+
+    final = _edit_reviews(seed, criteria, submissions, judges, reviews, board)
+    assert board.entries() == reference_leaderboard(criteria, submissions, final)
+
+
+def test_top_limit_is_prefix():
+    criteria, submissions, _, reviews = random_event(3)
+    board = _board(criteria, submissions, reviews)
+    assert board.entries(3) == board.entries()[:3]
+
+
+def test_unknown_submission_is_rejected():
+    criteria, submissions, _, reviews = random_event(5)
+    board = _board(criteria, submissions, reviews)
+    assert not board.apply("missing", "j0", {criteria[0]["id"]: 5})
+
+
+def _event_tables(event_id: str, seed: int):
+    criteria, submissions, _, reviews = random_event(seed)
+    name_field = {
+        "id": f"{event_id}-name", "event_id": event_id, "label": "Project name",
+        "field_type": "short_text", "sort_order": 0, "is_required": True,
+        "options": None, "validation": None,
+    }
+    return {
+        "events": [{"id": event_id, "status": "judging", "organizer_id": "o", "judges_per_submission": 2}],
+        "criteria": [{**c, "event_id": event_id, "sort_order": i} for i, c in enumerate(criteria)],
+        "submissions": [
+            {"id": sid, "event_id": event_id, "form_data": {name_field["id"]: name}}
+            for sid, name in submissions
+        ],
+        "reviews": [{**r, "event_id": event_id} for r in reviews],
+        "form_fields": [name_field],
+    }, criteria, submissions, reviews
+
+
+def test_engine_rebuilds_only_when_the_version_moves(fake_db):
+    event_id = str(uuid.uuid4())
+    tables, criteria, submissions, reviews = _event_tables(event_id, 11)
+    fake_db.tables.update(tables)
+    engine = LeaderboardEngine()
+
+    async def run():
+        assert await engine.top(event_id) == reference_leaderboard(criteria, submissions, reviews)
+        fetched = fake_db.queries.count("reviews")
+        assert await engine.top(event_id, 3) == reference_leaderboard(criteria, submissions, reviews)[:3]
+        assert fake_db.queries.count("reviews") == fetched
+
+        # A review written through another worker: only the version tells
+        sid, jid = submissions[0][0], "j-new"
+        scores = {c["id"]: 7.3 for c in criteria}
+        fake_db.tables["reviews"].append(
+            {"event_id": event_id, "submission_id": sid, "judge_id": jid, "scores": scores},
+        )
+        fake_db.bump(event_id)
+        expected = reference_leaderboard(
+            criteria, submissions, reviews + [{"submission_id": sid, "judge_id": jid, "scores": scores}],
+        )
+        assert await engine.top(event_id) == expected
+
+    asyncio.run(run())
+
+
+def test_snapshot_reviews_are_reused_at_their_version(fake_db):
+    event_id = str(uuid.uuid4())
+    tables, criteria, submissions, reviews = _event_tables(event_id, 12)
+    fake_db.tables.update(tables)
+    fake_db.versions[event_id] = 4
+    engine = LeaderboardEngine()
+
+    async def run():
+        entries = await engine.top(event_id, reviews=tables["reviews"], version=4)
+        assert entries == reference_leaderboard(criteria, submissions, reviews)
+        assert "reviews" not in fake_db.queries
+
+        # An older snapshot never replaces a newer board
+        assert await engine.top(event_id, reviews=[], version=3) == entries
+
+    asyncio.run(run())
+
+
+def test_verify_matches_from_scratch_reference(fake_db, caplog):
+    from app.services.scoring_service import scoring_service
+
+    event_id = str(uuid.uuid4())
+    tables, criteria, submissions, reviews = _event_tables(event_id, 13)
+    fake_db.tables.update(tables)
+
+    entries = asyncio.run(scoring_service.get_leaderboard(event_id, verify=True))
+    assert entries == reference_leaderboard(criteria, submissions, reviews)
+    assert "differs" not in caplog.text
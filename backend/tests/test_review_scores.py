@@ -0,0 +1,40 @@
+"""iter_review_scores pages by (submission_id, judge_id) keyset, not OFFSET."""
+
+import asyncio
+
+from app.services.scoring_service import scoring_service
+
+
+def _review(sid: str, jid: str) -> dict:
+    return {"event_id": "e", "submission_id": sid, "judge_id": jid, "scores": {"c": 5}, "submitted_at": "t"}
+
+
+def _collect(page_size: int, on_page=None) -> list[tuple[str, str]]:
+    async def run():
+        seen = []
+        async for score in scoring_service.iter_review_scores("e", ["c"], page_size=page_size):
+            seen.append((score["submission_id"], score["judge_id"]))
+            if on_page and len(seen) % page_size == 0:
+                on_page()
+        return seen
+
+    return asyncio.run(run())
+
+
+def test_every_review_once_in_key_order(fake_db):
+    fake_db.tables["reviews"] = [_review(f"s{i:03d}", f"j{j}") for i in range(97) for j in range(3)]
+    seen = _collect(page_size=20)
+    assert seen == sorted((r["submission_id"], r["judge_id"]) for r in fake_db.tables["reviews"])
+
+
+def test_reviews_written_mid_export_do_not_shift_pages(fake_db):
+    reviews = [_review(f"s{i:03d}", "j0") for i in range(50)]
+    fake_db.tables["reviews"] = list(reviews)
+
+    # Each page, a review sorting before the current position is written
+    inserted = iter(f"a{i:02d}" for i in range(100))
+    seen = _collect(page_size=10, on_page=lambda: fake_db.tables["reviews"].append(_review(next(inserted), "j0")))
+
+    original = [(r["submission_id"], "j0") for r in reviews]
+    assert [pair for pair in seen if pair in original] == original
+    assert len(seen) == len(set(seen))
@@ -0,0 +1,55 @@
+"""
+Review writes check the event status: a cached "closed" is final, an
+earlier cached status is re-read, and a cached "judging" is trusted only
+for judging_status_max_age_seconds.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.event_cache import event_cache
+from app.services.review_service import review_service
+
+
+def _event(fake_db, status: str) -> dict:
+    event = {"id": str(uuid.uuid4()), "organizer_id": "o", "status": status, "judges_per_submission": 2, "name": "E"}
+    fake_db.tables["events"] = [event]
+    asyncio.run(event_cache.get(event["id"]))  # Prime this worker's cache
+    return event
+
+
+def _reads(fake_db) -> int:
+    return fake_db.queries.count("events")
+
+
+def test_judging_opened_on_another_worker(fake_db):
+    event = _event(fake_db, "open")
+    event["status"] = "judging"
+    asyncio.run(review_service._require_judging(event["id"]))
+
+
+def test_recent_judging_status_is_trusted(fake_db):
+    event = _event(fake_db, "judging")
+    reads = _reads(fake_db)
+    asyncio.run(review_service._require_judging(event["id"]))
+    assert _reads(fake_db) == reads
+
+
+def test_judging_closed_on_another_worker(fake_db, monkeypatch):
+    event = _event(fake_db, "judging")
+    event["status"] = "closed"
+    monkeypatch.setattr(review_service, "_judging_max_age", 0.0)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(review_service._require_judging(event["id"]))
+    assert exc.value.status_code == 400
+
+
+def test_cached_closed_is_final(fake_db):
+    event = _event(fake_db, "closed")
+    reads = _reads(fake_db)
+    with pytest.raises(HTTPException):
+        asyncio.run(review_service._require_judging(event["id"]))
+    assert _reads(fake_db) == reads
@@ -0,0 +1,132 @@
+"""
+The vectorized scoring paths must produce exactly what the original
+per-review loops (reference_scoring) did.
+"""
+
+import asyncio
+import json
+import random
+from statistics import mean, stdev
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.fallback_service import fallback_service
+from app.services.scoring_kernels import group_means, leaderboard_entries, mean_and_stdev
+from app.services.scoring_service import scoring_service
+from reference_scoring import (
+    random_event,
+    reference_aggregate,
+    reference_avg_score,
+    reference_bias_report,
+    reference_leaderboard,
+)
+
+CASES = 400
+
+
+def _snapshot(reviews, judges):
+    return SimpleNamespace(
+        reviews=reviews,
+        judges=[{"judge_id": j, "profiles": {"name": j.upper()}} for j in judges],
+        assignments=[],
+        submission_count=0,
+    )
+
+
+# ── Equivalence ──
+
+@pytest.mark.parametrize("integral", [False, True])
+@pytest.mark.parametrize("seed", range(CASES))
+def test_leaderboard_matches_reference(seed, integral):
+    criteria, submissions, _, reviews = random_event(seed, integral)
+    assert leaderboard_entries(criteria, submissions, reviews) == reference_leaderboard(
+        criteria, submissions, reviews,
+    )
+
+
+@pytest.mark.parametrize("integral", [False, True])
+@pytest.mark.parametrize("seed", range(CASES))
+def test_event_stats_avg_matches_reference(seed, integral):
+    _, _, judges, reviews = random_event(seed, integral)
+    stats = asyncio.run(scoring_service.compute_event_stats("e", _snapshot(reviews, judges)))
+    assert stats["avg_score"] == reference_avg_score(reviews)
+
+
+@pytest.mark.parametrize("integral", [False, True])
+@pytest.mark.parametrize("seed", range(CASES))
+def test_bias_report_matches_reference(seed, integral):
+    _, _, judges, reviews = random_event(seed, integral)
+    report = asyncio.run(scoring_service.compute_bias_report("e", _snapshot(reviews, judges)))
+    names = {j: j.upper() for j in judges}
+    assert report == reference_bias_report(reviews, names)
+
+
+@pytest.mark.parametrize("integral", [False, True])
+@pytest.mark.parametrize("seed", range(CASES))
+def test_fallback_aggregate_matches_reference(seed, integral):
+    criteria, submissions, _, reviews = random_event(seed, integral)
+    subs = [
+        {
+            "id": sid,
+            "project_name": name,
+            "reviews": [r for r in reviews if r["submission_id"] == sid],
+        }
+        for sid, name in submissions
+    ]
+    assert fallback_service.aggregate_scores(criteria, subs) == reference_aggregate(criteria, subs)
+
+
+def test_scores_stored_as_json_strings():
+    criteria, submissions, _, reviews = random_event(7)
+    as_json = [{**r, "scores": json.dumps(r["scores"])} for r in reviews]
+    assert leaderboard_entries(criteria, submissions, as_json) == reference_leaderboard(
+        criteria, submissions, reviews,
+    )
+
+
+def test_non_numeric_scores_are_skipped():
+    criteria, submissions, _, reviews = random_event(9, integral=True)
+    as_strings = [{**r, "scores": {k: str(v) for k, v in r["scores"].items()}} for r in reviews]
+    assert leaderboard_entries(criteria, submissions, as_strings) == reference_leaderboard(
+        criteria, submissions, reviews,
+    )
+
+    bad = {**reviews[0], "scores": {**reviews[0]["scores"], criteria[0]["id"]: "n/a"}}
+    cleaned = {**reviews[0], "scores": {k: v for k, v in reviews[0]["scores"].items() if k != criteria[0]["id"]}}
+    expected_reviews = [cleaned] + reviews[1:] if cleaned["scores"] else reviews[1:]
+    entries = leaderboard_entries(criteria, submissions, [bad] + reviews[1:])
+    expected = reference_leaderboard(criteria, submissions, expected_reviews)
+    strip = lambda es: [{k: v for k, v in e.items() if k != "review_count"} for e in es]
+    assert strip(entries) == strip(expected)
+
+
+# ── Exact fast paths ──
+
+@pytest.mark.parametrize("seed", range(200))
+def test_group_means_and_stdev_are_exact(seed):
+    rng = random.Random(seed)
+    n_groups = rng.randint(1, 8)
+    if seed % 2:
+        values = [float(rng.randint(-20, 20)) for _ in range(rng.randint(1, 300))]
+    else:
+        values = [float(rng.randint(1, 10)) if rng.random() < 0.9 else round(rng.uniform(1, 10), 2)
+                  for _ in range(rng.randint(1, 300))]
+    codes = [rng.randrange(n_groups) for _ in values]
+
+    means = group_means(np.array(values), np.array(codes, dtype=np.int64), n_groups).tolist()
+    for g in range(n_groups):
+        group = [v for v, c in zip(values, codes) if c == g]
+        assert means[g] == mean(group) if group else means[g] != means[g]
+
+    avg, std = mean_and_stdev(np.array(values))
+    assert avg == mean(values)
+    assert std == (stdev(values) if len(values) > 1 else 0)
+
+
+def test_large_magnitudes_fall_back_to_exact():
+    values = [2.0 ** 40, 3.0, 2.0 ** 40 + 1, 7.0]
+    means = group_means(np.array(values), np.array([0, 0, 0, 1]), 2).tolist()
+    assert means == [mean(values[:3]), 7.0]
+    assert mean_and_stdev(np.array(values)) == (mean(values), stdev(values))
@@ -0,0 +1,90 @@
+"""Ingest validation worker: an unavailable agent must not mark rows validated."""
+
+import asyncio
+
+import pytest
+
+from app.services.archestra_service import archestra_service
+from app.services.validation_service import IngestValidationService
+
+
+def _seed(fake_db, attempts: int = 0) -> dict:
+    row = {
+        "id": "s1", "event_id": "e", "status": "submitted",
+        "form_data": {"f0": "Project"}, "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00",
+        "ai_validation_status": "pending", "ai_validation_claimed_at": None,
+        "ai_validation_attempts": attempts,
+    }
+    fake_db.tables["submissions"] = [row]
+    return row
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    """Make the Ingest agent look configured and answer with `agent.result`."""
+    state = type("Agent", (), {"result": None})()
+
+    async def try_validate(form_data):
+        return state.result
+
+    monkeypatch.setattr(archestra_service, "has_agent", lambda name: True)
+    monkeypatch.setattr(archestra_service, "try_validate_submission", try_validate)
+    return state
+
+
+def test_unavailable_agent_releases_for_retry(fake_db, agent):
+    row = _seed(fake_db)
+    service = IngestValidationService()
+
+    assert not asyncio.run(service.process("s1"))
+    assert row["ai_validation_status"] == "pending"
+    assert row["ai_validation_claimed_at"] is None
+    assert "_ai_validation" not in row["form_data"]
+
+
+def test_outage_does_not_use_up_attempts(fake_db, agent):
+    service = IngestValidationService()
+    row = _seed(fake_db, attempts=service.max_attempts - 1)
+
+    for _ in range(service.max_attempts + 2):
+        assert not asyncio.run(service.process("s1"))
+    assert row["ai_validation_status"] == "pending"
+    assert row["ai_validation_attempts"] == service.max_attempts - 1
+    assert service.stats()["failed"] == 0
+
+    agent.result = {"valid": True, "warnings": [], "errors": [], "normalized": {}}
+    assert asyncio.run(service.process("s1"))
+    assert row["ai_validation_status"] == "completed"
+
+
+def test_errors_give_up_after_max_attempts(fake_db, monkeypatch):
+    async def broken(form_data):
+        raise RuntimeError("agent returned garbage")
+
+    monkeypatch.setattr(archestra_service, "has_agent", lambda name: True)
+    monkeypatch.setattr(archestra_service, "try_validate_submission", broken)
+    service = IngestValidationService()
+    row = _seed(fake_db, attempts=service.max_attempts - 1)
+
+    assert not asyncio.run(service.process("s1"))
+    assert row["ai_validation_status"] == "failed"
+    assert service.stats()["failed"] == 1
+
+
+def test_agent_result_is_written(fake_db, agent):
+    row = _seed(fake_db)
+    agent.result = {"valid": False, "warnings": [], "errors": ["missing demo"], "normalized": {}}
+
+    assert asyncio.run(IngestValidationService().process("s1"))
+    assert row["ai_validation_status"] == "completed"
+    assert row["form_data"]["_ai_validation"] == agent.result
+
+
+def test_without_ingest_agent_passes_through(fake_db, monkeypatch):
+    row = _seed(fake_db)
+    monkeypatch.setattr(archestra_service, "has_agent", lambda name: False)
+
+    assert asyncio.run(IngestValidationService().process("s1"))
+    assert row["ai_validation_status"] == "completed"
+    assert row["form_data"]["_ai_validation"]["valid"] is True
@@ -0,0 +1,23 @@
+-- Migration 005: Persisted AI feedback
+-- Stores generated feedback per submission together with a hash of the
+-- inputs it was generated from (form data, review scores/notes, criteria),
+-- so it is only regenerated when those inputs change.
+
+CREATE TABLE IF NOT EXISTS submission_feedback (
+    submission_id UUID PRIMARY KEY REFERENCES submissions(id) ON DELETE CASCADE,
+    event_id UUID NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    content_hash TEXT NOT NULL,
+    feedback JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_submission_feedback_event ON submission_feedback(event_id);
+
+CREATE TRIGGER update_submission_feedback_updated_at BEFORE UPDATE ON submission_feedback
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at();
+
+ALTER TABLE submission_feedback ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role full access submission_feedback" ON submission_feedback
+    FOR ALL USING (auth.role() = 'service_role');
@@ -0,0 +1,33 @@
+-- Migration 006: Background jobs
+-- Durable record of long-running, event-level work (e.g. bulk feedback
+-- generation) executed in-process by the API workers. A worker owns a
+-- job while it keeps heartbeat_at fresh; a running job whose heartbeat
+-- has gone stale is reclaimed and resumed by another worker.
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    event_id UUID REFERENCES events(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'running', 'completed', 'failed')),
+    params JSONB NOT NULL DEFAULT '{}',
+    progress JSONB NOT NULL DEFAULT '{}',
+    result JSONB,
+    error TEXT,
+    created_by UUID REFERENCES profiles(id) ON DELETE SET NULL,
+    claimed_by TEXT,
+    heartbeat_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_event_kind ON jobs(event_id, kind);
+CREATE INDEX IF NOT EXISTS idx_jobs_active ON jobs(status) WHERE status IN ('pending', 'running');
+
+CREATE TRIGGER update_jobs_updated_at BEFORE UPDATE ON jobs
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at();
+
+ALTER TABLE jobs ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role full access jobs" ON jobs
+    FOR ALL USING (auth.role() = 'service_role');
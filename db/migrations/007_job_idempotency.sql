@@ -0,0 +1,16 @@
+-- Migration 007: Job idempotency
+-- At most one pending/running job per (event, kind), so a repeated
+-- trigger (double click, retry, status transition racing a manual
+-- assignment) joins the job already in flight instead of starting a
+-- second one. Clients may also send an Idempotency-Key; a repeated key
+-- returns the original job even after it has finished.
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_one_active
+    ON jobs(event_id, kind) WHERE status IN ('pending', 'running');
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_idempotency_key
+    ON jobs(event_id, kind, idempotency_key) WHERE idempotency_key IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_pending_created ON jobs(created_at) WHERE status = 'pending';
@@ -0,0 +1,18 @@
+-- Migration 008: Asynchronous ingest validation
+-- Submissions are stored immediately and validated by the Archestra
+-- Ingest agent in the background. ai_validation_status tracks each row
+-- through that queue; the result is still written to
+-- form_data._ai_validation. Rows created before this migration keep a
+-- NULL status (validated inline, or never).
+
+ALTER TABLE submissions
+    ADD COLUMN IF NOT EXISTS ai_validation_status TEXT
+        CHECK (ai_validation_status IN ('pending', 'running', 'completed', 'failed')),
+    ADD COLUMN IF NOT EXISTS ai_validation_claimed_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS ai_validation_attempts INT NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_submissions_validation_queue
+    ON submissions(created_at) WHERE ai_validation_status IN ('pending', 'running');
+
+CREATE INDEX IF NOT EXISTS idx_submissions_event_validation
+    ON submissions(event_id, ai_validation_status);
@@ -0,0 +1,51 @@
+-- Migration 009: Atomic reordering
+-- Apply a whole new ordering of an event's form fields or criteria in
+-- one call (one round trip, one transaction). p_order is a JSON array of
+-- {"id": ..., "sort_order": ...}. If any id is unknown, belongs to
+-- another event, or appears twice, nothing is changed and the call
+-- fails with SQLSTATE P0002. Returns the number of rows updated.
+
+CREATE OR REPLACE FUNCTION reorder_form_fields(p_event_id UUID, p_order JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    UPDATE form_fields f
+    SET sort_order = (o->>'sort_order')::INTEGER
+    FROM jsonb_array_elements(p_order) AS o
+    WHERE f.id = (o->>'id')::UUID
+      AND f.event_id = p_event_id;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    IF updated <> jsonb_array_length(p_order) THEN
+        RAISE EXCEPTION 'Unknown or duplicate form field id in reorder'
+            USING ERRCODE = 'P0002';
+    END IF;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION reorder_criteria(p_event_id UUID, p_order JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    UPDATE criteria c
+    SET sort_order = (o->>'sort_order')::INTEGER
+    FROM jsonb_array_elements(p_order) AS o
+    WHERE c.id = (o->>'id')::UUID
+      AND c.event_id = p_event_id;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    IF updated <> jsonb_array_length(p_order) THEN
+        RAISE EXCEPTION 'Unknown or duplicate criterion id in reorder'
+            USING ERRCODE = 'P0002';
+    END IF;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION reorder_form_fields(UUID, JSONB) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION reorder_criteria(UUID, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION reorder_form_fields(UUID, JSONB) TO service_role;
+GRANT EXECUTE ON FUNCTION reorder_criteria(UUID, JSONB) TO service_role;
@@ -0,0 +1,97 @@
+-- Migration 010: Per-event change counter
+-- Every write to an event's judging data (the event row, its form fields,
+-- criteria, judges, submissions, assignments and reviews) bumps a counter
+-- for that event. The API derives ETags from it, so a poll of an
+-- unchanged dashboard or judge queue costs one primary-key lookup.
+--
+-- Triggers are per statement (transition tables), so a bulk write of
+-- thousands of rows bumps each touched event once. Deletes are counted
+-- too, which max(updated_at) alone would miss. No foreign key to events:
+-- when an event is deleted its children's delete triggers still fire.
+
+CREATE TABLE IF NOT EXISTS event_versions (
+    event_id UUID PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1,
+    changed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE event_versions ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role full access event_versions" ON event_versions
+    FOR ALL USING (auth.role() = 'service_role');
+
+-- Child tables: bump every event_id seen in the statement's rows.
+-- Events are locked in id order so concurrent bulk writes can't deadlock.
+CREATE OR REPLACE FUNCTION bump_event_versions()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO event_versions (event_id)
+        SELECT DISTINCT event_id FROM old_rows WHERE event_id IS NOT NULL ORDER BY event_id
+        ON CONFLICT (event_id) DO UPDATE
+        SET version = event_versions.version + 1, changed_at = NOW();
+    ELSE
+        INSERT INTO event_versions (event_id)
+        SELECT DISTINCT event_id FROM new_rows WHERE event_id IS NOT NULL ORDER BY event_id
+        ON CONFLICT (event_id) DO UPDATE
+        SET version = event_versions.version + 1, changed_at = NOW();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- The events table itself (status, settings): keyed by id
+CREATE OR REPLACE FUNCTION bump_event_versions_for_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO event_versions (event_id)
+    SELECT DISTINCT id FROM new_rows ORDER BY id
+    ON CONFLICT (event_id) DO UPDATE
+    SET version = event_versions.version + 1, changed_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'form_fields', 'criteria', 'event_judges',
+        'submissions', 'judge_assignments', 'reviews'
+    ] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_version_ins', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_version_upd', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_version_del', t);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_event_versions()',
+            t || '_version_ins', t);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_event_versions()',
+            t || '_version_upd', t);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_event_versions()',
+            t || '_version_del', t);
+    END LOOP;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS events_version_upd ON events;
+CREATE TRIGGER events_version_upd AFTER UPDATE ON events
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_event_versions_for_events();
+
+-- Current version of an event (0 if nothing has changed since migration)
+CREATE OR REPLACE FUNCTION event_change_version(p_event_id UUID)
+RETURNS BIGINT AS $$
+    SELECT COALESCE(
+        (SELECT version FROM event_versions WHERE event_id = p_event_id),
+        0
+    );
+$$ LANGUAGE sql STABLE;
+
+REVOKE EXECUTE ON FUNCTION event_change_version(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION event_change_version(UUID) TO service_role;
@@ -63,6 +63,7 @@ import {
     getBiasReport,
     archestraAssignJudges,
     archestraGetProgress,
+    JobFailedError,
 } from "@/lib/api-services";
 
 const MotionBox = motion.create(Box);
@@ -142,7 +143,9 @@ export function DashboardTab({ eventId }: DashboardTabProps) {
         } catch (err: any) {
             toast({
                 title: "Assignment failed",
-                description: err.response?.data?.detail || "Could not assign judges.",
+                description:
+                    err.response?.data?.detail ||
+                    (err instanceof JobFailedError ? err.message : "Could not assign judges."),
                 status: "error",
                 duration: 3000,
             });
@@ -165,7 +168,9 @@ export function DashboardTab({ eventId }: DashboardTabProps) {
         } catch (err: any) {
             toast({
                 title: "Refresh failed",
-                description: err.response?.data?.detail || "Using fallback computation",
+                description:
+                    err.response?.data?.detail ||
+                    (err instanceof JobFailedError ? err.message : "Using fallback computation"),
                 status: "warning",
                 duration: 3000,
             });
@@ -69,6 +69,7 @@ export function SubmissionsTab({ eventId }: SubmissionsTabProps) {
     const { isOpen, onOpen, onClose } = useDisclosure();
     const [feedbackLoading, setFeedbackLoading] = useState(false);
     const [currentFeedback, setCurrentFeedback] = useState<any>(null);
+    const [feedbackSubmissionId, setFeedbackSubmissionId] = useState<string | null>(null);
 
     useEffect(() => {
         loadSubmissions();
@@ -89,13 +90,14 @@ export function SubmissionsTab({ eventId }: SubmissionsTabProps) {
         }
     };
 
-    const handleGenerateFeedback = async (submissionId: string) => {
+    const handleGenerateFeedback = async (submissionId: string, force = false) => {
         setFeedbackLoading(true);
         setCurrentFeedback(null);
+        setFeedbackSubmissionId(submissionId);
         onOpen();
 
         try {
-            const result = await archestraGenerateFeedback(submissionId);
+            const result = await archestraGenerateFeedback(submissionId, force);
             setCurrentFeedback(result);
         } catch (err: any) {
             toast({
@@ -344,6 +346,17 @@ export function SubmissionsTab({ eventId }: SubmissionsTabProps) {
                         )}
                     </ModalBody>
                     <ModalFooter>
+                        {currentFeedback?.cached && feedbackSubmissionId && (
+                            <Button
+                                variant="ghost"
+                                color="whiteAlpha.700"
+                                mr={3}
+                                isDisabled={feedbackLoading}
+                                onClick={() => handleGenerateFeedback(feedbackSubmissionId, true)}
+                            >
+                                Regenerate
+                            </Button>
+                        )}
                         <Button colorScheme="purple" mr={3} onClick={onClose}>
                             Close
                         </Button>
@@ -1,5 +1,20 @@
 import api from "@/lib/api";
-import type { Event, FormField, Criterion, EventJudge, Submission, Review, JudgeQueue } from "@/lib/types";
+import type {
+    Event,
+    FormField,
+    Criterion,
+    EventJudge,
+    Submission,
+    SubmissionPage,
+    SubmissionSummary,
+    Review,
+    JudgeQueue,
+    JudgeQueueWindow,
+    Job,
+    AIValidationStatus,
+    AssignJudgesOptions,
+    AssignJudgesResult,
+} from "@/lib/types";
 
 // ── Events ──
 
@@ -157,6 +172,13 @@ export async function deleteCriterion(
     await api.delete(`/events/${eventId}/criteria/${criterionId}`);
 }
 
+export async function reorderCriteria(
+    eventId: string,
+    order: { id: string; sort_order: number }[]
+): Promise<void> {
+    await api.put(`/events/${eventId}/criteria/reorder`, { order });
+}
+
 // ── Judges ──
 
 export async function listJudges(eventId: string): Promise<EventJudge[]> {
@@ -253,6 +275,33 @@ export async function listSubmissions(eventId: string): Promise<Submission[]> {
     return res.data;
 }
 
+export interface SubmissionListParams {
+    limit: number;
+    cursor?: string | null;
+    status?: "submitted" | "in_review" | "completed";
+    has_reviews?: boolean;
+    flagged?: boolean;
+    validation_status?: AIValidationStatus;
+}
+
+export async function listSubmissionsPage(
+    eventId: string,
+    params: SubmissionListParams
+): Promise<SubmissionPage<Submission>> {
+    const res = await api.get(`/events/${eventId}/submissions`, { params });
+    return res.data;
+}
+
+export async function listSubmissionSummaries(
+    eventId: string,
+    params: SubmissionListParams
+): Promise<SubmissionPage<SubmissionSummary>> {
+    const res = await api.get(`/events/${eventId}/submissions`, {
+        params: { ...params, view: "summary" },
+    });
+    return res.data;
+}
+
 export async function getMySubmission(eventId: string): Promise<Submission> {
     const res = await api.get(`/events/${eventId}/my-submission`);
     return res.data;
@@ -284,6 +333,17 @@ export async function getJudgeQueue(eventId: string): Promise<JudgeQueue> {
     return res.data;
 }
 
+/** Lean queue window; omit offset to start just before the resume position. */
+export async function getJudgeQueueWindow(
+    eventId: string,
+    options: { offset?: number; limit?: number } = {}
+): Promise<JudgeQueueWindow> {
+    const res = await api.get(`/judges/queue/${eventId}`, {
+        params: { format: "lean", ...options },
+    });
+    return res.data;
+}
+
 export async function createReview(data: {
     submission_id: string;
     scores: Record<string, number>;
@@ -314,7 +374,7 @@ export async function listEventReviews(eventId: string): Promise<Review[]> {
 // ── Dashboard & Scoring ──
 
 export async function getDashboard(eventId: string): Promise<{
-    event: Event;
+    event: Pick<Event, "id" | "organizer_id" | "name" | "status" | "judges_per_submission">;
     stats: {
         total_submissions: number;
         total_judges: number;
@@ -396,9 +456,12 @@ export async function exportCSV(eventId: string): Promise<Blob> {
 
 // ── Archestra ──
 
-export async function archestraAssignJudges(eventId: string): Promise<any> {
-    const res = await api.post(`/archestra/assign-judges/${eventId}`);
-    return res.data;
+export async function archestraAssignJudges(
+    eventId: string,
+    options?: AssignJudgesOptions
+): Promise<AssignJudgesResult> {
+    const res = await api.post(`/archestra/assign-judges/${eventId}`, options);
+    return waitForJob(res.data);
 }
 
 export async function archestraGetProgress(eventId: string): Promise<any> {
@@ -408,10 +471,60 @@ export async function archestraGetProgress(eventId: string): Promise<any> {
 
 export async function archestraAggregateScores(eventId: string): Promise<any> {
     const res = await api.post(`/archestra/aggregate/${eventId}`);
+    return waitForJob(res.data);
+}
+
+export async function archestraGenerateEventFeedback(
+    eventId: string,
+    force = false
+): Promise<Job> {
+    const res = await api.post(`/archestra/feedback-batch/${eventId}`, null, {
+        params: force ? { force: true } : undefined,
+    });
+    return res.data;
+}
+
+export async function archestraGenerateFeedback(
+    submissionId: string,
+    force = false
+): Promise<any> {
+    const res = await api.post(`/archestra/feedback/${submissionId}`, null, {
+        params: force ? { force: true } : undefined,
+    });
     return res.data;
 }
 
-export async function archestraGenerateFeedback(submissionId: string): Promise<any> {
-    const res = await api.post(`/archestra/feedback/${submissionId}`);
+// ── Background Jobs ──
+
+export async function getJob(jobId: string): Promise<Job> {
+    const res = await api.get(`/jobs/${jobId}`);
     return res.data;
 }
+
+export class JobFailedError extends Error {
+    constructor(public job: Job) {
+        super(job.error || `Job ${job.kind} failed`);
+        this.name = "JobFailedError";
+    }
+}
+
+/** Poll a job until it finishes; resolves with its result or throws JobFailedError. */
+export async function waitForJob<R = any>(
+    job: Job<R>,
+    intervalMs = 1000,
+    timeoutMs = 5 * 60 * 1000
+): Promise<R> {
+    const deadline = Date.now() + timeoutMs;
+    let current = job;
+    while (current.status === "pending" || current.status === "running") {
+        if (Date.now() > deadline) {
+            throw new Error(`Timed out waiting for job ${current.id}`);
+        }
+        await new Promise((resolve) => setTimeout(resolve, intervalMs));
+        current = (await getJob(current.id)) as Job<R>;
+    }
+    if (current.status === "failed") {
+        throw new JobFailedError(current);
+    }
+    return current.result as R;
+}
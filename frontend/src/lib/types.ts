@@ -70,6 +70,8 @@ export interface Criterion {
 }
 
 // ── Submission ──
+export type AIValidationStatus = "pending" | "running" | "completed" | "failed";
+
 export interface Submission {
     id: string;
     event_id: string;
@@ -77,8 +79,26 @@ export interface Submission {
     form_data: Record<string, any>;
     form_data_display?: FormDataDisplayItem[];
     status: "submitted" | "in_review" | "completed";
+    ai_validation_status?: AIValidationStatus | null;
+    created_at: string;
+    updated_at: string;
+}
+
+export interface SubmissionSummary {
+    id: string;
+    participant_id: string;
+    status: "submitted" | "in_review" | "completed";
     created_at: string;
     updated_at: string;
+    project_name: string;
+    review_count: number;
+    ai_flagged: boolean;
+    ai_validation_status: AIValidationStatus | null;
+}
+
+export interface SubmissionPage<T = Submission> {
+    items: T[];
+    next_cursor: string | null;
 }
 
 export interface FormDataDisplayItem {
@@ -116,6 +136,35 @@ export interface SubmissionWithReview {
     is_completed: boolean;
 }
 
+// Lean format: field definitions once, a window of items with values only
+export interface JudgeQueueEntry {
+    submission_id: string;
+    is_completed: boolean;
+}
+
+export interface JudgeQueueItem {
+    index: number;
+    submission_id: string;
+    status: "submitted" | "in_review" | "completed";
+    created_at: string;
+    values: Record<string, unknown>; // keyed by form field id
+    review?: Review | null;
+    is_completed: boolean;
+}
+
+export interface JudgeQueueWindow {
+    total_assigned: number;
+    completed: number;
+    remaining: number;
+    current_index: number;
+    form_fields: FormField[];
+    offset: number;
+    limit: number;
+    has_more: boolean;
+    queue: JudgeQueueEntry[];
+    items: JudgeQueueItem[];
+}
+
 // ── Event Judge ──
 export interface EventJudge {
     id: string;
@@ -124,3 +173,51 @@ export interface EventJudge {
     invite_status: "pending" | "accepted";
     invited_at: string;
 }
+
+// ── Judge Assignment ──
+export interface AssignJudgesOptions {
+    judges_per_submission?: number;
+    max_load_per_judge?: number;
+    exclusions?: { judge_id: string; submission_id: string }[];
+    use_ai?: boolean;
+    mode?: "incremental" | "replace";
+}
+
+export interface AssignmentBalance {
+    min_load: number;
+    max_load: number;
+    mean_load: number;
+    stddev: number;
+    spread: number;
+}
+
+export interface AssignJudgesResult {
+    message: string;
+    strategy: string;
+    judge_loads: Record<string, number>;
+    assignment_count: number;
+    balance: AssignmentBalance | null;
+    unfilled: { submission_id: string; missing: number }[];
+    mode?: "incremental";
+    added?: number;
+    removed?: number;
+    moved?: number;
+    rebalanced?: boolean;
+}
+
+// ── Background Jobs ──
+export type JobStatus = "pending" | "running" | "completed" | "failed";
+
+export interface Job<R = Record<string, any>> {
+    id: string;
+    event_id: string;
+    kind: string;
+    status: JobStatus;
+    params: Record<string, any>;
+    progress: Record<string, number>;
+    result?: R | null;
+    error?: string | null;
+    created_at: string;
+    updated_at: string;
+    finished_at?: string | null;
+}